@@ -0,0 +1,126 @@
+# coding=utf-8
+
+"""
+Compares the single level and pyramid modes, and the initialisers, of
+find_outer_contour for wall time, iterations and contour accuracy, on the brain image and on larger
+synthetic images. Accuracy is the mean distance to the true boundary for
+the synthetic images, and to the single level result for the brain image.
+Run from the repository root:
+
+    python benchmarks/benchmark_contour.py
+"""
+
+import argparse
+import time
+
+import numpy as np
+import skimage.io
+from skimage.filters import gaussian
+
+from sksurgeryfredmatplotlib.algorithms.fit_contour import \
+                find_outer_contour, to_gray, SMOOTHING_SIGMA
+
+#pylint:disable=consider-using-f-string
+
+def _blob_radius(angle):
+    """
+    The radius of the synthetic blob, as a fraction of the image size
+    """
+    return 0.35 + 0.03 * np.sin(3 * angle) + 0.02 * np.cos(5 * angle)
+
+
+def synthetic_image(size, seed=0):
+    """
+    A noisy, bright, irregular blob on a dark background, about the
+    same shape as the brain image
+    """
+    rng = np.random.default_rng(seed)
+    rows, cols = np.mgrid[0:size, 0:size] / size - 0.5
+    radius = _blob_radius(np.arctan2(rows, cols))
+    image = (np.hypot(rows, cols) < radius).astype(np.float64)
+    image += rng.normal(scale=0.1, size=image.shape)
+    return np.clip(image, 0.0, 1.0)
+
+
+def boundary_distance(contour, size):
+    """
+    The mean radial distance from the contour to the synthetic blob's edge
+    """
+    rows = contour[:, 0] / size - 0.5
+    cols = contour[:, 1] / size - 0.5
+    radius = _blob_radius(np.arctan2(rows, cols))
+    return np.mean(np.abs(np.hypot(rows, cols) - radius)) * size
+
+
+def contour_distance(contour_a, contour_b):
+    """
+    The mean distance from each point on contour_a to the nearest
+    point on contour_b
+    """
+    differences = contour_a[:, np.newaxis, :] - contour_b[np.newaxis, :, :]
+    return np.mean(np.min(np.linalg.norm(differences, axis=2), axis=1))
+
+
+def benchmark(name, image, levels, initialisers, repeats, accuracy=None):
+    """
+    Times each initialiser and pyramid level against the single level
+    fit from the circle
+    :params accuracy: a function returning the error of a contour, if
+        None the distance to the single level contour is used
+    """
+    #pylint:disable=too-many-arguments
+    smoothed = gaussian(to_gray(image), SMOOTHING_SIGMA)
+    reference = None
+    for initialiser in initialisers:
+        for level in [1] + levels:
+            times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                snake, _ = find_outer_contour(image, smoothed=smoothed,
+                                              pyramid_levels=level,
+                                              initialiser=initialiser)
+                times.append(time.perf_counter() - start)
+            if reference is None:
+                reference = snake
+            if accuracy is None:
+                error = contour_distance(snake, reference)
+            else:
+                error = accuracy(snake)
+
+            report = {}
+            find_outer_contour(image, smoothed=smoothed, pyramid_levels=level,
+                               initialiser=initialiser, report=report)
+            print("{0:>14} {1:>10} {2:>6d} {3:>10.3f} {4:>10d} {5:>10.3f}"
+                  .format(name, report.get('initialiser'), level, min(times),
+                          report.get('iterations'), error))
+
+
+def main(args=None):
+    """
+    Runs the benchmark
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmark pyramid mode for find_outer_contour')
+    parser.add_argument("--sizes", type=int, nargs='*', default=[1024, 2048],
+                        help="Sizes of synthetic images to use")
+    parser.add_argument("--levels", type=int, nargs='*', default=[2, 3, 4],
+                        help="Pyramid levels to compare with a single level")
+    parser.add_argument("--initialisers", type=str, nargs='*',
+                        default=['circle', 'threshold'],
+                        help="Contour initialisers to compare")
+    parser.add_argument("--repeats", type=int, default=1,
+                        help="Number of times to repeat each fit")
+    args = parser.parse_args(args)
+
+    print("{0:>14} {1:>10} {2:>6} {3:>10} {4:>10} {5:>10}".format(
+        'image', 'init', 'levels', 'time (s)', 'iterations', 'error (px)'))
+    benchmark('brain512', skimage.io.imread('data/brain512.png'),
+              args.levels, args.initialisers, args.repeats)
+    for size in args.sizes:
+        benchmark('synthetic{0:}'.format(size), synthetic_image(size),
+                  args.levels, args.initialisers, args.repeats,
+                  lambda snake, size=size: boundary_distance(snake, size))
+
+
+if __name__ == "__main__":
+    main()
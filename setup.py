@@ -54,6 +54,7 @@ setup(
             'numpy',
             'matplotlib<3.3.3',
             'scikit-image>0.15',
+            'scipy',
             'scikit-surgeryfred>=0.0.9',
             'ipykernel',
             'nbsphinx',
@@ -64,6 +65,8 @@ setup(
             'sksurgeryfredmatplotlib=sksurgeryfredmatplotlib.__main__:main',
             'sksurgeryfredmatplotlib_plotter=sksurgeryfredmatplotlib.ui.sksurgeryfred_plotter_command_line:main',
             'sksurgeryfredmatplotlib_game=sksurgeryfredmatplotlib.ui.sksurgeryfred_game_command_line:main',
+            'sksurgeryfredmatplotlib_simulate=sksurgeryfredmatplotlib.ui.sksurgeryfred_simulate_command_line:main',
+            'sksurgeryfredmatplotlib_aggregate=sksurgeryfredmatplotlib.ui.sksurgeryfred_aggregate_command_line:main',
         ],
     },
 )
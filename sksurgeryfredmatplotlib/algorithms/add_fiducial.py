@@ -8,6 +8,9 @@ import numpy as np
 from sksurgeryfred.algorithms.fle import FLE
 from sksurgeryfred.algorithms.fred import is_valid_fiducial
 
+from sksurgeryfredmatplotlib.algorithms.point_buffer import PointBuffer
+
+#pylint:disable=too-many-instance-attributes
 class AddFiducialMarker:
     """
     A class to handle mouse press events, adding a fiducial
@@ -16,7 +19,7 @@ class AddFiducialMarker:
 
     def __init__(self, fig, plotter,
                  pbr, logger, fixed_fle_sd, moving_fle_sd,
-                 max_fids=None):
+                 max_fids=None, rng=None, renderer=None):
         """
         :params fig: the matplot lib figure to get mouse events from
         :params fixed_plot: the fixed image subplot
@@ -24,18 +27,25 @@ class AddFiducialMarker:
         :params target: 1x3 target point
         :params fixed_fle: the standard deviations of the fixed image fle
         :params moving_fle: the standard deviations of the moving image fle
+        :params rng: a numpy random Generator to sample fle with, if None
+            the global numpy random state is used
+        :params renderer: a BlitRenderer or RenderScheduler to redraw
+            the figure with, if
+            None the whole figure is drawn on each click
         """
 
         self.pbr = pbr
         self.plotter = plotter
         self.fig = fig
+        self.renderer = renderer
         _ = fig.canvas.mpl_connect('button_press_event', self)
         self.logger = logger
-        self.fixed_points = None
-        self.moving_points = None
+        self._fixed_buffer = PointBuffer()
+        self._moving_buffer = PointBuffer()
         self.fids_plot = None
-        self.fixed_fle = FLE(independent_fle=fixed_fle_sd.reshape(3))
-        self.moving_fle = FLE(independent_fle=moving_fle_sd.reshape(3))
+        self.contour_mask = None
+        self.fixed_fle = _make_fle(fixed_fle_sd.reshape(3), rng)
+        self.moving_fle = _make_fle(moving_fle_sd.reshape(3), rng)
         self.max_fids = max_fids
 
         self.reset_fiducials(0.0)
@@ -47,17 +57,15 @@ class AddFiducialMarker:
             fiducial_location[1] = event.ydata
 
             if self.max_fids is not None:
-                if self.fixed_points.shape[0] >= self.max_fids:
+                if len(self._fixed_buffer) >= self.max_fids:
                     return
 
-            if is_valid_fiducial(fiducial_location):
+            if self._is_valid_fiducial(fiducial_location):
                 fixed_point = self.fixed_fle.perturb_fiducial(fiducial_location)
                 moving_point = self.moving_fle.perturb_fiducial(
                     fiducial_location)
-                self.fixed_points = np.concatenate(
-                    (self.fixed_points, fixed_point.reshape(1, 3)), axis=0)
-                self.moving_points = np.concatenate(
-                    (self.moving_points, moving_point.reshape(1, 3)), axis=0)
+                self._fixed_buffer.append(fixed_point)
+                self._moving_buffer.append(moving_point)
 
                 [success, fre, mean_fle_sq, expected_tre_sq,
                  expected_fre_sq, transformed_target_2d,
@@ -80,14 +88,59 @@ class AddFiducialMarker:
                         self.logger.log_result(
                             actual_tre, fre, expected_tre, expected_fre,
                             mean_fle, no_fids)
-                self.fig.canvas.draw()
+                if self.renderer is None:
+                    self.fig.canvas.draw()
+                else:
+                    self.renderer.update()
+
+    @property
+    def fixed_points(self):
+        """
+        the fixed fiducial positions, a view of the buffer
+        """
+        return self._fixed_buffer.points
+
+    @property
+    def moving_points(self):
+        """
+        the moving fiducial positions, a view of the buffer
+        """
+        return self._moving_buffer.points
+
+    def _is_valid_fiducial(self, fiducial_location):
+        """
+        checks a fiducial is valid, and inside the anatomy if we
+        have a contour mask
+        """
+        if not is_valid_fiducial(fiducial_location):
+            return False
+        if self.contour_mask is None:
+            return True
+        return self.contour_mask.contains(fiducial_location)[0]
 
-    def reset_fiducials(self, mean_fle_sq):
+    def reset_fiducials(self, mean_fle_sq, contour_mask=None):
         """
         resets the fiducial markers
+
+        :params mean_fle_sq: the expected squared fle
+        :params contour_mask: an optional ContourMask, if set only
+            fiducials inside the contour are accepted
         """
-        self.fixed_points = np.zeros((0, 3), dtype=np.float64)
-        self.moving_points = np.zeros((0, 3), dtype=np.float64)
+        self.contour_mask = contour_mask
+        self._fixed_buffer.clear()
+        self._moving_buffer.clear()
         self.plotter.plot_fiducials(self.fixed_points,
                                     self.moving_points,
                                     0, math.sqrt(mean_fle_sq))
+
+
+def _make_fle(fle_sd, rng):
+    """
+    makes an FLE, sampling from rng if set
+    """
+    if rng is None:
+        return FLE(independent_fle=fle_sd)
+
+    def ind_fle_function():
+        return rng.normal(loc=0.0, scale=fle_sd, size=3)
+    return FLE(ind_fle_function=ind_fle_function)
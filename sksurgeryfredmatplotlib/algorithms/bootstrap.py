@@ -0,0 +1,152 @@
+"""Bootstrap confidence intervals of correlation coefficients"""
+
+from concurrent.futures import ProcessPoolExecutor
+import warnings
+
+import numpy as np
+
+#about how many resample indices are drawn at once
+BATCH_ELEMENTS = 2 ** 21
+
+#the moments of the data, set in each worker process of the pool
+_WORKER_MOMENTS = None
+
+
+def bootstrap_correlations(x_values, y_values, resamples=10000, seed=0,
+                           processes=None):
+    """
+    The correlation coefficients of y against each column of x, for
+    each of a number of bootstrap resamples. Each resample draws the
+    same indices for every column. Resample indices are drawn a batch
+    at a time, counted, and the sums needed for each correlation are
+    then a matrix product of the counts and the moments of the data.
+    Each batch has its own random stream, so the result does not
+    depend on the number of processes.
+
+    :params x_values: an array of n values, or n by k values, or a
+        list of k arrays of n values
+    :params y_values: n values
+    :params resamples: the number of bootstrap resamples
+    :params seed: seeds the random resampling
+    :params processes: if more than one, the batches are spread
+        across a pool of this many processes
+    :returns: a resamples by k array of correlation coefficients,
+        nan where a resample has no variance
+    :raises: ValueError if x and y have different numbers of values
+    """
+    moments = _moments(x_values, y_values)
+    no_values = moments.shape[0]
+    batch_size = max(1, BATCH_ELEMENTS // max(no_values, 1))
+    batch_sizes = [min(batch_size, resamples - start)
+                   for start in range(0, resamples, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batch_sizes))
+
+    if processes is not None and processes > 1 and len(batch_sizes) > 1:
+        with ProcessPoolExecutor(max_workers=processes,
+                                 initializer=_set_worker_moments,
+                                 initargs=(moments,)) as pool:
+            batches = list(pool.map(_worker_batch, batch_sizes, seeds))
+    else:
+        batches = [_resample_batch(moments, size, batch_seed)
+                   for size, batch_seed in zip(batch_sizes, seeds)]
+
+    if not batches:
+        return np.zeros((0, (moments.shape[1] - 2) // 3))
+    return np.concatenate(batches)
+
+
+def correlation_intervals(x_values, y_values, resamples=10000,
+                          confidence=0.95, seed=0, processes=None):
+    """
+    Percentile bootstrap confidence intervals of the correlation
+    coefficients of y against each column of x, see
+    bootstrap_correlations
+
+    :params confidence: the confidence level of the intervals
+    :returns: arrays of the lower and upper bounds, one for each column
+        of x
+    :raises: ValueError if confidence is not between 0 and 1
+    """
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("Confidence must be between 0 and 1")
+    correlations = bootstrap_correlations(x_values, y_values, resamples,
+                                          seed, processes)
+    tail = 50.0 * (1.0 - confidence)
+    if correlations.shape[0] == 0 or np.all(np.isnan(correlations)):
+        no_columns = correlations.shape[1]
+        return np.full(no_columns, np.nan), np.full(no_columns, np.nan)
+    with warnings.catch_warnings():
+        #a column with no variance has no interval
+        warnings.simplefilter('ignore', RuntimeWarning)
+        lower, upper = np.nanpercentile(correlations,
+                                        [tail, 100.0 - tail], axis=0)
+    return lower, upper
+
+
+def _moments(x_values, y_values):
+    """
+    The columns whose resampled sums give the correlations, y, y
+    squared, then each x, x squared, and x times y. The values are
+    centred first, to keep the sums accurate.
+    """
+    y_values = np.asarray(y_values, dtype=np.float64).ravel()
+    if isinstance(x_values, (list, tuple)):
+        x_values = np.column_stack(x_values)
+    x_values = np.asarray(x_values, dtype=np.float64)
+    if x_values.ndim == 1:
+        x_values = x_values[:, np.newaxis]
+    if x_values.shape[0] != y_values.shape[0]:
+        raise ValueError("x and y must have the same number of values")
+
+    if y_values.shape[0] > 0:
+        y_values = y_values - np.mean(y_values)
+        x_values = x_values - np.mean(x_values, axis=0)
+    return np.column_stack((y_values, y_values * y_values, x_values,
+                            x_values * x_values,
+                            x_values * y_values[:, np.newaxis]))
+
+
+def _resample_batch(moments, batch_size, seed):
+    """
+    The correlations of a batch of resamples
+    """
+    rng = np.random.default_rng(seed)
+    no_values = moments.shape[0]
+    no_columns = (moments.shape[1] - 2) // 3
+
+    indices = rng.integers(0, no_values, size=(batch_size, no_values),
+                           dtype=np.intp)
+    #counting a row at a time keeps the counts in cache
+    counts = np.empty((batch_size, no_values))
+    for row, row_indices in enumerate(indices):
+        counts[row] = np.bincount(row_indices, minlength=no_values)
+    sums = counts @ moments
+
+    sum_y = sums[:, 0:1]
+    sum_sq_y = sums[:, 1:2]
+    sum_x = sums[:, 2:2 + no_columns]
+    sum_sq_x = sums[:, 2 + no_columns:2 + 2 * no_columns]
+    sum_xy = sums[:, 2 + 2 * no_columns:]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = sum_xy - sum_x * sum_y / no_values
+        variance_x = sum_sq_x - sum_x * sum_x / no_values
+        variance_y = sum_sq_y - sum_y * sum_y / no_values
+        correlations = covariance / np.sqrt(variance_x * variance_y)
+    correlations[~np.isfinite(correlations)] = np.nan
+    return correlations
+
+
+def _set_worker_moments(moments):
+    """
+    Keeps the moments in a worker process, so they are only sent once
+    """
+    global _WORKER_MOMENTS #pylint:disable=global-statement
+    _WORKER_MOMENTS = moments
+
+
+def _worker_batch(batch_size, seed):
+    """
+    Resamples a batch in a worker process
+    """
+    return _resample_batch(_WORKER_MOMENTS, batch_size, seed)
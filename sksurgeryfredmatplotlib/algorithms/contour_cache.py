@@ -0,0 +1,144 @@
+"""A persistent, content addressed cache for fitted contours"""
+
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+import skimage
+
+#pylint:disable=consider-using-f-string
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.sksurgeryfred',
+                                 'contour_cache')
+
+
+def image_digest(image):
+    """
+    Returns a hash of the image contents, shape and data type
+    :params image: the image to hash
+    :returns: a hexadecimal digest string
+    """
+    image = np.ascontiguousarray(image)
+    hasher = hashlib.sha1()
+    hasher.update(str(image.shape).encode('utf-8'))
+    hasher.update(image.dtype.str.encode('utf-8'))
+    hasher.update(image.data)
+    return hasher.hexdigest()
+
+
+class ContourCache:
+    """
+    Stores the results of find_outer_contour on disk, so that each image
+    only needs fitting once. Entries are keyed on the image contents and
+    fitting parameters, and are held in a directory per scikit-image version,
+    so changing scikit-image invalidates the cache. The least recently
+    used entries are removed when the cache grows beyond max_bytes.
+    The cache directory can be shared between processes and workstations.
+    If the cache directory can't be made or written to, contours are
+    simply not cached.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR,
+                 max_bytes=64 * 1024 * 1024):
+        """
+        :params cache_dir: the directory to store the cache in
+        :params max_bytes: the maximum size of the cache on disk
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.version_dir = os.path.join(
+            cache_dir, 'skimage-{0:}'.format(skimage.__version__))
+        try:
+            os.makedirs(self.version_dir, exist_ok=True)
+        except OSError:
+            pass
+
+    def make_key(self, digest, alpha, beta, gamma, no_points, **options):
+        """
+        Makes a cache key from an image digest and the contour parameters
+        :params digest: the image digest, from image_digest
+        :params options: any other fitting options that change the result
+        :returns: the key
+        """
+        key_string = '{0:}-{1!r}-{2!r}-{3!r}-{4:d}'.format(
+            digest, float(alpha), float(beta), float(gamma), int(no_points))
+        for name, value in sorted(options.items()):
+            key_string += '-{0:}={1!r}'.format(name, value)
+        return hashlib.sha1(key_string.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Looks up a contour in the cache
+        :params key: the key, from make_key
+        :returns: the snake and initialising contour, or None if not found
+        """
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                snake = data['snake']
+                init = data['init']
+        except (OSError, KeyError, ValueError):
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return snake, init
+
+    def put(self, key, snake, init):
+        """
+        Adds a contour to the cache, then evicts old entries if needed
+        :params key: the key, from make_key
+        :params snake: the fitted contour
+        :params init: the initialising contour
+        """
+        try:
+            file_handle, temp_path = tempfile.mkstemp(dir=self.version_dir,
+                                                      suffix='.tmp')
+        except OSError:
+            return
+        try:
+            with os.fdopen(file_handle, 'wb') as temp_file:
+                np.savez(temp_file, snake=snake, init=init)
+            os.replace(temp_path, self._path(key))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used entries, until the cache is
+        no bigger than max_bytes. Entries for other versions of
+        scikit-image are never used, so are the first to go.
+        """
+        entries = []
+        for dir_path, _, file_names in os.walk(self.cache_dir):
+            for file_name in file_names:
+                if not file_name.endswith('.npz'):
+                    continue
+                path = os.path.join(dir_path, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_bytes = sum(entry[1] for entry in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total_bytes -= size
+
+    def _path(self, key):
+        """
+        The file name for a key
+        """
+        return os.path.join(self.version_dir, key + '.npz')
@@ -0,0 +1,110 @@
+"""Rasterised contours, for fast inside and distance tests"""
+
+import math
+
+import numpy as np
+from scipy.ndimage import distance_transform_edt
+from skimage.draw import polygon
+
+
+class ContourMask:
+    """
+    Rasterises a closed contour once, into a boolean inside mask and
+    a signed distance field, so that testing points against the
+    contour is an array lookup. Points are in image (x, y) coordinates,
+    as used by the plots and fiducial markers, while the contour is in
+    (row, column) coordinates, as returned by find_outer_contour.
+    """
+
+    def __init__(self, outline, shape, mask=None, distance=None):
+        """
+        :params outline: Nx2 contour, in (row, column) coordinates
+        :params shape: the shape of the image the contour was fitted to
+        :params mask: an already rasterised mask for the outline, as
+            made by another ContourMask. Computed if None.
+        :params distance: the signed distance field to go with mask.
+            Computed if None.
+        """
+        self.outline = outline
+        self.shape = (shape[0], shape[1])
+
+        self.mask = mask
+        if self.mask is None:
+            self.mask = np.zeros(self.shape, dtype=bool)
+            rows, cols = polygon(outline[:, 0], outline[:, 1], self.shape)
+            self.mask[rows, cols] = True
+
+        self.distance = distance
+        if self.distance is None:
+            self.distance = (distance_transform_edt(self.mask) -
+                             distance_transform_edt(~self.mask))
+
+        self.centre = np.mean(outline, 0)[::-1]
+        self.half_extent = ((np.max(outline, 0) -
+                             np.min(outline, 0)) / 2.0)[::-1]
+
+    def _indices(self, points):
+        """
+        The nearest pixel to each point, and whether it is in the image
+        """
+        points = np.atleast_2d(points)
+        cols = np.rint(points[:, 0]).astype(np.intp)
+        rows = np.rint(points[:, 1]).astype(np.intp)
+        in_image = ((rows >= 0) & (rows < self.shape[0]) &
+                    (cols >= 0) & (cols < self.shape[1]))
+        return rows[in_image], cols[in_image], in_image
+
+    def contains(self, points):
+        """
+        Tests whether points are inside the contour
+        :params points: Nx2 or Nx3 points, in (x, y) image coordinates
+        :returns: a boolean array of length N
+        """
+        rows, cols, in_image = self._indices(points)
+        inside = np.zeros(in_image.shape, dtype=bool)
+        inside[in_image] = self.mask[rows, cols]
+        return inside
+
+    def signed_distance(self, points):
+        """
+        The distance from each point to the contour, positive inside
+        :params points: Nx2 or Nx3 points, in (x, y) image coordinates
+        :returns: an array of length N, -inf for points outside the image
+        """
+        rows, cols, in_image = self._indices(points)
+        distances = np.full(in_image.shape, -np.inf)
+        distances[in_image] = self.distance[rows, cols]
+        return distances
+
+    def make_target_point(self, edge_buffer=0.9, rng=None, batch_size=64):
+        """
+        Returns a target point inside the contour. Candidates are drawn
+        as for sksurgeryfred's make_target_point, within a circle about
+        the contour's centre, and the first that lies inside the contour
+        is used. If none do, the point furthest from the contour is used.
+        :params edge_buffer: the size of the circle, relative to the
+            smallest half width of the contour
+        :params rng: the random number generator to use, defaults to
+            numpy.random
+        :returns: a 1x3 target point
+        :raises: ValueError if the contour encloses no pixels
+        """
+        if not np.any(self.mask):
+            raise ValueError("Contour mask is empty, can't place a target")
+        if rng is None:
+            rng = np.random
+
+        max_radius = np.min(self.half_extent) * edge_buffer
+        for _ in range(100):
+            radius = rng.uniform(low=0.0, high=max_radius, size=batch_size)
+            angle = rng.uniform(low=0.0, high=math.pi * 2.0, size=batch_size)
+            candidates = np.column_stack(
+                (radius * np.cos(angle) + self.centre[0],
+                 radius * np.sin(angle) + self.centre[1],
+                 np.zeros(batch_size)))
+            inside = np.flatnonzero(self.contains(candidates))
+            if inside.size > 0:
+                return candidates[inside[0]:inside[0] + 1]
+
+        row, col = divmod(np.argmax(self.distance), self.shape[1])
+        return np.array([[col, row, 0.0]], dtype=np.float64)
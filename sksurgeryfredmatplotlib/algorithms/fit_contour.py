@@ -1,13 +1,32 @@
 """Fit a contour to an image"""
 
+from inspect import signature
+
 from skimage.color import rgb2gray
-from skimage.filters import gaussian
+from skimage.filters import gaussian, threshold_otsu
+from skimage.measure import label, find_contours
 from skimage.segmentation import active_contour
+from skimage.transform import pyramid_gaussian
 
 import numpy as np
 
+from sksurgeryfredmatplotlib.algorithms.contour_cache import image_digest
+
+SMOOTHING_SIGMA = 3
+MAX_ITERATIONS = 2500
+DEFAULT_CONVERGENCE = 0.1
+
+#the iteration limit was renamed in scikit-image 0.19
+_ITERATIONS_KEYWORD = ('max_num_iter'
+                       if 'max_num_iter' in signature(active_contour).parameters
+                       else 'max_iterations')
 
-def find_outer_contour(image, alpha=0.015, beta=10.0):
+def find_outer_contour(image, alpha=0.015, beta=10.0, gamma=0.001,
+                       no_points=400, cache=None, digest=None, smoothed=None,
+                       pyramid_levels=1, convergence=DEFAULT_CONVERGENCE,
+                       refine_iterations=250, initialiser='threshold',
+                       report=None):
+    #pylint:disable=too-many-arguments, too-many-locals
     """
     Fits an active contour to the outer most edge in the image
     :params image: the image to fit to
@@ -15,23 +34,203 @@ def find_outer_contour(image, alpha=0.015, beta=10.0):
         snake contract faster (default 0.015)
     :params beta: Snake smoothness shape parameter. Higher values makes snake
         smoother (default 10.0)
+    :params gamma: Explicit time stepping parameter (default 0.001)
+    :params no_points: the number of points in the contour (default 400)
+    :params cache: an optional ContourCache, if set the contour is only
+        fitted if it is not already in the cache
+    :params digest: the image digest used as the cache key, computed from
+        the image if None
+    :params smoothed: the smoothed grayscale image to fit to, or a function
+        returning it, so it is only made if the contour isn't cached.
+        Computed from the image if None.
+    :params pyramid_levels: the number of resolution levels to fit on. The
+        default of 1 fits at full resolution only. Higher values fit to an
+        image downsampled by 2^(levels - 1), then refine the result on
+        each finer level.
+    :params convergence: the stopping tolerance, in pixels, for each level
+    :params refine_iterations: the maximum number of iterations on each
+        level after the coarsest
+    :params initialiser: how to make the initialising contour, either the
+        name of one of INITIALISERS, or a function taking the smoothed
+        image and number of points, and returning the contour or None.
+        The default starts from the thresholded image, and if the
+        initialiser returns None, the circle is used instead.
+    :params report: an optional dictionary, which will be filled in with
+        the initialiser used and the number of snake iterations. Counting
+        iterations runs the snake in short blocks, so is slower and can
+        give a slightly different result.
     :returns: the resulting contour and the initialising contour
     """
+    initialiser_name = initialiser
+    if not isinstance(initialiser, str):
+        initialiser_name = initialiser.__name__
+
+    key = None
+    if cache is not None:
+        if digest is None:
+            digest = image_digest(image)
+        key = cache.make_key(digest, alpha, beta, gamma, no_points,
+                             **_cache_options(pyramid_levels, convergence,
+                                              refine_iterations,
+                                              initialiser_name,
+                                              report is not None))
+        cached = cache.get(key)
+        if cached is not None:
+            if report is not None:
+                report.update({'initialiser': initialiser_name,
+                               'iterations': 0, 'cached': True})
+            return cached
+
+    if smoothed is None:
+        smoothed = gaussian(to_gray(image), SMOOTHING_SIGMA)
+    elif callable(smoothed):
+        smoothed = smoothed()
+
+    init = INITIALISERS.get(initialiser_name, initialiser)(smoothed,
+                                                            no_points)
+    if init is None:
+        initialiser_name = 'circle'
+        init = circle_initialiser(smoothed, no_points)
+
+    if report is not None:
+        report.update({'initialiser': initialiser_name,
+                       'iterations': 0, 'cached': False})
+
+    if pyramid_levels > 1:
+        snake = _fit_pyramid(smoothed, init, alpha, beta, gamma,
+                             pyramid_levels, convergence, refine_iterations,
+                             report)
+    else:
+        snake = _active_contour(smoothed, init, alpha, beta, gamma,
+                                MAX_ITERATIONS, convergence, report)
+
+    if cache is not None:
+        cache.put(key, snake, init)
+    return snake, init
+
+
+def _cache_options(pyramid_levels, convergence, refine_iterations,
+                   initialiser_name, reporting=False):
+    """
+    The options that change the result, other than the defaults.
+    Reporting runs the snake in blocks, so its results are kept apart.
+    """
+    options = {}
+    if pyramid_levels > 1:
+        options = {'pyramid_levels': int(pyramid_levels),
+                   'refine_iterations': int(refine_iterations)}
+    if pyramid_levels > 1 or convergence != DEFAULT_CONVERGENCE:
+        options['convergence'] = float(convergence)
+    if initialiser_name != 'circle':
+        options['initialiser'] = initialiser_name
+    if reporting:
+        options['report'] = True
+    return options
 
-    image = to_gray(image)
 
-    centre = np.array([image.shape[0], image.shape[1]])/2.0
-    radius = np.array([image.shape[0], image.shape[1]])/2.0
+def circle_initialiser(smoothed, no_points):
+    """
+    An ellipse touching the image borders
+    :params smoothed: the image to fit to
+    :params no_points: the number of points in the contour
+    :returns: the initialising contour
+    """
+    centre = np.array([smoothed.shape[0], smoothed.shape[1]])/2.0
+    radius = np.array([smoothed.shape[0], smoothed.shape[1]])/2.0
 
-    data_s = np.linspace(0, 2*np.pi, 400)
+    data_s = np.linspace(0, 2*np.pi, no_points)
     data_r = centre[0] + radius[0]*np.sin(data_s)
     data_c = centre[1] + radius[1]*np.cos(data_s)
-    init = np.array([data_r, data_c]).T
+    return np.array([data_r, data_c]).T
 
-    snake = active_contour(gaussian(image, 3),
-                           init, alpha, beta, gamma=0.001,
-                           coordinates='rc')
-    return snake, init
+
+def threshold_initialiser(smoothed, no_points, min_area=0.01):
+    """
+    The boundary of the largest bright region, after Otsu thresholding,
+    resampled to evenly spaced points. This starts the snake close to
+    the edge, so it needs far fewer iterations than the circle.
+    :params smoothed: the image to fit to
+    :params no_points: the number of points in the contour
+    :params min_area: the smallest region to use, as a fraction of the
+        image area
+    :returns: the initialising contour, or None if there is no suitable
+        region
+    """
+    try:
+        foreground = smoothed > threshold_otsu(smoothed)
+    except ValueError:
+        return None
+
+    labels = label(foreground)
+    areas = np.bincount(labels.ravel())
+    areas[0] = 0
+    if areas.max() < min_area * smoothed.size:
+        return None
+
+    region = np.pad(labels == areas.argmax(), 1).astype(np.float64)
+    boundary = max(find_contours(region, 0.5), key=len) - 1.0
+
+    lengths = np.linalg.norm(np.diff(boundary, axis=0), axis=1)
+    distance = np.concatenate(([0.0], np.cumsum(lengths)))
+    samples = np.linspace(0, distance[-1], no_points)
+    return np.array([np.interp(samples, distance, boundary[:, 0]),
+                     np.interp(samples, distance, boundary[:, 1])]).T
+
+
+INITIALISERS = {'circle': circle_initialiser,
+                'threshold': threshold_initialiser}
+
+
+def _fit_pyramid(smoothed, init, alpha, beta, gamma, levels, convergence,
+                 refine_iterations, report=None):
+    """
+    Fits the snake on a Gaussian pyramid, from the coarsest level to
+    full resolution, starting each level from the result of the last.
+    """
+    pyramid = list(pyramid_gaussian(smoothed, max_layer=levels - 1))
+    pyramid.reverse()
+
+    scale = np.array(pyramid[0].shape[0:2]) / np.array(smoothed.shape[0:2])
+    snake = init * scale
+    max_iterations = MAX_ITERATIONS
+    for level, level_image in enumerate(pyramid):
+        if level > 0:
+            scale = (np.array(level_image.shape[0:2]) /
+                     np.array(pyramid[level - 1].shape[0:2]))
+            snake = snake * scale
+            max_iterations = refine_iterations
+        snake = _active_contour(level_image, snake, alpha, beta, gamma,
+                                max_iterations, convergence, report)
+    return snake
+
+
+def _active_contour(image, snake, alpha, beta, gamma, max_iterations,
+                    convergence, report=None, block_size=10):
+    """
+    Calls active_contour with an iteration limit and convergence tolerance,
+    using the iteration limit's name in the installed scikit-image.
+    If report is set, the snake is run block_size iterations at a time,
+    until no point moves more than the convergence tolerance, and the
+    number of iterations is added to the report.
+    """
+    if report is None:
+        return active_contour(image, snake, alpha=alpha, beta=beta,
+                              gamma=gamma, convergence=convergence,
+                              coordinates='rc',
+                              **{_ITERATIONS_KEYWORD: max_iterations})
+
+    iterations = 0
+    while iterations < max_iterations:
+        last_snake = snake
+        snake = active_contour(image, snake, alpha=alpha, beta=beta,
+                               gamma=gamma, convergence=convergence,
+                               coordinates='rc',
+                               **{_ITERATIONS_KEYWORD: block_size})
+        iterations += block_size
+        if np.max(np.linalg.norm(snake - last_snake, axis=1)) < convergence:
+            break
+    report['iterations'] += iterations
+    return snake
 
 
 def to_gray(image):
@@ -0,0 +1,98 @@
+"""Keeps a decoded image, and the versions of it we use, in memory"""
+
+import os
+
+import skimage.io
+from skimage.filters import gaussian
+
+from sksurgeryfredmatplotlib.algorithms.contour_cache import image_digest
+from sksurgeryfredmatplotlib.algorithms.fit_contour import \
+                find_outer_contour, to_gray, SMOOTHING_SIGMA
+
+
+class ImageHandle:
+    """
+    Decodes an image file once, and keeps the grayscale, smoothed, and
+    display versions in memory. The grayscale and smoothed versions are
+    only made when first used, so aren't made at all if the contour
+    comes from a cache. The file is only decoded again if its
+    modification time or size changes.
+    """
+
+    def __init__(self, file_name):
+        """
+        :params file_name: the image file to read
+        """
+        self.file_name = file_name
+        self.image = None
+        self._gray = None
+        self._smoothed = None
+        self._digest = None
+        self._contours = {}
+        self._file_stamp = None
+
+        self.reload_if_changed()
+
+    def reload_if_changed(self):
+        """
+        Decodes the image again if the file has changed since it was read
+        :returns: true if the image was reloaded
+        """
+        stat = os.stat(self.file_name)
+        file_stamp = (stat.st_mtime_ns, stat.st_size)
+        if file_stamp == self._file_stamp:
+            return False
+
+        self.image = skimage.io.imread(self.file_name)
+        self.image.setflags(write=False)
+        self._gray = None
+        self._smoothed = None
+        self._digest = None
+        self._contours = {}
+        self._file_stamp = file_stamp
+        return True
+
+    @property
+    def gray(self):
+        """
+        The grayscale image, computed on first use
+        """
+        if self._gray is None:
+            self._gray = to_gray(self.image)
+        return self._gray
+
+    @property
+    def smoothed(self):
+        """
+        The Gaussian smoothed grayscale image, computed on first use
+        """
+        if self._smoothed is None:
+            self._smoothed = gaussian(self.gray, SMOOTHING_SIGMA)
+        return self._smoothed
+
+    @property
+    def digest(self):
+        """
+        A hash of the decoded image, computed on first use
+        """
+        if self._digest is None:
+            self._digest = image_digest(self.image)
+        return self._digest
+
+    def outer_contour(self, cache=None, **kwargs):
+        """
+        Returns the outer contour of the image, see find_outer_contour.
+        Results are kept for as long as the image is unchanged.
+        :params cache: an optional ContourCache
+        :params kwargs: passed to find_outer_contour
+        :returns: the resulting contour and the initialising contour
+        """
+        key = tuple(sorted(kwargs.items()))
+        if key not in self._contours:
+            digest = None
+            if cache is not None:
+                digest = self.digest
+            self._contours[key] = find_outer_contour(
+                self.image, cache=cache, digest=digest,
+                smoothed=lambda: self.smoothed, **kwargs)
+        return self._contours[key]
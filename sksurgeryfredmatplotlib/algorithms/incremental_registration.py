@@ -0,0 +1,192 @@
+"""Point based registration, updated one fiducial at a time"""
+
+import numpy as np
+
+from sksurgeryfred.algorithms.point_based_reg import PointBasedRegistration
+
+
+class IncrementalRegistration(PointBasedRegistration):
+    """
+    Does the same registration as PointBasedRegistration, but keeps
+    running centroids and the 3x3 cross covariance of the fiducials, so
+    adding or removing a fiducial costs the same however many there are.
+    """
+
+    def __init__(self, target, fixed_fle_esv, moving_fle_esv):
+        """
+        :params target: 1x3 target point
+        :params fixed_fle_esv: the expected squared value of the fixed image fle
+        :params moving_fle_esv: the expected squared value of the moving
+            image fle
+        """
+        self.no_fids = 0
+        self._fixed_mean = np.zeros(3, dtype=np.float64)
+        self._moving_mean = np.zeros(3, dtype=np.float64)
+        self._cross_covariance = np.zeros((3, 3), dtype=np.float64)
+        self._moving_scatter = np.zeros((3, 3), dtype=np.float64)
+        self._fixed_sum_sq = 0.0
+        self._last_fixed = None
+        super().__init__(target, fixed_fle_esv, moving_fle_esv)
+
+    def reinit(self, target, fixed_fle_esv, moving_fle_esv):
+        """
+        reinitiatilses the target and errors, and removes all fiducials
+        """
+        super().reinit(target, fixed_fle_esv, moving_fle_esv)
+        self.reset()
+
+    def reset(self):
+        """
+        removes all fiducials
+        """
+        self.no_fids = 0
+        self._fixed_mean[:] = 0.0
+        self._moving_mean[:] = 0.0
+        self._cross_covariance[:] = 0.0
+        self._moving_scatter[:] = 0.0
+        self._fixed_sum_sq = 0.0
+        self._last_fixed = None
+
+    def add_fiducial(self, fixed_point, moving_point):
+        """
+        Adds a pair of corresponding fiducials
+        """
+        fixed_point = np.reshape(fixed_point, 3)[0:3].astype(np.float64)
+        moving_point = np.reshape(moving_point, 3)[0:3].astype(np.float64)
+
+        self.no_fids += 1
+        fixed_delta = fixed_point - self._fixed_mean
+        moving_delta = moving_point - self._moving_mean
+        self._fixed_mean += fixed_delta / self.no_fids
+        self._moving_mean += moving_delta / self.no_fids
+
+        self._cross_covariance += np.outer(moving_delta,
+                                           fixed_point - self._fixed_mean)
+        self._moving_scatter += np.outer(moving_delta,
+                                         moving_point - self._moving_mean)
+        self._fixed_sum_sq += np.dot(fixed_delta,
+                                     fixed_point - self._fixed_mean)
+        self._last_fixed = fixed_point
+
+    def remove_fiducial(self, fixed_point, moving_point):
+        """
+        Removes a pair of fiducials, previously added with add_fiducial
+        """
+        if self.no_fids <= 1:
+            self.reset()
+            return
+
+        fixed_point = np.reshape(fixed_point, 3)[0:3].astype(np.float64)
+        moving_point = np.reshape(moving_point, 3)[0:3].astype(np.float64)
+
+        fixed_mean = ((self.no_fids * self._fixed_mean - fixed_point) /
+                      (self.no_fids - 1))
+        moving_mean = ((self.no_fids * self._moving_mean - moving_point) /
+                       (self.no_fids - 1))
+
+        self._cross_covariance -= np.outer(moving_point - moving_mean,
+                                           fixed_point - self._fixed_mean)
+        self._moving_scatter -= np.outer(moving_point - moving_mean,
+                                         moving_point - self._moving_mean)
+        self._fixed_sum_sq -= np.dot(fixed_point - fixed_mean,
+                                     fixed_point - self._fixed_mean)
+
+        self._fixed_mean = fixed_mean
+        self._moving_mean = moving_mean
+        self.no_fids -= 1
+        self._last_fixed = None
+
+    def register(self, fixed_points=None, moving_points=None):
+        """
+        Does the registration. If fiducial arrays are passed, any rows
+        added since the last call are added to the registration, so
+        callers can pass a growing array of fiducials, as they would to
+        PointBasedRegistration. If the arrays don't follow on from the
+        last call, the registration is recalculated from them.
+        """
+        if fixed_points is not None:
+            self._update(fixed_points, moving_points)
+
+        success = False
+        fre = 0.0
+        expected_tre_squared = 0.0
+        expected_fre_sq = 0.0
+        actual_tre = 0.0
+        self.transformed_target = np.zeros(shape=(1, 3), dtype=np.float64)
+
+        if self.no_fids > 2:
+            rotation = self._rotation()
+            translation = (self._fixed_mean -
+                           np.matmul(rotation, self._moving_mean)).reshape(3, 1)
+
+            sum_squared_error = (
+                self._fixed_sum_sq + np.trace(self._moving_scatter) -
+                2.0 * np.trace(np.matmul(rotation, self._cross_covariance)))
+            fre = np.sqrt(max(sum_squared_error, 0.0) / self.no_fids)
+
+            expected_tre_squared = self._expected_tre_squared()
+            expected_fre_sq = ((1 - (2.0 / self.no_fids)) *
+                               self.fixed_fle_esv)
+
+            self.transformed_target = np.matmul(rotation,
+                                                self.target.transpose()) + \
+                                               translation
+            actual_tre = np.linalg.norm(
+                self.transformed_target - self.target[:, 0:3].transpose())
+            success = True
+
+        return [success, fre, self.fixed_fle_esv, expected_tre_squared,
+                expected_fre_sq, self.transformed_target[:, 0:3], actual_tre,
+                self.no_fids]
+
+    def _update(self, fixed_points, moving_points):
+        """
+        Brings the running sums up to date with the fiducial arrays
+        """
+        no_points = fixed_points.shape[0]
+        follows_on = (no_points >= self.no_fids and
+                      (self.no_fids == 0 or
+                       (self._last_fixed is not None and
+                        np.array_equal(fixed_points[self.no_fids - 1, 0:3],
+                                       self._last_fixed))))
+        if not follows_on:
+            self.reset()
+
+        for index in range(self.no_fids, no_points):
+            self.add_fiducial(fixed_points[index], moving_points[index])
+
+    def _rotation(self):
+        """
+        The rotation from moving to fixed, as sksurgerycore's
+        orthogonal_procrustes, using Fitzpatrick's correction to
+        avoid reflections
+        """
+        u_matrix, _, v_transposed = np.linalg.svd(self._cross_covariance)
+        correction = np.eye(3)
+        correction[2][2] = np.linalg.det(
+            np.matmul(v_transposed.transpose(), u_matrix))
+        return np.matmul(v_transposed.transpose(),
+                         np.matmul(correction, u_matrix.transpose()))
+
+    def _expected_tre_squared(self):
+        """
+        The expected TRE squared, as sksurgerycore's compute_tre_from_fle,
+        from the running sums. As there, each axis is the line from the
+        moving centroid through a row of the covariance eigenvector matrix.
+        """
+        covariance = self._moving_scatter / (self.no_fids - 1)
+        _, eigen_vectors_matrix = np.linalg.eig(covariance)
+
+        target = self.target[0, 0:3] - self._moving_mean
+        sum_sq = np.trace(self._moving_scatter)
+        inner_sum = 0.0
+        for axis_index in range(3):
+            direction = eigen_vectors_matrix[axis_index] - self._moving_mean
+            direction = direction / np.linalg.norm(direction)
+            f_k_squared = (sum_sq - np.matmul(
+                direction, np.matmul(self._moving_scatter, direction))) / \
+                self.no_fids
+            d_k_squared = np.dot(target, target) - np.dot(target, direction)**2
+            inner_sum += d_k_squared / f_k_squared
+
+        return (self.fixed_fle_esv / self.no_fids) * (1 + (1./3.) * inner_sum)
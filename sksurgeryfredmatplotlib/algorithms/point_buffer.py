@@ -0,0 +1,75 @@
+"""A growable buffer of points"""
+
+import numpy as np
+
+
+class PointBuffer:
+    """
+    An append only array of points. Storage doubles in size when full, so
+    adding a point is amortised constant time, and points gives a view of
+    the rows in use without copying. Views are invalidated when the
+    buffer grows or is cleared.
+    """
+
+    def __init__(self, columns=3, capacity=16, dtype=np.float64):
+        """
+        :params columns: the number of values per point
+        :params capacity: the initial number of points to allocate
+        :params dtype: the data type of the points
+        """
+        self._data = np.zeros((max(capacity, 1), columns), dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def points(self):
+        """
+        A view of the points in the buffer
+        """
+        return self._data[:self._size]
+
+    @property
+    def capacity(self):
+        """
+        The number of points the buffer can hold before it must grow
+        """
+        return self._data.shape[0]
+
+    def append(self, point):
+        """
+        Adds a point to the end of the buffer
+        """
+        self._reserve(self._size + 1)
+        self._data[self._size] = np.reshape(point, self._data.shape[1])
+        self._size += 1
+
+    def extend(self, points):
+        """
+        Adds an array of points to the end of the buffer
+        """
+        points = np.reshape(points, (-1, self._data.shape[1]))
+        self._reserve(self._size + points.shape[0])
+        self._data[self._size:self._size + points.shape[0]] = points
+        self._size += points.shape[0]
+
+    def clear(self):
+        """
+        Empties the buffer, keeping its storage
+        """
+        self._size = 0
+
+    def _reserve(self, size):
+        """
+        Doubles the storage until it can hold size points
+        """
+        capacity = self.capacity
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        data = np.zeros((capacity, self._data.shape[1]),
+                        dtype=self._data.dtype)
+        data[:self._size] = self._data[:self._size]
+        self._data = data
@@ -0,0 +1,59 @@
+"""A bounded, uniform random sample of a stream of points"""
+
+import numpy as np
+
+
+class RandomSample:
+    """
+    Keeps a uniform random sample of at most max_points of the points
+    added so far, so a stream of any length can be drawn at a bounded
+    cost. Each point is given a random key when added, and the points
+    with the smallest keys are kept, in the order they were added.
+    """
+
+    def __init__(self, max_points, columns, rng=None):
+        """
+        :params max_points: the most points to keep, if None all are kept
+        :params columns: the number of values per point
+        :params rng: the random number generator to sample with
+        """
+        if rng is None:
+            rng = np.random.default_rng(0)
+        self.max_points = max_points
+        self.rng = rng
+        self.columns = columns
+        self.count = 0
+        self.points = np.zeros((0, columns))
+        self._keys = np.zeros(0)
+
+    def extend(self, points):
+        """
+        Adds an array of points
+        :params points: an array with a row per point
+        """
+        points = np.reshape(points, (-1, self.columns))
+        self.count += points.shape[0]
+        self.points = np.concatenate((self.points, points))
+        self._keys = np.concatenate((self._keys,
+                                     self.rng.random(points.shape[0])))
+
+        if (self.max_points is not None and
+                self.points.shape[0] > self.max_points):
+            kept = np.sort(np.argpartition(self._keys, self.max_points - 1)
+                           [0:self.max_points])
+            self.points = self.points[kept]
+            self._keys = self._keys[kept]
+
+    def is_complete(self):
+        """
+        :returns: true if every point added is in the sample
+        """
+        return self.points.shape[0] == self.count
+
+    def clear(self):
+        """
+        Removes all the points
+        """
+        self.count = 0
+        self.points = np.zeros((0, self.columns))
+        self._keys = np.zeros(0)
@@ -0,0 +1,121 @@
+"""Running linear regression and correlation, without keeping the data"""
+
+import math
+
+import numpy as np
+
+
+class RunningRegression:
+    """
+    Keeps the count, means, and sums of squared deviations of x and y,
+    updated a batch at a time, so the least squares line and correlation
+    coefficient of y against x are available without keeping the data.
+    Batches are combined with Welford's update, as generalised by Chan
+    et al., which stays accurate for large counts.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.sum_sq_x = 0.0
+        self.sum_sq_y = 0.0
+        self.sum_xy = 0.0
+        self.min_x = math.inf
+        self.max_x = -math.inf
+
+    def update(self, x_values, y_values):
+        """
+        Adds a batch of values
+        :params x_values: the x values
+        :params y_values: the corresponding y values
+        """
+        x_values = np.asarray(x_values, dtype=np.float64).ravel()
+        y_values = np.asarray(y_values, dtype=np.float64).ravel()
+        if x_values.shape != y_values.shape:
+            raise ValueError("x and y must have the same number of values")
+        if x_values.size == 0:
+            return
+
+        mean_x = np.mean(x_values)
+        mean_y = np.mean(y_values)
+        x_deviations = x_values - mean_x
+        y_deviations = y_values - mean_y
+        self._combine(x_values.size, mean_x, mean_y,
+                      np.dot(x_deviations, x_deviations),
+                      np.dot(y_deviations, y_deviations),
+                      np.dot(x_deviations, y_deviations),
+                      np.min(x_values), np.max(x_values))
+
+    def merge(self, other):
+        """
+        Adds the values of another running regression, so statistics
+        gathered separately, for example from parts of a log read in
+        parallel, can be combined
+        :params other: the running regression to add
+        :returns: this running regression
+        """
+        if other.count > 0:
+            self._combine(other.count, other.mean_x, other.mean_y,
+                          other.sum_sq_x, other.sum_sq_y, other.sum_xy,
+                          other.min_x, other.max_x)
+        return self
+
+    def variances(self):
+        """
+        The sample variances of x and y, as numpy's var with ddof=1
+        :returns: the variances, nan with fewer than two values
+        """
+        if self.count < 2:
+            return math.nan, math.nan
+        return (self.sum_sq_x / (self.count - 1),
+                self.sum_sq_y / (self.count - 1))
+
+    def covariance(self):
+        """
+        The sample covariance of x and y, as numpy's cov
+        :returns: the covariance, nan with fewer than two values
+        """
+        if self.count < 2:
+            return math.nan
+        return self.sum_xy / (self.count - 1)
+
+    def fit(self):
+        """
+        The least squares line through the values, as numpy's polyfit
+        with degree 1
+        :returns: the slope and intercept, nan if x has no variance
+        """
+        if self.count < 2 or self.sum_sq_x <= 0.0:
+            return math.nan, math.nan
+        slope = self.sum_xy / self.sum_sq_x
+        return slope, self.mean_y - slope * self.mean_x
+
+    def correlation(self):
+        """
+        The correlation coefficient of x and y, as numpy's corrcoef
+        :returns: the coefficient, nan if x or y has no variance
+        """
+        if self.count < 2 or self.sum_sq_x <= 0.0 or self.sum_sq_y <= 0.0:
+            return math.nan
+        return self.sum_xy / math.sqrt(self.sum_sq_x * self.sum_sq_y)
+
+    def _combine(self, count, mean_x, mean_y, sum_sq_x, sum_sq_y, sum_xy,
+                 min_x, max_x):
+        """
+        Combines the statistics of a batch with the running statistics
+        """
+        #pylint:disable=too-many-arguments
+        total = self.count + count
+        delta_x = mean_x - self.mean_x
+        delta_y = mean_y - self.mean_y
+        weight = self.count * count / total
+
+        self.sum_sq_x += sum_sq_x + delta_x * delta_x * weight
+        self.sum_sq_y += sum_sq_y + delta_y * delta_y * weight
+        self.sum_xy += sum_xy + delta_x * delta_y * weight
+        self.mean_x += delta_x * count / total
+        self.mean_y += delta_y * count / total
+        self.count = total
+        self.min_x = min(self.min_x, min_x)
+        self.max_x = max(self.max_x, max_x)
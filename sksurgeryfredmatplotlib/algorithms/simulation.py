@@ -0,0 +1,218 @@
+"""
+Headless simulation of registration trials, for generating TRE versus FRE
+data without a user. Trials with the same number of fiducials are
+registered together, using stacked numpy linear algebra.
+"""
+
+import math
+
+import numpy as np
+
+from sksurgeryfredmatplotlib.algorithms.contour_mask import ContourMask
+from sksurgeryfredmatplotlib.algorithms.image_handle import ImageHandle
+
+
+def batch_procrustes(fixed, moving):
+    """
+    Orthogonal Procrustes registration of many point sets at once, as
+    sksurgerycore's orthogonal_procrustes.
+    :params fixed: TxNx3 array, T sets of N fixed points
+    :params moving: TxNx3 array of corresponding moving points
+    :returns: Tx3x3 rotations, Tx3 translations, and T FREs
+    """
+    fixed_centroid = np.mean(fixed, axis=1)
+    moving_centroid = np.mean(moving, axis=1)
+    fixed_centred = fixed - fixed_centroid[:, np.newaxis, :]
+    moving_centred = moving - moving_centroid[:, np.newaxis, :]
+
+    cross_covariance = np.einsum('tni,tnj->tij', moving_centred,
+                                 fixed_centred)
+    u_matrix, _, v_transposed = np.linalg.svd(cross_covariance)
+    v_matrix = np.transpose(v_transposed, (0, 2, 1))
+
+    correction = np.tile(np.eye(3), (fixed.shape[0], 1, 1))
+    correction[:, 2, 2] = np.linalg.det(np.matmul(v_matrix, u_matrix))
+    rotation = np.matmul(v_matrix, np.matmul(
+        correction, np.transpose(u_matrix, (0, 2, 1))))
+
+    translation = fixed_centroid - np.einsum('tij,tj->ti', rotation,
+                                             moving_centroid)
+    transformed = (np.einsum('tij,tnj->tni', rotation, moving) +
+                   translation[:, np.newaxis, :])
+    fre = np.sqrt(np.mean(np.sum((fixed - transformed)**2, axis=2), axis=1))
+    return rotation, translation, fre
+
+
+def batch_expected_tre_squared(fiducials, mean_fle_squared, targets):
+    """
+    Expected TRE squared for many fiducial sets at once, as sksurgerycore's
+    compute_tre_from_fle, including its use of the rows of the eigenvector
+    matrix as points on each axis.
+    :params fiducials: TxNx3 array of fiducial points
+    :params mean_fle_squared: length T array of expected FLE squared
+    :params targets: Tx3 array of target points
+    :returns: length T array of expected TRE squared
+    """
+    no_fids = fiducials.shape[1]
+    centroid = np.mean(fiducials, axis=1)
+    centred = fiducials - centroid[:, np.newaxis, :]
+    scatter = np.einsum('tni,tnj->tij', centred, centred)
+    _, eigen_vectors_matrix = np.linalg.eig(scatter / (no_fids - 1))
+
+    directions = np.real(eigen_vectors_matrix) - centroid[:, np.newaxis, :]
+    directions /= np.linalg.norm(directions, axis=2)[:, :, np.newaxis]
+
+    sum_sq = np.trace(scatter, axis1=1, axis2=2)
+    f_k_squared = (sum_sq[:, np.newaxis] -
+                   np.einsum('tki,tij,tkj->tk', directions, scatter,
+                             directions)) / no_fids
+
+    target = targets - centroid
+    d_k_squared = (np.sum(target * target, axis=1)[:, np.newaxis] -
+                   np.einsum('tki,ti->tk', directions, target)**2)
+
+    inner_sum = np.sum(d_k_squared / f_k_squared, axis=1)
+    return (mean_fle_squared / no_fids) * (1 + (1./3.) * inner_sum)
+
+
+class RegistrationSimulator:
+    """
+    Simulates registration trials as set up by FredCommon.init_reg. For
+    each trial a target is placed in the anatomy, an isotropic fixed
+    image FLE is drawn, and fiducials are placed at random inside the
+    anatomy, then perturbed by the FLE and registered.
+    """
+
+    def __init__(self, contour_mask, min_fids=3, max_fids=20,
+                 fle_sd_range=(0.5, 5.0), rng=None):
+        """
+        :params contour_mask: a ContourMask for the anatomy
+        :params min_fids: the fewest fiducials to use in a trial
+        :params max_fids: the most fiducials to use in a trial
+        :params fle_sd_range: the range of the fixed FLE standard
+            deviation, as drawn by FredCommon.init_reg
+        :params rng: a numpy random Generator, defaults to a new one
+        """
+        if min_fids < 3:
+            raise ValueError("At least 3 fiducials are needed to register")
+        if max_fids < min_fids:
+            raise ValueError("max_fids must be at least min_fids")
+
+        self.contour_mask = contour_mask
+        self.min_fids = min_fids
+        self.max_fids = max_fids
+        self.fle_sd_range = fle_sd_range
+        self.rng = rng
+        if self.rng is None:
+            self.rng = np.random.default_rng()
+
+        rows, cols = np.nonzero(contour_mask.mask)
+        if rows.size == 0:
+            raise ValueError("Contour mask is empty, can't place fiducials")
+        self._inside_pixels = np.column_stack((cols, rows)).astype(np.float64)
+
+    def sample_targets(self, no_trials):
+        """
+        Places a target in the anatomy for each trial, as
+        ContourMask.make_target_point
+        :returns: no_trials x 3 array of targets
+        """
+        targets = np.zeros((no_trials, 3), dtype=np.float64)
+        max_radius = np.min(self.contour_mask.half_extent) * 0.9
+        remaining = np.arange(no_trials)
+        for _ in range(100):
+            if remaining.size == 0:
+                return targets
+            radius = self.rng.uniform(0.0, max_radius, size=remaining.size)
+            angle = self.rng.uniform(0.0, math.pi * 2.0, size=remaining.size)
+            targets[remaining, 0] = (radius * np.cos(angle) +
+                                     self.contour_mask.centre[0])
+            targets[remaining, 1] = (radius * np.sin(angle) +
+                                     self.contour_mask.centre[1])
+            remaining = remaining[
+                ~self.contour_mask.contains(targets[remaining])]
+
+        for trial in remaining:
+            targets[trial] = self.contour_mask.make_target_point(rng=self.rng)
+        return targets
+
+    def sample_fiducials(self, no_trials, no_fids):
+        """
+        Places fiducials uniformly inside the anatomy
+        :returns: no_trials x no_fids x 3 array of fiducial positions
+        """
+        indices = self.rng.integers(0, self._inside_pixels.shape[0],
+                                    size=(no_trials, no_fids))
+        fiducials = np.zeros((no_trials, no_fids, 3), dtype=np.float64)
+        fiducials[:, :, 0:2] = (self._inside_pixels[indices] +
+                                self.rng.uniform(-0.5, 0.5,
+                                                 size=(no_trials, no_fids, 2)))
+        return fiducials
+
+    def run(self, no_trials):
+        """
+        Simulates a number of trials
+        :returns: a list of arrays, actual TRE, actual FRE, expected TRE,
+            expected FRE, mean FLE, and number of fiducials, in the same
+            order as Logger.read_log
+        """
+        no_fids = self.rng.integers(self.min_fids, self.max_fids + 1,
+                                    size=no_trials)
+        fle_sd = self.rng.uniform(self.fle_sd_range[0], self.fle_sd_range[1],
+                                  size=no_trials)
+        fle_esv = 3.0 * fle_sd * fle_sd
+        targets = self.sample_targets(no_trials)
+
+        actual_tres = np.zeros(no_trials, dtype=np.float64)
+        actual_fres = np.zeros(no_trials, dtype=np.float64)
+        expected_tres_sq = np.zeros(no_trials, dtype=np.float64)
+
+        for fid_count in np.unique(no_fids):
+            trials = np.flatnonzero(no_fids == fid_count)
+            moving = self.sample_fiducials(trials.size, fid_count)
+            fixed = moving + (fle_sd[trials, np.newaxis, np.newaxis] *
+                              self.rng.standard_normal(size=moving.shape))
+
+            rotation, translation, fre = batch_procrustes(fixed, moving)
+            transformed_targets = (np.einsum('tij,tj->ti', rotation,
+                                             targets[trials]) + translation)
+
+            actual_tres[trials] = np.linalg.norm(
+                transformed_targets - targets[trials], axis=1)
+            actual_fres[trials] = fre
+            expected_tres_sq[trials] = batch_expected_tre_squared(
+                moving, fle_esv[trials], targets[trials])
+
+        expected_fres = np.sqrt((1 - (2.0 / no_fids)) * fle_esv)
+        return [actual_tres, actual_fres, np.sqrt(expected_tres_sq),
+                expected_fres, np.sqrt(fle_esv), no_fids]
+
+
+def simulate_from_image(image_file_name, no_trials, cache=None, **kwargs):
+    """
+    Fits the anatomy in an image, as FredCommon.init_reg, then simulates
+    registration trials on it
+    :params image_file_name: the image to use
+    :params no_trials: the number of trials to simulate
+    :params cache: an optional ContourCache
+    :params kwargs: passed to RegistrationSimulator
+    :returns: the results, as RegistrationSimulator.run
+    """
+    image = ImageHandle(image_file_name)
+    outline, _initial_guess = image.outer_contour(cache)
+    simulator = RegistrationSimulator(
+        ContourMask(outline, image.image.shape), **kwargs)
+    return simulator.run(no_trials)
+
+
+def log_results(logger, results):
+    """
+    Writes simulated results to a Logger, in the same format as
+    interactive registrations
+    :params logger: the Logger to write to
+    :params results: the results, as RegistrationSimulator.run
+    """
+    for (actual_tre, fre, expected_tre, expected_fre, mean_fle,
+         no_fids) in zip(*results):
+        logger.log_result(actual_tre, fre, expected_tre, expected_fre,
+                          mean_fle, int(no_fids))
@@ -0,0 +1,103 @@
+"""
+Runs simulated registration trials in parallel, sharded across a pool of
+processes. Each shard has its own random number stream, spawned from a
+single seed, so results depend only on the seed and the shard size, not
+on the number of workers. The contour mask is shared with the workers
+through memory mapped temporary files, rather than copied to each.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+from tempfile import TemporaryDirectory
+
+import numpy as np
+
+from sksurgeryfredmatplotlib.algorithms.contour_mask import ContourMask
+from sksurgeryfredmatplotlib.algorithms.image_handle import ImageHandle
+from sksurgeryfredmatplotlib.algorithms.simulation import RegistrationSimulator
+
+_WORKER_STATE = {}
+
+
+def _init_worker(outline, shape, mask_file, distance_file):
+    """
+    Sets up a worker process with a read only view of the shared mask
+    """
+    mask = np.load(mask_file, mmap_mode='r')
+    distance = np.load(distance_file, mmap_mode='r')
+    _WORKER_STATE['contour_mask'] = ContourMask(outline, shape, mask=mask,
+                                                distance=distance)
+
+
+def _run_shard(no_trials, seed_sequence, simulator_kwargs):
+    """
+    Simulates one shard of trials, in a worker process
+    """
+    simulator = RegistrationSimulator(_WORKER_STATE['contour_mask'],
+                                      rng=np.random.default_rng(seed_sequence),
+                                      **simulator_kwargs)
+    return simulator.run(no_trials)
+
+
+def _share_array(array, directory, name):
+    """
+    Saves an array to a file the workers can memory map
+    :returns: the file's name
+    """
+    file_name = os.path.join(directory, name + '.npy')
+    np.save(file_name, array)
+    return file_name
+
+
+def run_simulations(contour_mask, no_trials, workers=None, seed=None,
+                    shard_size=1000, **simulator_kwargs):
+    """
+    Simulates registration trials in parallel
+    :params contour_mask: a ContourMask for the anatomy
+    :params no_trials: the number of trials to simulate
+    :params workers: the number of worker processes, defaults to the
+        number of processors
+    :params seed: the seed for the random number generators, if None
+        fresh entropy is used
+    :params shard_size: the number of trials per shard, small enough
+        that there are many more shards than workers
+    :params simulator_kwargs: passed to RegistrationSimulator
+    :returns: the merged results, as RegistrationSimulator.run
+    """
+    no_shards = max(1, -(-no_trials // shard_size))
+    shard_trials = [shard_size] * (no_shards - 1)
+    shard_trials.append(no_trials - shard_size * (no_shards - 1))
+    seed_sequences = np.random.SeedSequence(seed).spawn(no_shards)
+
+    with TemporaryDirectory() as directory:
+        mask_file = _share_array(contour_mask.mask, directory, 'mask')
+        distance_file = _share_array(contour_mask.distance, directory,
+                                     'distance')
+        with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker,
+                initargs=(contour_mask.outline, contour_mask.shape,
+                          mask_file, distance_file)) as pool:
+            futures = [pool.submit(_run_shard, trials, seed_sequence,
+                                   simulator_kwargs)
+                       for trials, seed_sequence in zip(shard_trials,
+                                                        seed_sequences)]
+            shard_results = [future.result() for future in futures]
+
+    return [np.concatenate(columns) for columns in zip(*shard_results)]
+
+
+def run_simulations_from_image(image_file_name, no_trials, cache=None,
+                               **kwargs):
+    """
+    Fits the anatomy in an image, as FredCommon.init_reg, then simulates
+    registration trials on it in parallel
+    :params image_file_name: the image to use
+    :params no_trials: the number of trials to simulate
+    :params cache: an optional ContourCache
+    :params kwargs: passed to run_simulations
+    :returns: the merged results, as RegistrationSimulator.run
+    """
+    image = ImageHandle(image_file_name)
+    outline, _initial_guess = image.outer_contour(cache)
+    return run_simulations(ContourMask(outline, image.image.shape),
+                           no_trials, **kwargs)
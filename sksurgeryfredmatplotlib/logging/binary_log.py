@@ -0,0 +1,345 @@
+"""
+A compact binary format for sksurgeryfred results. A file is a fixed
+size header, then 56 byte record slots, one per result or ablation
+score, so it can be appended to, and read without parsing using
+numpy.memmap. Each record type has its own layout within the slot,
+given by the first byte. Results are stored as 8 byte floats, so they
+keep the four decimal places of the text log at any size, and ablation
+states as a code indexing the table of states in the header. The header
+has room for MAX_STATES states of MAX_STATE_LENGTH characters, and holds
+the record layouts and the state table as JSON, so files can be
+checked before they are read or appended to.
+"""
+
+import json
+import logging
+import os
+import struct
+
+import numpy as np
+
+#pylint:disable=consider-using-f-string
+
+MAGIC = b'FREDLOG\x00'
+FORMAT_VERSION = 3
+RECORD_BYTES = 56
+
+#the longest ablation state kept, in characters, as ABLATION_DTYPE
+MAX_STATE_LENGTH = 32
+MAX_STATES = 256
+#the most bytes a state takes in the header's JSON, with each character
+#escaped as \uXXXX, and the quotes and separator
+MAX_STATE_BYTES = 6 * MAX_STATE_LENGTH + 4
+#room for the version, logger name and layouts, and every state
+HEADER_BYTES = 4096 + MAX_STATES * MAX_STATE_BYTES
+
+SUCCESS_RECORD = 1
+ABLATION_RECORD = 2
+
+RECORD_DTYPE = np.dtype({'names' : ['record_type', 'time'],
+                         'formats' : ['u1', '<f8'],
+                         'offsets' : [0, 48],
+                         'itemsize' : RECORD_BYTES})
+
+RESULT_RECORD_DTYPE = np.dtype({
+    'names' : ['record_type', 'no_fids', 'actual_tre', 'actual_fre',
+               'expected_tre', 'expected_fre', 'mean_fle', 'time'],
+    'formats' : ['u1', '<u2', '<f8', '<f8', '<f8', '<f8', '<f8', '<f8'],
+    'offsets' : [0, 2, 8, 16, 24, 32, 40, 48],
+    'itemsize' : RECORD_BYTES})
+
+ABLATION_RECORD_DTYPE = np.dtype({
+    'names' : ['record_type', 'state', 'score', 'time'],
+    'formats' : ['u1', 'u1', '<f8', '<f8'],
+    'offsets' : [0, 1, 8, 48],
+    'itemsize' : RECORD_BYTES})
+
+
+def is_binary_log(file_name):
+    """
+    Tests whether a file is a binary log
+    :params file_name: the file to test
+    :returns: true if the file starts with the binary log magic number
+    """
+    try:
+        with open(file_name, 'rb') as log_file:
+            return log_file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def read_header(file_name):
+    """
+    Reads and checks the header of a binary log
+    :params file_name: the binary log
+    :returns: the header dictionary, and the offset of the first record
+    :raises: IOError if the file isn't a binary log this version can read
+    """
+    with open(file_name, 'rb') as log_file:
+        magic = log_file.read(len(MAGIC))
+        length_bytes = log_file.read(4)
+        if magic != MAGIC or len(length_bytes) != 4:
+            raise IOError("{0:} is not a binary log file".format(file_name))
+        header_length = struct.unpack('<I', length_bytes)[0]
+        try:
+            header = json.loads(log_file.read(header_length).decode('utf-8'))
+        except (ValueError, UnicodeDecodeError) as error:
+            raise IOError("Bad binary log header in {0:}".format(
+                file_name)) from error
+
+    if (header.get('version') != FORMAT_VERSION or
+            header.get('layouts') != _layouts()):
+        raise IOError(("Unsupported binary log format in " +
+                       "{0:}".format(file_name)))
+    return header, len(MAGIC) + 4 + header_length
+
+
+def read_binary_log(file_name, start=0):
+    """
+    Opens the records of a binary log, without reading or copying them
+    :params file_name: the binary log
+    :params start: the index of the first record to open
+    :returns: a read only array of records, with RECORD_DTYPE, backed
+        by a memory map of the file, and the table of ablation states.
+        A partly written last record is left out. See split_records.
+    :raises: IOError if the file isn't a binary log this version can read
+    """
+    header, offset = read_header(file_name)
+    no_records = (os.path.getsize(file_name) - offset) // RECORD_BYTES
+    if no_records <= start:
+        return np.zeros(0, dtype=RECORD_DTYPE), header['states']
+    return (np.memmap(file_name, dtype=RECORD_DTYPE, mode='r',
+                      offset=offset + start * RECORD_BYTES,
+                      shape=(no_records - start,)),
+            header['states'])
+
+
+def split_records(records):
+    """
+    Splits records by type
+    :params records: an array of records, with RECORD_DTYPE
+    :returns: the results, with RESULT_RECORD_DTYPE, and the ablation
+        scores, with ABLATION_RECORD_DTYPE
+    """
+    record_types = records['record_type']
+    #select whole slots, as selecting records only copies their fields
+    slots = records.view(np.dtype((np.void, RECORD_BYTES)))
+    return (slots[record_types == SUCCESS_RECORD].view(RESULT_RECORD_DTYPE),
+            slots[record_types == ABLATION_RECORD].view(
+                ABLATION_RECORD_DTYPE))
+
+
+def make_records(no_records):
+    """
+    Makes an empty array of records, ready to fill in through views
+    with RESULT_RECORD_DTYPE or ABLATION_RECORD_DTYPE
+    """
+    records = np.zeros(no_records, dtype=RECORD_DTYPE)
+    records['time'] = np.nan
+    return records
+
+
+def truncate_state(state_string):
+    """
+    Shortens an ablation state to MAX_STATE_LENGTH characters
+    """
+    return str(state_string)[0:MAX_STATE_LENGTH]
+
+
+class BinaryLogWriter:
+    """
+    Appends records to a binary log, writing the header if the file is
+    new. Appending to an existing file checks its header first, and
+    drops any partly written last record.
+    """
+
+    def __init__(self, file_name, overwrite=False, logger_name=''):
+        """
+        :params file_name: the binary log to write
+        :params overwrite: if true any existing file is replaced
+        :params logger_name: the name of the logger writing the records,
+            stored in the header so the text log can be recreated
+        :raises: IOError if appending to a file that isn't a binary log
+        """
+        self.file_name = file_name
+        if (not overwrite and os.path.exists(file_name) and
+                os.path.getsize(file_name) > 0):
+            header, offset = read_header(file_name)
+            self.logger_name = header.get('logger name', '')
+            self.states = list(header['states'])
+            whole_records = ((os.path.getsize(file_name) - offset) //
+                             RECORD_BYTES)
+            self._file = open(file_name, 'r+b') #pylint:disable=consider-using-with
+            self._file.truncate(offset + whole_records * RECORD_BYTES)
+            self._file.seek(0, os.SEEK_END)
+        else:
+            self.logger_name = logger_name
+            self.states = []
+            self._file = open(file_name, 'wb') #pylint:disable=consider-using-with
+            self._file.write(_make_header(logger_name, self.states))
+
+    def write(self, records):
+        """
+        Appends an array of records
+        :params records: an array with RECORD_DTYPE, or a view of one
+        """
+        self._file.write(np.asarray(records).view(RECORD_DTYPE).tobytes())
+
+    def write_result(self, time, actual_tre, fre, expected_tre, expected_fre,
+                     mean_fle, no_fids):
+        """
+        Appends a registration result, as Logger.log_result
+        """
+        record = make_records(1).view(RESULT_RECORD_DTYPE)
+        record['time'] = time
+        record['record_type'] = SUCCESS_RECORD
+        record['actual_tre'] = actual_tre
+        record['actual_fre'] = fre
+        record['expected_tre'] = expected_tre
+        record['expected_fre'] = expected_fre
+        record['mean_fle'] = mean_fle
+        record['no_fids'] = no_fids
+        self.write(record)
+
+    def write_score(self, time, state_string, score):
+        """
+        Appends an ablation score, as Logger.log_score
+        :raises: IOError if the header has no room for a new state
+        """
+        record = make_records(1).view(ABLATION_RECORD_DTYPE)
+        record['time'] = time
+        record['record_type'] = ABLATION_RECORD
+        record['state'] = self.state_code(state_string)
+        record['score'] = score
+        self.write(record)
+
+    def state_code(self, state_string):
+        """
+        The code of an ablation state, adding it to the state table in
+        the header if it is new. States are shortened to
+        MAX_STATE_LENGTH characters.
+        :raises: IOError if the header has no room for a new state
+        """
+        state_string = truncate_state(state_string)
+        if state_string in self.states:
+            return self.states.index(state_string)
+        if len(self.states) >= MAX_STATES:
+            raise IOError("Too many ablation states for {0:}".format(
+                self.file_name))
+
+        header = _make_header(self.logger_name, self.states + [state_string])
+        position = self._file.tell()
+        self._file.seek(0)
+        self._file.write(header)
+        self._file.seek(position)
+        self.states.append(state_string)
+        return len(self.states) - 1
+
+    def flush(self):
+        """
+        Flushes the file
+        """
+        self._file.flush()
+
+    def close(self):
+        """
+        Flushes and closes the file
+        """
+        if not self._file.closed:
+            self._file.flush()
+            self._file.close()
+
+
+class BinaryLogHandler(logging.Handler):
+    """
+    A logging handler that writes the results and scores logged by
+    Logger to a binary log. Other messages are ignored.
+    """
+
+    def __init__(self, file_name, overwrite=False, logger_name='',
+                 batch_size=1):
+        """
+        :params file_name: the binary log to write
+        :params overwrite: if true any existing file is replaced
+        :params logger_name: the logger name to store in the header
+        :params batch_size: the number of records to write between flushes
+        """
+        super().__init__()
+        self.writer = BinaryLogWriter(file_name, overwrite, logger_name)
+        self.batch_size = batch_size
+        self._unflushed = 0
+
+    def emit(self, record):
+        """
+        Writes a result or score, passed as the fred_record attribute
+        of the log record
+        """
+        fred_record = getattr(record, 'fred_record', None)
+        if fred_record is None:
+            return
+        try:
+            if fred_record[0] == SUCCESS_RECORD:
+                self.writer.write_result(record.created, *fred_record[1:])
+            else:
+                self.writer.write_score(record.created, *fred_record[1:])
+        except Exception: #pylint:disable=broad-except
+            self.handleError(record)
+            return
+
+        self._unflushed += 1
+        if self._unflushed >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Flushes the file
+        """
+        self.acquire()
+        try:
+            self.writer.flush()
+            self._unflushed = 0
+        finally:
+            self.release()
+
+    def close(self):
+        """
+        Flushes and closes the file
+        """
+        self.acquire()
+        try:
+            self.writer.close()
+        finally:
+            self.release()
+        super().close()
+
+
+def _layouts():
+    """
+    The record layouts, as stored in the header
+    """
+    return {name : {'names' : list(dtype.names),
+                    'formats' : [dtype.fields[field][0].str
+                                 for field in dtype.names],
+                    'offsets' : [dtype.fields[field][1]
+                                 for field in dtype.names],
+                    'itemsize' : dtype.itemsize}
+            for name, dtype in [('result', RESULT_RECORD_DTYPE),
+                                ('ablation', ABLATION_RECORD_DTYPE)]}
+
+
+def _make_header(logger_name, states):
+    """
+    Makes the file header, padded to HEADER_BYTES so the state table
+    can grow without moving the records
+    :raises: IOError if the header doesn't fit
+    """
+    header = json.dumps({
+        'version' : FORMAT_VERSION,
+        'logger name' : logger_name,
+        'layouts' : _layouts(),
+        'states' : states}, ensure_ascii=False).encode('utf-8')
+    padding = HEADER_BYTES - (len(MAGIC) + 4 + len(header))
+    if padding < 0:
+        raise IOError("Binary log header too long")
+    header += b' ' * padding
+    return MAGIC + struct.pack('<I', len(header)) + header
@@ -1,9 +1,47 @@
 """ Class to handle sksurgeryfred logging """
 
 from logging import getLogger, FileHandler, Formatter, INFO
-import csv
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
+import weakref
 from sksurgeryfred import __version__
+from sksurgeryfredmatplotlib.logging.binary_log import BinaryLogHandler, \
+                SUCCESS_RECORD, ABLATION_RECORD
+from sksurgeryfredmatplotlib.logging.log_cache import read_records_cached
+from sksurgeryfredmatplotlib.logging.log_reader import read_results, \
+                read_result_chunks, RESULT_DTYPE, CHUNK_BYTES
 #pylint:disable=consider-using-f-string
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def logger_name():
+    """
+    The name sksurgeryfred logs under, including the version
+    """
+    version_string = __version__
+    friendly_vs = version_string if version_string else 'unknown'
+    return "sksurgeryfred v" + friendly_vs
+
+
+def format_result(actual_tre, fre, expected_tre, expected_fre, mean_fle,
+                  no_fids):
+    """
+    The log message for a registration result
+    """
+    return ("success, {0:.4f}, {1:.4f}, {2:.4f}, {3:.4f}, {4:.4f}," +
+            "{5:2d}").format(
+                actual_tre, fre, expected_tre, expected_fre, mean_fle,
+                no_fids)
+
+
+def format_score(state_string, score):
+    """
+    The log message for an ablation score
+    """
+    return ("ablation, {0:}, {1:}").format(state_string, score)
+
+
 class Logger():
     """
     Implements logging functionality for sksurgeryfred.
@@ -15,7 +53,13 @@ class Logger():
             an empty logger is created and subsequent calls to log() will
             have no effect. Otherwise a logger is created according to the
             entries in the logger config dictionary. ("log file name",
-            "overwrite existing"
+            "overwrite existing", "asynchronous", "batch size",
+            "binary file name").
+            If "asynchronous" is true, records are queued and written to
+            file by a background thread, flushing the file every
+            "batch size" records, or when the queue is empty.
+            If "binary file name" is set, results and scores are also
+            written to a binary log, see binary_log.
 
     :raises: IOError if the user can't write to the named log file?
     """
@@ -28,9 +72,7 @@ class Logger():
         self._no_logging = True
         log_config = config.get("logger")
         if log_config is not None:
-            version_string = __version__
-            friendly_vs = version_string if version_string else 'unknown'
-            self._logger = getLogger("sksurgeryfred v" + friendly_vs)
+            self._logger = getLogger(logger_name())
 
             self.log_file_name = log_config.get("log file name",
                                                 "sksurgeryfred.log")
@@ -40,16 +82,39 @@ class Logger():
             if overwrite:
                 mode = 'w'
 
-            file_handler = FileHandler(self.log_file_name, mode)
-
-            formatter = Formatter('%(asctime)s - %(name)s -' +
-                                  ' %(levelname)s - %(message)s')
-
-            file_handler.setFormatter(formatter)
-
-            self._logger.addHandler(file_handler)
+            asynchronous = log_config.get("asynchronous", False)
+            batch_size = log_config.get("batch size", 64)
+
+            if asynchronous:
+                file_handler = BatchFileHandler(self.log_file_name, mode,
+                                                batch_size)
+            else:
+                file_handler = FileHandler(self.log_file_name, mode)
+                batch_size = 1
+            file_handler.setFormatter(Formatter(LOG_FORMAT))
+            file_handlers = [file_handler]
+
+            self.binary_file_name = log_config.get("binary file name")
+            if self.binary_file_name is not None:
+                file_handlers.append(BinaryLogHandler(
+                    self.binary_file_name, overwrite, logger_name(),
+                    batch_size))
+
+            listener = None
+            handlers = file_handlers
+            if asynchronous:
+                log_queue = Queue()
+                handlers = [QueueHandler(log_queue)]
+                listener = BatchingQueueListener(log_queue, *file_handlers)
+                listener.start()
+
+            for handler in handlers:
+                self._logger.addHandler(handler)
             self._logger.setLevel(INFO)
             self._no_logging = False
+            self._finalizer = weakref.finalize(
+                self, _shutdown, self._logger, handlers, listener,
+                file_handlers)
 
     def log(self, message):
         """If logging, passes message to logger"""
@@ -63,54 +128,124 @@ class Logger():
         """
         Writes the registration result to log file
         """
-        msg = ("success, {0:.4f}, {1:.4f}, {2:.4f}, {3:.4f}, {4:.4f}," +
-               "{5:2d}").format(
-                   actual_tre, fre, expected_tre, expected_fre, mean_fle,
-                   no_fids)
-        self._logger.info(msg)
+        msg = format_result(actual_tre, fre, expected_tre, expected_fre,
+                            mean_fle, no_fids)
+        self._logger.info(msg, extra={'fred_record' : (
+            SUCCESS_RECORD, actual_tre, fre, expected_tre, expected_fre,
+            mean_fle, no_fids)})
 
     def log_score(self, state_string, score):
         """
         Writes the registration result to log file
         """
-        msg = ("ablation, {0:}, {1:}").format(state_string, score)
-        self._logger.info(msg)
-
-
-
-    def read_log(self):
-        """
-        reads a log file and returns lists of values
-        """
-        actual_tres = []
-        actual_fres = []
-        expected_tres = []
-        expected_fres = []
-        mean_fles = []
-        no_fids = []
-
-        samples = 0
-        with open(self.log_file_name, mode='r', encoding='utf-8') as csv_file:
-            csv_reader = csv.reader(csv_file, delimiter=',')
-            for row in csv_reader:
-                try:
-                    actual_tres.append(float(row[2]))
-                    actual_fres.append(float(row[3]))
-                    expected_tres.append(float(row[4]))
-                    expected_fres.append(float(row[5]))
-                    mean_fles.append(float(row[6]))
-                    no_fids.append(int(row[7]))
-                    samples += 1
-                except IndexError:
-                    raise IOError(("Failed to read log file, " +
-                                   "{0:}".format(self.log_file_name) +
-                                   " near line: {0:}".format(samples))) \
-                                                   from IOError
-        return [actual_tres, actual_fres, expected_tres, expected_fres,
-                mean_fles, no_fids]
-
-    def __del__(self):
-        """Releases the log file"""
+        msg = format_score(state_string, score)
+        self._logger.info(msg, extra={'fred_record' : (
+            ABLATION_RECORD, state_string, score)})
+
+
+
+    def read_log(self, use_cache=False):
+        """
+        reads a log file and returns numpy arrays of values, actual TRE,
+        actual FRE, expected TRE, expected FRE, mean FLE, and number of
+        fiducials
+
+        :params use_cache: if true, the parsed log is cached in a
+            sidecar file, see log_cache
+        :raises: IOError if any line is not a registration result
+        """
+        if use_cache:
+            results, _ablations = read_records_cached(self.log_file_name)
+            return [results[name] for name in RESULT_DTYPE.names]
+        return read_results(self.log_file_name)
+
+    def read_log_chunks(self, chunk_bytes=CHUNK_BYTES):
+        """
+        reads a log file a chunk at a time, so logs larger than memory
+        can be summarised
+
+        :params chunk_bytes: about how many bytes of the log to read at
+            a time
+        :returns: a generator of lists of numpy arrays, as read_log
+        :raises: IOError if any line is not a registration result
+        """
+        for results in read_result_chunks(self.log_file_name, chunk_bytes):
+            yield [results[name] for name in RESULT_DTYPE.names]
+
+    def close(self):
+        """
+        Writes any queued records and releases the log file. Called
+        automatically when the Logger is garbage collected, or at exit.
+        """
         if not self._no_logging:
-            self._logger.handlers[0].flush()
-            self._logger.handlers[0].close()
+            self._finalizer()
+
+
+class BatchFileHandler(FileHandler):
+    """
+    A FileHandler that flushes every batch_size records, rather than
+    after every record
+    """
+
+    def __init__(self, filename, mode='a', batch_size=64):
+        """
+        :params filename: the file to write to
+        :params mode: the mode to open the file with
+        :params batch_size: the number of records to write between flushes
+        """
+        super().__init__(filename, mode)
+        self.batch_size = batch_size
+        self._unflushed = 0
+
+    def emit(self, record):
+        """
+        Writes a record, flushing if a batch is complete
+        """
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception: #pylint:disable=broad-except
+            self.handleError(record)
+            return
+
+        self._unflushed += 1
+        if self._unflushed >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Flushes the file
+        """
+        super().flush()
+        self._unflushed = 0
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    A QueueListener that flushes its handlers whenever it empties
+    the queue, so records aren't left unwritten while the program is idle
+    """
+
+    def handle(self, record):
+        """
+        Handles a record, then flushes if there are no more waiting
+        """
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+
+def _shutdown(logger, handlers, listener, file_handlers):
+    """
+    Detaches a Logger's handlers, drains its queue if it has one, then
+    flushes and closes the log files
+    """
+    for handler in handlers:
+        logger.removeHandler(handler)
+    if listener is not None:
+        listener.stop()
+    for file_handler in file_handlers:
+        file_handler.flush()
+        file_handler.close()
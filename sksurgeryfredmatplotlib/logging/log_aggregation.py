@@ -0,0 +1,244 @@
+"""
+Reads many sksurgeryfred logs in parallel, such as those collected
+from every machine in a lab, and merges them into one columnar dataset,
+with each record tagged with the session it came from.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import glob
+import json
+import math
+import os
+
+import numpy as np
+
+from sksurgeryfredmatplotlib.logging.log_reader import read_records, \
+                RESULT_DTYPE, ABLATION_DTYPE
+
+AGGREGATE_RESULT_DTYPE = np.dtype(RESULT_DTYPE.descr +
+                                  [('session', np.int32)])
+AGGREGATE_ABLATION_DTYPE = np.dtype(ABLATION_DTYPE.descr +
+                                    [('session', np.int32)])
+
+
+def find_logs(paths, pattern='*.log'):
+    """
+    Finds the log files to aggregate
+
+    :params paths: a list of directories, which are searched
+        recursively, glob patterns, or log files
+    :params pattern: the file name pattern of logs within directories
+    :returns: a sorted list of log files, each given once
+    """
+    found = set()
+    for path in paths:
+        if os.path.isdir(path):
+            matches = glob.glob(os.path.join(path, '**', pattern),
+                                recursive=True)
+        elif glob.has_magic(path):
+            matches = glob.glob(path, recursive=True)
+        else:
+            matches = [path]
+        found.update(os.path.abspath(match) for match in matches
+                     if os.path.isfile(match))
+    return sorted(found)
+
+
+def session_names(log_files):
+    """
+    Names each log's session by its path relative to the directory
+    holding all the logs, e.g. lab_pc_3/fred_results.log
+    """
+    if not log_files:
+        return []
+    root = os.path.commonpath([os.path.dirname(log_file)
+                               for log_file in log_files])
+    return [os.path.relpath(log_file, root) for log_file in log_files]
+
+
+def aggregate_logs(log_files, workers=None, progress=None):
+    """
+    Reads logs in a pool of processes and merges their records. A log
+    that can't be read is left out, and its error noted in its summary.
+
+    :params log_files: the logs to read, see find_logs
+    :params workers: the number of worker processes, defaults to the
+        number of processors. If 1 the logs are read in this process.
+    :params progress: if set, called with the number of logs read so
+        far, the number of logs, and the log just read
+    :returns: the merged results, with AGGREGATE_RESULT_DTYPE, the
+        merged ablations, with AGGREGATE_ABLATION_DTYPE, and a list of
+        summaries, one for each log, see summarise_session
+    """
+    records = [None] * len(log_files)
+    if workers == 1 or len(log_files) < 2:
+        read_backs = ((index, _read_log(log_file))
+                      for index, log_file in enumerate(log_files))
+        _collect(read_backs, records, log_files, progress)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_read_log, log_file) : index
+                       for index, log_file in enumerate(log_files)}
+            read_backs = ((futures[future], future.result())
+                          for future in as_completed(futures))
+            _collect(read_backs, records, log_files, progress)
+
+    sessions = session_names(log_files)
+    summaries = []
+    results = []
+    ablations = []
+    for session, (log_file, (session_results, session_ablations, error)) \
+            in enumerate(zip(log_files, records)):
+        summaries.append(summarise_session(sessions[session], log_file,
+                                           session_results,
+                                           session_ablations, error))
+        results.append(_tag(session_results, AGGREGATE_RESULT_DTYPE,
+                            session))
+        ablations.append(_tag(session_ablations, AGGREGATE_ABLATION_DTYPE,
+                              session))
+
+    if not log_files:
+        return (np.zeros(0, dtype=AGGREGATE_RESULT_DTYPE),
+                np.zeros(0, dtype=AGGREGATE_ABLATION_DTYPE), summaries)
+    return np.concatenate(results), np.concatenate(ablations), summaries
+
+
+def summarise_session(session, log_file, results, ablations, error=None):
+    """
+    Summarises the records of one log
+
+    :params session: the session's name
+    :params log_file: the log the records came from
+    :params results: the session's results, as read_records
+    :params ablations: the session's ablations, as read_records
+    :params error: why the log couldn't be read, if it couldn't
+    :returns: a dictionary of the number of records, the mean of
+        each result, the correlation of actual TRE with each other
+        result, and the mean ablation score
+    """
+    actual_tre = results['actual_tre'].astype(np.float64)
+    means = {}
+    correlations = {}
+    for name in RESULT_DTYPE.names:
+        values = results[name].astype(np.float64)
+        means[name] = float(np.mean(values)) if values.size else math.nan
+        if name != 'actual_tre':
+            correlations[name] = _correlation(values, actual_tre)
+
+    mean_score = math.nan
+    if ablations.size:
+        mean_score = float(np.mean(ablations['score']))
+
+    return {"session" : session, "source" : log_file,
+            "results" : int(results.shape[0]),
+            "ablations" : int(ablations.shape[0]),
+            "means" : means,
+            "correlations with actual TRE" : correlations,
+            "mean ablation score" : mean_score,
+            "error" : error}
+
+
+def save_dataset(file_name, results, ablations, summaries):
+    """
+    Saves a merged dataset to an npz file, a column to each array. The
+    ablation columns are prefixed with ablation_, and the sessions and
+    sources arrays give the name and log file of each session index.
+    """
+    columns = {name : results[name] for name in results.dtype.names}
+    columns.update({'ablation_' + name : ablations[name]
+                    for name in ablations.dtype.names})
+    np.savez(file_name,
+             sessions=np.array([summary["session"] for summary in summaries],
+                               dtype=str),
+             sources=np.array([summary["source"] for summary in summaries],
+                              dtype=str),
+             **columns)
+
+
+def load_dataset(file_name):
+    """
+    Loads a dataset saved by save_dataset
+
+    :returns: the results and ablations, as aggregate_logs, and the
+        session names and sources
+    """
+    with np.load(file_name) as data:
+        columns = {name : np.asarray(data[name]) for name in data.files}
+
+    results = np.zeros(columns['session'].shape[0],
+                       dtype=AGGREGATE_RESULT_DTYPE)
+    for name in AGGREGATE_RESULT_DTYPE.names:
+        results[name] = columns[name]
+    ablations = np.zeros(columns['ablation_session'].shape[0],
+                         dtype=AGGREGATE_ABLATION_DTYPE)
+    for name in AGGREGATE_ABLATION_DTYPE.names:
+        ablations[name] = columns['ablation_' + name]
+    return (results, ablations,
+            [str(session) for session in columns['sessions']],
+            [str(source) for source in columns['sources']])
+
+
+def save_summaries(file_name, summaries):
+    """
+    Writes the session summaries to a JSON file. Values that are not a
+    number are written as null.
+    """
+    with open(file_name, 'w', encoding='utf-8') as json_file:
+        json.dump([_json_value(summary) for summary in summaries],
+                  json_file, indent=2)
+
+
+def _read_log(log_file):
+    """
+    Reads a log in a worker process. Any error parsing the log is
+    returned, so one bad log doesn't stop the others being read.
+    :returns: the results, ablations, and any error reading them
+    """
+    try:
+        results, ablations = read_records(log_file)
+        return results, ablations, None
+    except (IOError, ValueError, IndexError) as error:
+        return (np.zeros(0, dtype=RESULT_DTYPE),
+                np.zeros(0, dtype=ABLATION_DTYPE), str(error))
+
+
+def _collect(read_backs, records, log_files, progress):
+    """
+    Puts each log's records in its place, as they are read, reporting
+    progress
+    """
+    for done, (index, read_back) in enumerate(read_backs, start=1):
+        records[index] = read_back
+        if progress is not None:
+            progress(done, len(log_files), log_files[index])
+
+
+def _tag(records, dtype, session):
+    """
+    Copies records into an array with a session column
+    """
+    tagged = np.zeros(records.shape[0], dtype=dtype)
+    for name in records.dtype.names:
+        tagged[name] = records[name]
+    tagged['session'] = session
+    return tagged
+
+
+def _correlation(x_values, y_values):
+    """
+    The correlation coefficient, nan if either has no variance
+    """
+    if x_values.size < 2 or np.ptp(x_values) == 0 or np.ptp(y_values) == 0:
+        return math.nan
+    return float(np.corrcoef(x_values, y_values)[0, 1])
+
+
+def _json_value(value):
+    """
+    Replaces values that are not a number with None
+    """
+    if isinstance(value, dict):
+        return {key : _json_value(item) for key, item in value.items()}
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
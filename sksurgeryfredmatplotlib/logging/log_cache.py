@@ -0,0 +1,159 @@
+"""
+Caches parsed text logs in an .npz file next to the log, so that a log
+is only parsed once. When the log has been appended to since it was
+cached, only the new lines are parsed.
+"""
+
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+from sksurgeryfredmatplotlib.logging.binary_log import is_binary_log
+from sksurgeryfredmatplotlib.logging.log_reader import parse_records, \
+                read_records, RESULT_DTYPE, ABLATION_DTYPE
+
+PARSER_VERSION = 1
+SIDECAR_SUFFIX = '.cache.npz'
+
+#the number of bytes before the cached offset checked to make sure
+#the log has only been appended to
+_TAIL_BYTES = 4096
+
+
+def sidecar_file_name(log_file_name):
+    """
+    The cache file for a log
+    """
+    return log_file_name + SIDECAR_SUFFIX
+
+
+def read_records_cached(log_file_name, sidecar=None):
+    """
+    Reads all the records from a log, as read_records, using and
+    updating a cache of the parsed records. The cache is used if the log's
+    path, size and modification time, and the parser version, match.
+    If the log has grown, and the cached part is unchanged, only the
+    appended bytes are parsed. Binary logs need no parsing, so are
+    read directly.
+
+    :params log_file_name: the log file to read
+    :params sidecar: the cache file, defaults to sidecar_file_name
+    :returns: the results and ablations, as read_records
+    :raises: IOError if any line is not a valid record
+    """
+    if is_binary_log(log_file_name):
+        return read_records(log_file_name)
+    if sidecar is None:
+        sidecar = sidecar_file_name(log_file_name)
+
+    path = os.path.abspath(log_file_name)
+    stat = os.stat(log_file_name)
+    cached = _load_sidecar(sidecar, path)
+
+    if (cached is not None and cached['size'] == stat.st_size and
+            cached['mtime_ns'] == stat.st_mtime_ns):
+        return cached['results'], cached['ablations']
+
+    with open(log_file_name, mode='rb') as log_file:
+        if cached is None or not _is_appended(log_file, cached):
+            cached = {'results' : np.zeros(0, dtype=RESULT_DTYPE),
+                      'ablations' : np.zeros(0, dtype=ABLATION_DTYPE),
+                      'offset' : 0, 'lines' : 0, 'tail_digest' : ''}
+        log_file.seek(cached['offset'])
+        new_bytes = log_file.read()
+
+    #only whole lines are cached, a last line without a newline may
+    #still be being written
+    complete = new_bytes.rfind(b'\n') + 1
+    new_results, new_ablations = parse_records(
+        new_bytes[0:complete], log_file_name, cached['lines'] + 1)
+
+    results = np.concatenate((cached['results'], new_results))
+    ablations = np.concatenate((cached['ablations'], new_ablations))
+    offset = cached['offset'] + complete
+    lines = cached['lines'] + new_bytes.count(b'\n', 0, complete)
+
+    with open(log_file_name, mode='rb') as log_file:
+        tail_digest = _tail_digest(log_file, offset)
+    _save_sidecar(sidecar, {
+        'results' : results, 'ablations' : ablations, 'path' : path,
+        'size' : stat.st_size, 'mtime_ns' : stat.st_mtime_ns,
+        'offset' : offset, 'lines' : lines, 'tail_digest' : tail_digest})
+
+    partial_line = new_bytes[complete:]
+    if partial_line.strip():
+        try:
+            partial_results, partial_ablations = parse_records(
+                partial_line, log_file_name, lines + 1)
+            results = np.concatenate((results, partial_results))
+            ablations = np.concatenate((ablations, partial_ablations))
+        except IOError:
+            pass
+
+    return results, ablations
+
+
+def _is_appended(log_file, cached):
+    """
+    Checks that the cached part of a log is unchanged
+    """
+    log_file.seek(0, os.SEEK_END)
+    if log_file.tell() < cached['offset']:
+        return False
+    return _tail_digest(log_file, cached['offset']) == cached['tail_digest']
+
+
+def _tail_digest(log_file, offset):
+    """
+    A hash of the bytes just before offset
+    """
+    start = max(0, offset - _TAIL_BYTES)
+    log_file.seek(start)
+    return hashlib.sha1(log_file.read(offset - start)).hexdigest()
+
+
+def _load_sidecar(sidecar, path):
+    """
+    Loads a cache file, if it is for this log and parser version
+    :returns: a dictionary of cached values, or None
+    """
+    try:
+        with np.load(sidecar) as data:
+            results = np.asarray(data['results'])
+            ablations = np.asarray(data['ablations'])
+            if (int(data['version']) != PARSER_VERSION or
+                    str(data['path']) != path or
+                    results.dtype != RESULT_DTYPE or
+                    ablations.dtype != ABLATION_DTYPE):
+                return None
+            return {'results' : results,
+                    'ablations' : ablations,
+                    'size' : int(data['size']),
+                    'mtime_ns' : int(data['mtime_ns']),
+                    'offset' : int(data['offset']),
+                    'lines' : int(data['lines']),
+                    'tail_digest' : str(data['tail_digest'])}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _save_sidecar(sidecar, values):
+    """
+    Writes a cache file, atomically so readers never see part of one.
+    Failing to write the cache, for example to a read only directory,
+    is not an error.
+    """
+    try:
+        file_handle, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(sidecar)), suffix='.tmp')
+    except OSError:
+        return
+    try:
+        with os.fdopen(file_handle, 'wb') as temp_file:
+            np.savez(temp_file, version=PARSER_VERSION, **values)
+        os.replace(temp_path, sidecar)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
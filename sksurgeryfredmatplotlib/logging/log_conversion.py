@@ -0,0 +1,139 @@
+"""Converts sksurgeryfred logs between the text and binary formats"""
+
+from logging import Formatter, makeLogRecord, INFO
+import math
+import time
+
+import numpy as np
+
+from sksurgeryfredmatplotlib.logging.binary_log import BinaryLogWriter, \
+                make_records, read_binary_log, read_header, \
+                SUCCESS_RECORD, ABLATION_RECORD, RESULT_RECORD_DTYPE, \
+                ABLATION_RECORD_DTYPE
+from sksurgeryfredmatplotlib.logging.fred_logger import LOG_FORMAT, \
+                format_result, format_score, logger_name
+from sksurgeryfredmatplotlib.logging.log_reader import parse_records, \
+                RESULT_DTYPE
+
+
+def text_to_binary(text_file_name, binary_file_name, overwrite=True):
+    """
+    Converts a text log to a binary log, keeping the order and time
+    of each record.
+    :params text_file_name: the text log to read
+    :params binary_file_name: the binary log to write
+    :params overwrite: if false, the records are appended to any
+        existing binary log
+    :returns: the number of records written
+    :raises: IOError if any line is not a valid record, see parse_records
+    """
+    with open(text_file_name, mode='rb') as text_file:
+        contents = text_file.read()
+    results, ablations = parse_records(contents, text_file_name)
+
+    lines = [line for line in contents.splitlines() if line.strip()]
+    records = make_records(len(lines))
+    is_result = np.array([line.rpartition(b' - ')[2].startswith(b'success')
+                          for line in lines], dtype=bool)
+    records['time'] = _epoch_times(
+        [line.partition(b' - ')[0] for line in lines])
+
+    name = logger_name()
+    if lines:
+        name = lines[0].split(b' - ')[1].decode('utf-8', 'replace')
+    writer = BinaryLogWriter(binary_file_name, overwrite, name)
+
+    result_records = records.view(RESULT_RECORD_DTYPE)
+    result_records['record_type'][is_result] = SUCCESS_RECORD
+    for field in RESULT_DTYPE.names:
+        result_records[field][is_result] = results[field]
+
+    ablation_records = records.view(ABLATION_RECORD_DTYPE)
+    ablation_records['record_type'][~is_result] = ABLATION_RECORD
+    ablation_records['state'][~is_result] = [
+        writer.state_code(state) for state in ablations['state']]
+    ablation_records['score'][~is_result] = ablations['score']
+
+    writer.write(records)
+    writer.close()
+    return len(lines)
+
+
+def binary_to_text(binary_file_name, text_file_name, overwrite=True):
+    """
+    Converts a binary log to a text log, in the format written by Logger
+    :params binary_file_name: the binary log to read
+    :params text_file_name: the text log to write
+    :params overwrite: if false, the lines are appended to any
+        existing text log
+    :returns: the number of records written
+    :raises: IOError if the binary log can't be read
+    """
+    header, _offset = read_header(binary_file_name)
+    name = header.get('logger name') or logger_name()
+    records, states = read_binary_log(binary_file_name)
+    result_records = records.view(RESULT_RECORD_DTYPE)
+    ablation_records = records.view(ABLATION_RECORD_DTYPE)
+    formatter = Formatter(LOG_FORMAT)
+
+    mode = 'w' if overwrite else 'a'
+    with open(text_file_name, mode, encoding='utf-8') as text_file:
+        for index, record in enumerate(records):
+            if record['record_type'] == SUCCESS_RECORD:
+                result = result_records[index]
+                msg = format_result(float(result['actual_tre']),
+                                    float(result['actual_fre']),
+                                    float(result['expected_tre']),
+                                    float(result['expected_fre']),
+                                    float(result['mean_fle']),
+                                    int(result['no_fids']))
+            elif record['record_type'] == ABLATION_RECORD:
+                ablation = ablation_records[index]
+                try:
+                    state = states[ablation['state']]
+                except IndexError as error:
+                    raise IOError("Unknown ablation state in " +
+                                  binary_file_name) from error
+                msg = format_score(state, float(ablation['score']))
+            else:
+                continue
+            text_file.write(formatter.format(
+                _log_record(name, msg, float(record['time']))) + '\n')
+    return len(records)
+
+
+def _log_record(name, msg, created):
+    """
+    Makes a log record as if logged at time created
+    """
+    if math.isnan(created):
+        created = 0.0
+    seconds = math.floor(created)
+    #allow for the rounding of times read from text logs
+    msecs = min(math.floor((created - seconds) * 1000 + 1e-3), 999)
+    return makeLogRecord({'name' : name, 'msg' : msg, 'levelname' : 'INFO',
+                          'levelno' : INFO, 'created' : float(seconds),
+                          'msecs' : msecs})
+
+
+def _epoch_times(stamps):
+    """
+    Converts the asctime of each line of a text log to seconds since the
+    epoch, as the created time of a log record. Lines logged in the same
+    second share their conversion.
+    """
+    times = np.full(len(stamps), np.nan)
+    seconds_cache = {}
+    for index, stamp in enumerate(stamps):
+        seconds, _, msecs = stamp.partition(b',')
+        if seconds not in seconds_cache:
+            try:
+                seconds_cache[seconds] = time.mktime(time.strptime(
+                    seconds.decode('utf-8'), '%Y-%m-%d %H:%M:%S'))
+            except (ValueError, UnicodeDecodeError):
+                seconds_cache[seconds] = np.nan
+        try:
+            times[index] = seconds_cache[seconds] + int(msecs) / 1000.0
+        except ValueError:
+            times[index] = seconds_cache[seconds]
+    return times
@@ -0,0 +1,258 @@
+"""Fast, vectorised reading of sksurgeryfred log files"""
+
+from io import BytesIO
+import warnings
+
+import numpy as np
+
+from sksurgeryfredmatplotlib.logging.binary_log import is_binary_log, \
+                read_binary_log, split_records, MAX_STATE_LENGTH
+
+#pylint:disable=consider-using-f-string
+
+SUCCESS_MARKER = b' - success,'
+
+#the number of bytes read_result_chunks reads at a time
+CHUNK_BYTES = 16 * 1024 * 1024
+
+RESULT_DTYPE = np.dtype([('actual_tre', np.float64),
+                         ('actual_fre', np.float64),
+                         ('expected_tre', np.float64),
+                         ('expected_fre', np.float64),
+                         ('mean_fle', np.float64),
+                         ('no_fids', np.int64)])
+
+ABLATION_DTYPE = np.dtype([('state', 'U{0:}'.format(MAX_STATE_LENGTH)),
+                           ('score', np.float64)])
+
+
+def read_results(log_file_name):
+    """
+    Reads the registration results from a log file, as written by
+    Logger.log_result. The file is read at once, then parsed by numpy's
+    compiled text reader, rather than a line at a time in Python. If the
+    log holds other records, such as ablation scores, it is read with
+    read_records instead. Binary logs are read with read_binary_log.
+
+    :params log_file_name: the log file to read
+    :returns: a list of numpy arrays, actual TRE, actual FRE, expected
+        TRE, expected FRE, mean FLE, and number of fiducials
+    :raises: IOError if any line is not a valid record
+    """
+    if is_binary_log(log_file_name):
+        results, _ablations = split_binary_records(
+            *read_binary_log(log_file_name))
+        return [results[name] for name in RESULT_DTYPE.names]
+
+    with open(log_file_name, mode='rb') as log_file:
+        contents = log_file.read()
+
+    try:
+        values = _load_values(BytesIO(contents))
+    except (ValueError, IndexError):
+        values = None
+
+    if values is None or values.shape[0] != contents.count(SUCCESS_MARKER):
+        results, _ablations = parse_records(contents, log_file_name)
+        return [results[name] for name in RESULT_DTYPE.names]
+
+    return _columns(values)
+
+
+def read_records(log_file_name):
+    """
+    Reads all the records from a log file in a single pass, as written
+    by Logger.log_result and Logger.log_score. Binary logs are also read.
+
+    :params log_file_name: the log file to read
+    :returns: a structured array of registration results, with
+        RESULT_DTYPE, and a structured array of ablation scores, with
+        ABLATION_DTYPE
+    :raises: IOError if any line is not a valid record, or has an
+        ablation state longer than MAX_STATE_LENGTH characters
+    """
+    if is_binary_log(log_file_name):
+        return split_binary_records(*read_binary_log(log_file_name))
+
+    with open(log_file_name, mode='rb') as log_file:
+        contents = log_file.read()
+    return parse_records(contents, log_file_name)
+
+
+def read_result_chunks(log_file_name, chunk_bytes=CHUNK_BYTES):
+    """
+    Reads the registration results from a log file a chunk at a time, so
+    logs larger than memory can be summarised. Each chunk of a text log
+    ends at a whole line. Binary logs are also read.
+
+    :params log_file_name: the log file to read
+    :params chunk_bytes: about how many bytes of the log to read at a time
+    :returns: a generator of structured arrays of registration results,
+        with RESULT_DTYPE
+    :raises: IOError if any line is not a valid record
+    """
+    if is_binary_log(log_file_name):
+        records, states = read_binary_log(log_file_name)
+        chunk_records = max(1, chunk_bytes // records.dtype.itemsize)
+        for start in range(0, records.shape[0], chunk_records):
+            results, _ablations = split_binary_records(
+                records[start:start + chunk_records], states)
+            yield results
+        return
+
+    lines = 0
+    partial_line = b''
+    with open(log_file_name, mode='rb') as log_file:
+        while True:
+            contents = log_file.read(chunk_bytes)
+            if not contents:
+                break
+            contents = partial_line + contents
+            complete = contents.rfind(b'\n') + 1
+            partial_line = contents[complete:]
+            if complete == 0:
+                continue
+            results, _ablations = parse_records(contents[0:complete],
+                                                log_file_name, lines + 1)
+            lines += contents.count(b'\n', 0, complete)
+            yield results
+
+    if partial_line.strip():
+        results, _ablations = parse_records(partial_line, log_file_name,
+                                            lines + 1)
+        yield results
+
+
+def split_binary_records(records, states):
+    """
+    Splits the records of a binary log by type
+
+    :params records: an array of binary log records
+    :params states: the log's table of ablation states
+    :returns: the results and ablations, as read_records
+    :raises: IOError if an ablation's state isn't in the table
+    """
+    successes, scores = split_records(records)
+    results = np.zeros(successes.shape[0], dtype=RESULT_DTYPE)
+    for name in RESULT_DTYPE.names:
+        results[name] = successes[name]
+
+    ablations = np.zeros(scores.shape[0], dtype=ABLATION_DTYPE)
+    if scores.shape[0] > 0:
+        codes = scores['state']
+        if codes.max() >= len(states):
+            raise IOError("Unknown ablation state in binary log")
+        ablations['state'] = np.array(states,
+                                      dtype=ABLATION_DTYPE['state'])[codes]
+        ablations['score'] = scores['score']
+    return results, ablations
+
+
+def parse_records(contents, source='log', first_line=1):
+    """
+    Splits the lines of a log by record type, then converts each type
+    together
+
+    :params contents: the bytes of the log
+    :params source: where the log came from, for error messages
+    :params first_line: the line number of the first line of contents,
+        for error messages
+    :returns: the results and ablations, as read_records
+    :raises: IOError if any line is not a valid record, or has an
+        ablation state longer than MAX_STATE_LENGTH characters
+    """
+    result_fields = []
+    ablations = []
+    for line_number, line in enumerate(contents.splitlines(),
+                                       start=first_line):
+        record_type, _, fields = line.rpartition(b' - ')[2].partition(b',')
+        if record_type == b'success':
+            result_fields.append(fields)
+        elif record_type == b'ablation':
+            state, _, score = fields.rpartition(b',')
+            try:
+                state = state.strip().decode('utf-8')
+                ablations.append((state, float(score)))
+            except (ValueError, UnicodeDecodeError):
+                _raise_bad_line(source, line_number, line)
+            if len(state) > MAX_STATE_LENGTH:
+                _raise_bad_line(source, line_number, line,
+                                "ablation state longer than {0:} characters"
+                                .format(MAX_STATE_LENGTH))
+        elif line.strip():
+            _raise_bad_line(source, line_number, line)
+
+    results = np.zeros(len(result_fields), dtype=RESULT_DTYPE)
+    if result_fields:
+        try:
+            values = _load_values(result_fields, first_column=0)
+        except (ValueError, IndexError):
+            values = None
+        if values is None or values.shape[0] != len(result_fields):
+            _find_bad_result(contents, source, first_line)
+        for name, column in zip(RESULT_DTYPE.names, _columns(values)):
+            results[name] = column
+
+    return results, np.array(ablations, dtype=ABLATION_DTYPE)
+
+
+def _load_values(lines, first_column=2):
+    """
+    Parses the comma separated result fields with numpy
+
+    :raises: ValueError if any line can't be parsed, or if the number
+        of fiducials isn't a whole number. Older versions of numpy raise
+        IndexError if a line is too short.
+    """
+    with warnings.catch_warnings():
+        #an empty log is not an error
+        warnings.simplefilter('ignore', UserWarning)
+        values = np.loadtxt(lines, delimiter=',',
+                            usecols=range(first_column, first_column + 6),
+                            dtype=np.float64, ndmin=2, encoding='utf-8')
+    if not np.array_equal(np.trunc(values[:, 5]), values[:, 5]):
+        raise ValueError("Number of fiducials must be a whole number")
+    return values
+
+
+def _columns(values):
+    """
+    Splits an array of result values into typed columns
+    """
+    return [values[:, 0], values[:, 1], values[:, 2], values[:, 3],
+            values[:, 4], values[:, 5].astype(np.int64)]
+
+
+def _find_bad_result(contents, source, first_line=1):
+    """
+    Finds the first result that can't be parsed, and raises an IOError
+    saying where it is. Only used once we know there is one.
+    """
+    for line_number, line in enumerate(contents.splitlines(),
+                                       start=first_line):
+        record_type, _, fields = line.rpartition(b' - ')[2].partition(b',')
+        if record_type != b'success':
+            continue
+        values = fields.split(b',')
+        try:
+            if len(values) != 6:
+                raise ValueError
+            for value in values[0:5]:
+                float(value)
+            int(values[5])
+        except ValueError:
+            _raise_bad_line(source, line_number, line)
+    raise IOError("Failed to read log file, {0:}".format(source))
+
+
+def _raise_bad_line(source, line_number, line, reason=None):
+    """
+    Raises an IOError giving the line that couldn't be read, and why
+    """
+    message = ("Failed to read log file, " +
+               "{0:}".format(source) +
+               " at line {0:}: {1:}".format(
+                   line_number, line.decode('utf-8', 'replace')))
+    if reason is not None:
+        message += ", {0:}".format(reason)
+    raise IOError(message)
@@ -0,0 +1,95 @@
+"""Reads the records added to a log since it was last read"""
+
+import os
+
+import numpy as np
+
+from sksurgeryfredmatplotlib.logging.log_reader import parse_records, \
+                split_binary_records, RESULT_DTYPE, ABLATION_DTYPE
+from sksurgeryfredmatplotlib.logging.binary_log import is_binary_log, \
+                read_binary_log, HEADER_BYTES, RECORD_BYTES
+
+
+class LogTail:
+    """
+    Follows a text or binary log as it is written, remembering how far
+    it has read, so each read only parses the lines or records added
+    since the last.
+    """
+
+    def __init__(self, log_file_name):
+        """
+        :params log_file_name: the log to follow, it need not exist yet
+        """
+        self.log_file_name = log_file_name
+        self.offset = 0
+        self.lines = 0
+        self.records = 0
+        self.binary = False
+
+    def read_new(self):
+        """
+        Reads the whole lines, or records, added since the last read. If
+        the log is now shorter than when last read, or has changed
+        format, it has been replaced, so is read again from the start.
+
+        :returns: the new results and ablations, as read_records, and
+            true if the log was read again from the start
+        :raises: IOError if any new line is not a valid record, or a
+            binary log can't be read
+        """
+        try:
+            size = os.path.getsize(self.log_file_name)
+        except OSError:
+            size = 0
+
+        binary = is_binary_log(self.log_file_name)
+        restarted = size < self.offset or (
+            binary != self.binary and self.offset > 0)
+        self.binary = binary
+        if restarted:
+            self.offset = 0
+            self.lines = 0
+            self.records = 0
+
+        if size == self.offset:
+            return (np.zeros(0, dtype=RESULT_DTYPE),
+                    np.zeros(0, dtype=ABLATION_DTYPE), restarted)
+
+        if binary:
+            results, ablations = self._read_new_records(size)
+        else:
+            results, ablations = self._read_new_lines(size)
+        return results, ablations, restarted
+
+    def _read_new_lines(self, size):
+        """
+        Parses the whole lines added to a text log
+        """
+        with open(self.log_file_name, mode='rb') as log_file:
+            log_file.seek(self.offset)
+            new_bytes = log_file.read(size - self.offset)
+
+        complete = new_bytes.rfind(b'\n') + 1
+        results, ablations = parse_records(new_bytes[0:complete],
+                                           self.log_file_name,
+                                           self.lines + 1)
+        self.offset += complete
+        self.lines += new_bytes.count(b'\n', 0, complete)
+        return results, ablations
+
+    def _read_new_records(self, size):
+        """
+        Reads the whole records added to a binary log. The state table
+        is read again each time, as the writer adds to it.
+        """
+        if size < HEADER_BYTES:
+            #the header is still being written
+            return (np.zeros(0, dtype=RESULT_DTYPE),
+                    np.zeros(0, dtype=ABLATION_DTYPE))
+        records, states = read_binary_log(self.log_file_name,
+                                          start=self.records)
+        results, ablations = split_binary_records(records, states)
+        self.records += records.shape[0]
+        self.offset = HEADER_BYTES + self.records * RECORD_BYTES
+        return results, ablations
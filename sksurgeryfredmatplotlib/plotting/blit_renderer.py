@@ -0,0 +1,72 @@
+"""Redraws only the parts of a figure that change, using blitting"""
+
+
+class BlitRenderer:
+    """
+    Keeps a copy of the figure without its dynamic artists, so that
+    updating the fiducials and statistics only needs those artists
+    redrawn over the copy, rather than the whole figure. The copy is
+    taken on each full draw, so is refreshed on resize or when draw is
+    called for a new trial. Where the canvas can't blit, every update is
+    a full draw.
+    """
+
+    def __init__(self, fig, artists=()):
+        """
+        :params fig: the matplotlib figure to draw
+        :params artists: the artists that change between full draws
+        """
+        self.fig = fig
+        self.canvas = fig.canvas
+        self.supports_blit = getattr(self.canvas, 'supports_blit', False)
+        self._background = None
+        self._artists = []
+        for artist in artists:
+            self.add_artist(artist)
+
+        if self.supports_blit:
+            self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def add_artist(self, artist):
+        """
+        Adds an artist to be redrawn on each update
+        """
+        if self.supports_blit:
+            artist.set_animated(True)
+        self._artists.append(artist)
+
+    def draw(self):
+        """
+        Draws the whole figure, use when the static artists change
+        """
+        self.canvas.draw()
+
+    def update(self):
+        """
+        Redraws the dynamic artists over the cached background
+        """
+        if not self.supports_blit or self._background is None:
+            self.draw()
+            return
+
+        self.canvas.restore_region(self._background)
+        self._draw_artists()
+        self.canvas.blit(self.fig.bbox)
+        self.canvas.flush_events()
+
+    def _on_draw(self, event):
+        """
+        Caches the background after a full draw, then adds the dynamic
+        artists, which the full draw leaves out
+        """
+        if event is not None and event.canvas is not self.canvas:
+            return
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        """
+        Draws the dynamic artists
+        """
+        for artist in self._artists:
+            self.fig.draw_artist(artist)
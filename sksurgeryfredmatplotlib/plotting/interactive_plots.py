@@ -2,9 +2,16 @@
 calibration and tracking
 """
 #pylint:disable=consider-using-f-string
+
+import numpy as np
+
+_EMPTY_OFFSETS = np.zeros((0, 2), dtype=np.float64)
+
+
 class PlotRegStatistics():
     """
-    writes the registration statistics
+    writes the registration statistics. Each text box is made once, then
+    updated with set_text and shown or hidden with set_visible.
     """
     def __init__(self, plot):
         """
@@ -12,18 +19,28 @@ class PlotRegStatistics():
         """
         self.plot = plot
 
-        self.texts = {
-            'fids_text' : None,
-            'tre_text' : None,
-            'exp_tre_text' : None,
-            'exp_fre_text' : None,
-            'fre_text' : None,
-            'score_text' : None,
-            'total_score_text' : None,
-            'margin_text' : None,
-            'repeats_text' : None
+        self.props = dict(boxstyle='round', facecolor='wheat', alpha=0.8)
+
+        positions = {
+            'fids_text' : (-1.65, 1.10),
+            'exp_tre_text' : (-0.90, 1.10),
+            'tre_text' : (-0.05, 1.10),
+            'fre_text' : (0.65, 1.10),
+            'total_score_text' : (1.05, 0.9),
+            'score_text' : (1.05, 0.7),
+            'margin_text' : (1.05, 0.5),
+            'repeats_text' : (1.05, 0.3)
             }
 
+        self.texts = {}
+        for name, (x_pos, y_pos) in positions.items():
+            self.texts[name] = self.plot.text(
+                x_pos, y_pos, '', transform=self.plot.transAxes,
+                fontsize=26, verticalalignment='top', bbox=self.props,
+                visible=False)
+        #the expected FRE is written in the expected TRE box
+        self.texts['exp_fre_text'] = self.texts.get('exp_tre_text')
+
         self.visibilities = {
             'fids_text' : False,
             'tre_text' : False,
@@ -36,8 +53,6 @@ class PlotRegStatistics():
             'repeats_text' : False
             }
 
-        self.props = dict(boxstyle='round', facecolor='wheat', alpha=0.8)
-
     def set_visibilities(self,
                          fids_text, tre_text, exp_tre_text, exp_fre_text,
                          fre_text,
@@ -58,27 +73,35 @@ class PlotRegStatistics():
             'repeats_text' : repeats_text
             }
 
+        for name, text in self.texts.items():
+            text.set_visible(self._is_visible(name))
+
+    def artists(self):
+        """
+        Returns the text boxes, for the renderer
+        """
+        return list(set(self.texts.values()))
+
+    def _is_visible(self, name):
+        """
+        Whether a text box should be shown
+        """
+        if name in ('exp_tre_text', 'exp_fre_text'):
+            return bool(self.visibilities.get('exp_tre_text') or
+                        self.visibilities.get('exp_fre_text'))
+        return bool(self.visibilities.get(name))
+
+    def _update_text(self, name, text):
+        """
+        Sets the contents of a text box and whether it is shown
+        """
+        self.texts[name].set_text(text)
+        self.texts[name].set_visible(self._is_visible(name))
 
     def update_stats_plot(self, tre, exp_tre, fre, exp_fre):
         """
         Updates the statistics display
         """
-        if self.texts.get('tre_text') is not None:
-            try:
-                self.texts.get('tre_text').remove()
-            except ValueError:
-                pass
-        if self.texts.get('exp_tre_text') is not None:
-            try:
-                self.texts.get('exp_tre_text').remove()
-            except ValueError:
-                pass
-        if self.texts.get('fre_text') is not None:
-            try:
-                self.texts.get('fre_text').remove()
-            except ValueError:
-                pass
-
         exp_tre_str = ('Expected TRE = {0:.2f}'.format(exp_tre))
         exp_fre_str = ('Expected FRE = {0:.2f}\n'.format(exp_fre))
         stats_str = ''
@@ -92,101 +115,50 @@ class PlotRegStatistics():
         actual_tre_str = ('Actual TRE = {0:.2f}'.format(tre))
         actual_fre_str = ('Actual FRE = {0:.2f}'.format(fre))
 
-        if (self.visibilities.get('exp_tre_text') or
-                self.visibilities.get('exp_fre_text')):
-            self.texts['exp_tre_text'] = self.plot.text(
-                -0.90, 1.10, stats_str, transform=self.plot.transAxes,
-                fontsize=26, verticalalignment='top', bbox=self.props)
-
-
-        if self.visibilities.get('tre_text'):
-            self.texts['tre_text'] = self.plot.text(
-                -0.05, 1.10, actual_tre_str, transform=self.plot.transAxes,
-                fontsize=26, verticalalignment='top', bbox=self.props)
-
-        if self.visibilities.get('fre_text'):
-            self.texts['fre_text'] = self.plot.text(
-                0.65, 1.10, actual_fre_str, transform=self.plot.transAxes,
-                fontsize=26, verticalalignment='top', bbox=self.props)
-
+        self._update_text('exp_tre_text', stats_str)
+        self._update_text('tre_text', actual_tre_str)
+        self._update_text('fre_text', actual_fre_str)
 
     def update_fids_stats(self, no_fids, mean_fle):
         """
         Updates the fids stats display
         """
-        if self.texts.get('fids_text') is not None:
-            try:
-                self.texts.get('fids_text').remove()
-            except ValueError:
-                pass
-
         fids_str = ('Number of fids = {0:}\n'.format(no_fids) +
                     'Expected FLE = {0:.2f}'.format(mean_fle))
 
-        if self.visibilities.get('fids_text'):
-            self.texts['fids_text'] = self.plot.text(
-                -1.65, 1.10, fids_str, transform=self.plot.transAxes,
-                fontsize=26, verticalalignment='top', bbox=self.props)
+        self._update_text('fids_text', fids_str)
 
     def update_margin_stats(self, margin):
         """
         Updates the margin text box
         """
-        if self.texts.get('margin_text') is not None:
-            self.texts.get('margin_text').remove()
-
-        fids_str = ('Margin: {0:.1f}'.format(margin))
-
-        if self.visibilities.get('margin_text'):
-            self.texts['margin_text'] = self.plot.text(
-                1.05, 0.5, fids_str, transform=self.plot.transAxes,
-                fontsize=26, verticalalignment='top', bbox=self.props)
+        self._update_text('margin_text', 'Margin: {0:.1f}'.format(margin))
 
     def update_last_score(self, last_score):
         """
         Updates the margin text box
         """
-        if self.texts.get('score_text') is not None:
-            self.texts.get('score_text').remove()
-
-        fids_str = ('Last Score\n{0:}'.format(last_score))
-        if self.visibilities.get('score_text'):
-            self.texts['score_text'] = self.plot.text(
-                1.05, 0.7, fids_str, transform=self.plot.transAxes,
-                fontsize=26, verticalalignment='top', bbox=self.props)
+        self._update_text('score_text', 'Last Score\n{0:}'.format(last_score))
 
     def update_total_score(self, total_score):
         """
         Updates the total score text box
         """
-        if self.texts.get('total_score_text') is not None:
-            self.texts.get('total_score_text').remove()
-
-        fids_str = ('Total Score\n{0:}'.format(total_score))
-
-        if self.visibilities.get('total_score_text'):
-            self.texts['total_score_text'] = self.plot.text(
-                1.05, 0.9, fids_str, transform=self.plot.transAxes,
-                fontsize=26, verticalalignment='top', bbox=self.props)
+        self._update_text('total_score_text',
+                          'Total Score\n{0:}'.format(total_score))
 
     def update_repeats(self, repeats):
         """
         Updates the total score text box
         """
-        if self.texts.get('repeats_text') is not None:
-            self.texts.get('repeats_text').remove()
-
-        fids_str = ('Reps:{0:}'.format(repeats))
-
-        if self.visibilities.get('repeats_text'):
-            self.texts['repeats_text'] = self.plot.text(
-                1.05, 0.3, fids_str, transform=self.plot.transAxes,
-                fontsize=26, verticalalignment='top', bbox=self.props)
+        self._update_text('repeats_text', 'Reps:{0:}'.format(repeats))
 
 
+#pylint:disable=too-many-instance-attributes
 class PlotRegistrations():
     """
-    Plots the results of registrations
+    Plots the results of registrations. The target, fiducial and
+    transformed target markers are made once, then moved with set_offsets.
     """
 
     def __init__(self, fixed_plot, moving_plot, stats_plot):
@@ -198,41 +170,58 @@ class PlotRegistrations():
         self.fixed_plot = fixed_plot
         self.moving_plot = moving_plot
 
-        self.target_scatter = None
-        self.trans_target_plots = [None, None]
-        self.fixed_fids_plots = [None, None]
-        self.moving_fids_plot = None
+        self.image_plot = None
+        self.outline_plot = None
+        self.target_scatter = self.moving_plot.scatter(
+            [], [], s=144, c='r')
+        self.trans_target_plots = [
+            self.fixed_plot.scatter([], [], s=144, c='r', marker='o'),
+            self.fixed_plot.scatter([], [], s=36, c='black', marker='+')]
+        self.fixed_fids_plots = [
+            self.fixed_plot.scatter([], [], s=64, c='g', marker='o'),
+            self.fixed_plot.scatter([], [], s=36, c='black', marker='+')]
+        self.moving_fids_plot = self.moving_plot.scatter(
+            [], [], s=64, c='g', marker='o')
 
         self.stats_plot = stats_plot
 
         self.show_actual_positions = True
         self.target_point = None
 
+    def dynamic_artists(self):
+        """
+        Returns the artists that change as fiducials are added, for the
+        renderer
+        """
+        return (self.fixed_fids_plots + [self.moving_fids_plot] +
+                self.trans_target_plots + self.stats_plot.artists())
+
     def initialise_new_reg(self, img, target_point, outline):
         """
         resets the registration
         """
-        self.moving_plot.imshow(img)
-        self.fixed_plot.plot(outline[:, 1], outline[:, 0], '-b', lw=3)
+        if self.image_plot is None:
+            self.image_plot = self.moving_plot.imshow(img)
+        else:
+            self.image_plot.set_data(img)
+            self.image_plot.set_extent((-0.5, img.shape[1] - 0.5,
+                                        img.shape[0] - 0.5, -0.5))
+
+        if self.outline_plot is None:
+            self.outline_plot, = self.fixed_plot.plot(outline[:, 1],
+                                                      outline[:, 0],
+                                                      '-b', lw=3)
+        else:
+            self.outline_plot.set_data(outline[:, 1], outline[:, 0])
         self.fixed_plot.set_ylim([0, img.shape[0]])
         self.fixed_plot.set_xlim([0, img.shape[1]])
         self.fixed_plot.axis([0, img.shape[1], img.shape[0], 0])
         self.fixed_plot.axis('scaled')
         self.target_point = target_point
 
-        if self.target_scatter is not None:
-            self.target_scatter.remove()
-
-        self.target_scatter = self.moving_plot.scatter(self.target_point[0, 0],
-                                                       self.target_point[0, 1],
-                                                       s=144, c='r')
-        if self.trans_target_plots[0] is not None:
-            self.trans_target_plots[0].remove()
-            self.trans_target_plots[0] = None
-
-        if self.trans_target_plots[1] is not None:
-            self.trans_target_plots[1].remove()
-            self.trans_target_plots[1] = None
+        self.target_scatter.set_offsets(self.target_point[:, 0:2])
+        for trans_target_plot in self.trans_target_plots:
+            trans_target_plot.set_offsets(_EMPTY_OFFSETS)
 
         self.stats_plot.update_stats_plot(0, 0, 0, 0)
 
@@ -246,31 +235,10 @@ class PlotRegistrations():
         """
         Updates plot with fiducial data
         """
-
-        if self.fixed_fids_plots[0] is not None:
-            self.fixed_fids_plots[0].remove()
-        if self.moving_fids_plot is not None:
-            self.moving_fids_plot.remove()
-
-        if self.fixed_fids_plots[1] is not None:
-            self.fixed_fids_plots[1].remove()
-
-
-        self.fixed_fids_plots[0] = self.fixed_plot.scatter(fixed_points[:, 0],
-                                                           fixed_points[:, 1],
-                                                           s=64, c='g',
-                                                           marker='o')
-        self.moving_fids_plot = self.moving_plot.scatter(moving_points[:, 0],
-                                                         moving_points[:, 1],
-                                                         s=64, c='g',
-                                                         marker="o")
-
-        if self.show_actual_positions:
-            self.fixed_fids_plots[1] = self.fixed_plot.scatter(
-                moving_points[:, 0],
-                moving_points[:, 1],
-                s=36, c='black',
-                marker='+')
+        self.fixed_fids_plots[0].set_offsets(_offsets(fixed_points))
+        self.moving_fids_plot.set_offsets(_offsets(moving_points))
+        self.fixed_fids_plots[1].set_offsets(_offsets(moving_points))
+        self.fixed_fids_plots[1].set_visible(self.show_actual_positions)
 
         self.stats_plot.update_fids_stats(no_fids, mean_fle)
 
@@ -283,20 +251,16 @@ class PlotRegistrations():
         self.stats_plot.update_stats_plot(actual_tre, expected_tre,
                                           fre, expected_fre)
 
+        self.trans_target_plots[0].set_offsets(
+            _offsets(np.reshape(transformed_target_2d, (1, -1))))
+        self.trans_target_plots[1].set_offsets(self.target_point[:, 0:2])
+        self.trans_target_plots[1].set_visible(self.show_actual_positions)
 
-        if self.trans_target_plots[0] is not None:
-            self.trans_target_plots[0].remove()
-
-        if self.trans_target_plots[1] is not None:
-            self.trans_target_plots[1].remove()
-
-        self.trans_target_plots[0] = self.fixed_plot.scatter(
-            transformed_target_2d[0],
-            transformed_target_2d[1],
-            s=144, c='r', marker='o')
 
-        if self.show_actual_positions:
-            self.trans_target_plots[1] = self.fixed_plot.scatter(
-                self.target_point[0, 0],
-                self.target_point[0, 1],
-                s=36, c='black', marker='+')
+def _offsets(points):
+    """
+    The x and y columns of an array of points, as scatter offsets
+    """
+    if points is None or np.size(points) == 0:
+        return _EMPTY_OFFSETS
+    return np.asarray(points)[:, 0:2]
@@ -0,0 +1,150 @@
+"""Correlation plots that follow a log as results are written to it"""
+
+import matplotlib.pyplot as plt
+from matplotlib import use, rcParams
+import numpy as np
+
+from sksurgeryfredmatplotlib.algorithms.random_sample import RandomSample
+from sksurgeryfredmatplotlib.algorithms.running_regression import \
+                RunningRegression
+from sksurgeryfredmatplotlib.logging.log_reader import RESULT_DTYPE
+from sksurgeryfredmatplotlib.logging.log_tail import LogTail
+from sksurgeryfredmatplotlib.plotting.plotting import PANELS, label_panels
+
+#pylint:disable=consider-using-f-string
+
+class LiveResultsPlot:
+    """
+    The correlation plots of plot_results, kept up to date as a log is
+    written. On each tick of a timer only the records added to the log
+    are read. The new points are added to the scatter plots with
+    set_offsets, and the fitted lines and correlation coefficients come
+    from running sums, so the whole log is never read or fitted again.
+    As with plot_results, above max_points results a random sample of
+    them is drawn, as a density or a scatter plot, so each update has a
+    bounded cost however long the session.
+    """
+
+    def __init__(self, logfile, interval=1000, headless=False,
+                 max_points=20000, density='hexbin'):
+        """
+        :params logfile: the log to follow, it need not exist yet
+        :params interval: the time between updates, in milliseconds
+        :params headless: if true use a non interactive back end, and
+            don't start the timer
+        :params max_points: the most points to draw in each plot, if
+            None all are drawn
+        :params density: how to draw more than max_points, 'hexbin' or
+            'subsample'
+        :raises: ValueError if the density mode is unknown
+        """
+        if density not in ('hexbin', 'subsample'):
+            raise ValueError("Unknown density mode: {0:}".format(density))
+        if headless:
+            use('Agg')
+        else:
+            use('TkAgg')
+
+        self.fig, self.subplot = plt.subplots(1, 5, figsize=(18, 8))
+        self.fig.canvas.set_window_title(
+            'SciKit-SurgeryF.R.E.D. Live Correlation Plots')
+        label_panels(self.subplot)
+
+        self.density = density
+        self.tail = LogTail(logfile)
+        self.sample = RandomSample(max_points, len(RESULT_DTYPE.names))
+        self.regressions = [RunningRegression() for _ in PANELS]
+        self.scatters = [panel.scatter([], []) for panel in self.subplot]
+        self.hexbins = [None for _ in PANELS]
+        self.fit_lines = [panel.plot([], [], '-')[0]
+                          for panel in self.subplot]
+
+        self.update()
+
+        self.timer = None
+        if not headless:
+            self.timer = self.fig.canvas.new_timer(interval=interval)
+            self.timer.add_callback(self.update)
+            self.timer.start()
+
+    def update(self):
+        """
+        Reads any new results from the log, and updates the plots
+        :returns: the number of new results
+        """
+        results, _ablations, restarted = self.tail.read_new()
+        if restarted:
+            self._reset()
+        elif results.shape[0] == 0:
+            return 0
+
+        new_points = np.column_stack([results[name].astype(np.float64)
+                                      for name in RESULT_DTYPE.names])
+        self.sample.extend(new_points)
+        points = self.sample.points
+        draw_density = (self.density == 'hexbin' and
+                        not self.sample.is_complete())
+
+        for index, (panel, scatter, fit_line, regression,
+                    (_label, column)) in enumerate(zip(
+                        self.subplot, self.scatters, self.fit_lines,
+                        self.regressions, PANELS)):
+            regression.update(new_points[:, column], new_points[:, 0])
+            self._remove_hexbin(index)
+            if draw_density:
+                self.hexbins[index] = panel.hexbin(
+                    points[:, column], points[:, 0], gridsize=60, bins='log',
+                    mincnt=1)
+            else:
+                scatter.set_offsets(points[:, [column, 0]])
+            scatter.set_visible(not draw_density)
+            if not self.sample.is_complete():
+                scatter.set_sizes([4])
+
+            slope, intercept = regression.fit()
+            x_range = np.array([regression.min_x, regression.max_x])
+            fit_line.set_data(x_range, intercept + slope * x_range)
+            panel.set_title("Corr. Coef. = {0:.3f}".format(
+                regression.correlation()), fontsize=16)
+
+            if new_points.shape[0] > 0:
+                panel.update_datalim(new_points[:, [column, 0]])
+                panel.autoscale_view()
+
+        self.fig.canvas.draw_idle()
+        return results.shape[0]
+
+    def _reset(self):
+        """
+        Forgets the results read so far, when the log has been replaced
+        """
+        self.sample.clear()
+        self.regressions = [RunningRegression() for _ in PANELS]
+        for index, (panel, scatter) in enumerate(zip(self.subplot,
+                                                     self.scatters)):
+            self._remove_hexbin(index)
+            scatter.set_sizes([rcParams['lines.markersize'] ** 2])
+            panel.ignore_existing_data_limits = True
+
+    def _remove_hexbin(self, index):
+        """
+        Removes the density plot from a panel, if it has one
+        """
+        if self.hexbins[index] is not None:
+            self.hexbins[index].remove()
+            self.hexbins[index] = None
+
+
+def plot_live_results(logfile, interval=1000, max_points=20000,
+                      density='hexbin'):
+    """
+    Plots the results in a log, updating the plots as results are added
+
+    :params logfile: the log to follow
+    :params interval: the time between updates, in milliseconds
+    :params max_points: the most points to draw in each plot
+    :params density: how to draw more than max_points
+    """
+    _live_plot = LiveResultsPlot(logfile, interval, max_points=max_points,
+                                 density=density)
+    plt.show()
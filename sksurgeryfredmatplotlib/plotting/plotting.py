@@ -1,28 +1,99 @@
 """Plotting functions for scikit-surgeryFRED
 """
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import json
+from math import isfinite
+import os
+
 import matplotlib.pyplot as plt
 from matplotlib import use
-from numpy import polyfit, corrcoef, array
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from numpy import polyfit, corrcoef, array, column_stack
+from numpy.random import default_rng
 
+from sksurgeryfredmatplotlib.algorithms.bootstrap import \
+                correlation_intervals
+from sksurgeryfredmatplotlib.algorithms.random_sample import RandomSample
+from sksurgeryfredmatplotlib.algorithms.running_regression import \
+                RunningRegression
 from sksurgeryfredmatplotlib.logging.fred_logger import Logger
+from sksurgeryfredmatplotlib.logging.log_reader import CHUNK_BYTES, \
+                RESULT_DTYPE
 #pylint:disable=consider-using-f-string
-def _plot_subresults(subplot, x_values, y_values):
+
+#the x axis label of each correlation plot, and the column of
+#Logger.read_log it shows. Each is plotted against actual TRE, column 0.
+PANELS = [("Actual FRE", 1),
+          ("Expected TRE", 2),
+          ("Expected FRE", 3),
+          ("Expected FLE", 4),
+          ("Number of Fids.", 5)]
+
+
+def _plot_subresults(subplot, x_values, y_values, max_points=None,
+                     density='hexbin', rng=None, regression=None,
+                     interval=None):
     """
-    scatter plot, fitted line, and correlation coefficient
+    scatter plot, fitted line, and correlation coefficient. The fit and
+    correlation always use all the values, but above max_points values
+    the points are drawn as a density or a random subsample.
+
+    :params max_points: the most points to draw individually, if None
+        all are drawn
+    :params density: 'hexbin' to draw a hexagonal histogram of the
+        values, or 'subsample' to draw max_points of them at random
+    :params rng: the random number generator to subsample with
+    :params regression: a RunningRegression of all the values, if
+        x_values and y_values are only a sample of them
+    :params interval: a confidence interval of the correlation
+        coefficient, and its confidence level, to show in the title
     """
-    subplot.scatter(x_values, y_values)
-    slope, intercept = polyfit(array(x_values), array(y_values), 1)
-    correl_coeff = corrcoef(array(x_values), array(y_values))[0, 1]
-    subplot.set_title("Corr. Coef. = {0:.3f}".format(correl_coeff), fontsize=16)
-    subplot.plot(x_values, intercept + slope * array(x_values), '-')
+    if max_points is None or len(x_values) <= max_points:
+        subplot.scatter(x_values, y_values)
+    elif density == 'hexbin':
+        subplot.hexbin(x_values, y_values, gridsize=60, bins='log',
+                       mincnt=1)
+    elif density == 'subsample':
+        if rng is None:
+            rng = default_rng(0)
+        shown = rng.choice(len(x_values), size=max_points, replace=False)
+        subplot.scatter(x_values[shown], y_values[shown], s=4)
+    else:
+        raise ValueError("Unknown density mode: {0:}".format(density))
 
+    if regression is None:
+        slope, intercept = polyfit(x_values, y_values, 1)
+        correl_coeff = corrcoef(x_values, y_values)[0, 1]
+        x_range = array([min(x_values), max(x_values)])
+    else:
+        slope, intercept = regression.fit()
+        correl_coeff = regression.correlation()
+        x_range = array([regression.min_x, regression.max_x])
+    title = "Corr. Coef. = {0:.3f}".format(correl_coeff)
+    if interval is not None:
+        lower, upper, confidence = interval
+        title += "\n{0:.0f}% CI [{1:.3f}, {2:.3f}]".format(
+            100.0 * confidence, lower, upper)
+    subplot.set_title(title, fontsize=16)
+    subplot.plot(x_range, intercept + slope * x_range, '-')
 
-def plot_results(logfile):
-    """
-    Plots the results  of multiple runs, from the log file.
+
+def summarise_results(logfile, max_points=20000, chunk_bytes=CHUNK_BYTES,
+                      rng=None):
     """
+    Reads a log a chunk at a time, keeping a running regression of actual
+    TRE against each of the PANELS, and a random sample of the results,
+    so logs larger than memory can be plotted.
 
+    :params max_points: the size of the sample to keep
+    :params chunk_bytes: about how many bytes of the log to read at a time
+    :params rng: the random number generator to sample with
+    :returns: a RunningRegression for each of the PANELS, and the sample
+        of results, as a list of columns like Logger.read_log
+    """
     log_config = {"logger" : {
         "log file name" : logfile,
         "overwrite existing" : False
@@ -30,28 +101,204 @@ def plot_results(logfile):
 
     logger = Logger(log_config)
 
-    [actual_tres, actual_fres, expected_tres, expected_fres,
-     mean_fles, no_fids] = logger.read_log()
+    regressions = [RunningRegression() for _ in PANELS]
+    sample = RandomSample(max_points, len(RESULT_DTYPE.names), rng)
+    for results in logger.read_log_chunks(chunk_bytes):
+        for regression, (_label, column) in zip(regressions, PANELS):
+            regression.update(results[column], results[0])
+        sample.extend(column_stack(results))
 
-    use('TkAgg')
-    fig, subplot = plt.subplots(1, 5, figsize=(18, 8))
+    logger.close()
+    return regressions, [sample.points[:, index].astype(RESULT_DTYPE[name])
+                         for index, name in enumerate(RESULT_DTYPE.names)]
 
-    fig.canvas.set_window_title('SciKit-SurgeryF.R.E.D. Correlation Plots')
 
-    subplot[0].set_ylabel("TRE", fontsize=26)
-    subplot[0].set_xlabel("Actual FRE", fontsize=26)
-    _plot_subresults(subplot[0], actual_fres, actual_tres)
+def fit_statistics(regressions, intervals=None, confidence=0.95,
+                   resamples=0):
+    """
+    The fit and correlation of actual TRE against each of the PANELS
 
-    subplot[1].set_xlabel("Expected TRE", fontsize=26)
-    _plot_subresults(subplot[1], expected_tres, actual_tres)
+    :params regressions: a RunningRegression for each of the PANELS
+    :params intervals: the lower and upper bounds of a bootstrap
+        confidence interval of each correlation coefficient, if any
+    :params confidence: the confidence level of the intervals
+    :params resamples: the number of bootstrap resamples
+    :returns: a dictionary for each panel
+    """
+    statistics = []
+    for index, (regression, (label, _column)) in enumerate(
+            zip(regressions, PANELS)):
+        slope, intercept = regression.fit()
+        panel = {"x" : label, "y" : "Actual TRE",
+                 "count" : regression.count,
+                 "slope" : slope, "intercept" : intercept,
+                 "correlation" : regression.correlation()}
+        if intervals is not None:
+            panel["confidence interval"] = {
+                "lower" : float(intervals[0][index]),
+                "upper" : float(intervals[1][index]),
+                "confidence" : confidence, "resamples" : resamples}
+        statistics.append(panel)
+    return statistics
+
+
+def export_statistics(statistics, file_name):
+    """
+    Writes the statistics of fit_statistics to a JSON file. Values
+    that are not a number are written as null.
+    """
+    def _finite(value):
+        if isinstance(value, dict):
+            return {key : _finite(item) for key, item in value.items()}
+        if isinstance(value, float) and not isfinite(value):
+            return None
+        return value
+
+    with open(file_name, 'w', encoding='utf-8') as json_file:
+        json.dump([_finite(panel) for panel in statistics], json_file,
+                  indent=2)
 
-    subplot[2].set_xlabel("Expected FRE", fontsize=26)
-    _plot_subresults(subplot[2], expected_fres, actual_tres)
 
-    subplot[3].set_xlabel("Expected FLE", fontsize=26)
-    _plot_subresults(subplot[3], mean_fles, actual_tres)
+def plot_results(logfile, use_cache=True, max_points=20000,
+                 density='hexbin', streaming=False, resamples=0,
+                 confidence=0.95, processes=None, statistics_file=None,
+                 output=None):
+    """
+    Plots the results  of multiple runs, from the log file.
+
+    :params use_cache: if true, the parsed log is cached in a sidecar
+        file, so later plots only parse new results
+    :params max_points: the most points to draw individually in each
+        plot, above this they are drawn as a density. If None all points
+        are drawn.
+    :params density: how to draw large results, 'hexbin' or 'subsample'
+    :params streaming: if true, the log is read a chunk at a time, see
+        summarise_results, and a random sample of max_points results
+        is drawn
+    :params resamples: if more than zero, bootstrap confidence
+        intervals of the correlation coefficients are shown, using this
+        many resamples. Not available when streaming.
+    :params confidence: the confidence level of the intervals
+    :params processes: the number of processes to bootstrap with
+    :params statistics_file: if set, the fit statistics are written to
+        this JSON file, see export_statistics
+    :params output: if set, the plots are drawn with the Agg back end,
+        without a display, and saved to this file. The format is taken
+        from the file's extension, e.g. png, svg, or pdf.
+    :returns: the fit statistics, see fit_statistics
+    :raises: ValueError if resamples are asked for when streaming
+    """
+    if streaming and resamples > 0:
+        raise ValueError("Bootstrap intervals are not available when " +
+                         "streaming")
+
+    intervals = None
+    if streaming:
+        regressions, results = summarise_results(logfile, max_points)
+    else:
+        log_config = {"logger" : {
+            "log file name" : logfile,
+            "overwrite existing" : False
+            }}
 
-    subplot[4].set_xlabel("Number of Fids.", fontsize=26)
-    _plot_subresults(subplot[4], no_fids, actual_tres)
+        logger = Logger(log_config)
 
-    plt.show()
+        results = logger.read_log(use_cache)
+        regressions = [RunningRegression() for _ in PANELS]
+        for regression, (_label, column) in zip(regressions, PANELS):
+            regression.update(results[column], results[0])
+        if resamples > 0:
+            intervals = correlation_intervals(
+                [results[column] for _label, column in PANELS], results[0],
+                resamples, confidence, processes=processes)
+
+    statistics = fit_statistics(regressions, intervals, confidence,
+                                resamples)
+    if statistics_file is not None:
+        export_statistics(statistics, statistics_file)
+
+    if output is None:
+        use('TkAgg')
+        fig, subplot = plt.subplots(1, 5, figsize=(18, 8))
+
+        fig.canvas.set_window_title(
+            'SciKit-SurgeryF.R.E.D. Correlation Plots')
+    else:
+        fig = Figure(figsize=(18, 8))
+        FigureCanvasAgg(fig)
+        subplot = fig.subplots(1, 5)
+
+    label_panels(subplot)
+    for index, (panel, regression, (_label, column)) in enumerate(
+            zip(subplot, regressions, PANELS)):
+        interval = None
+        if intervals is not None:
+            interval = (intervals[0][index], intervals[1][index], confidence)
+        _plot_subresults(panel, results[column], results[0], max_points,
+                         density, regression=regression, interval=interval)
+
+    if output is None:
+        plt.show()
+    else:
+        fig.savefig(output)
+    return statistics
+
+
+def export_results(logfiles, directory, file_format='png', workers=None,
+                   **plot_options):
+    """
+    Plots the results of several logs without a display, saving the
+    plots and a JSON file of the fit statistics for each log to a
+    directory. Each is named after its log, with a number added if logs
+    in different directories share a name.
+
+    :params logfiles: the log files to plot
+    :params directory: the directory to save to, made if need be
+    :params file_format: the format of the plots, e.g. png, svg, or pdf
+    :params workers: if more than one, the logs are plotted by a pool of
+        this many processes
+    :params plot_options: passed to plot_results
+    :returns: a list of the plot and statistics files of each log
+    """
+    os.makedirs(directory, exist_ok=True)
+    stems = []
+    for logfile in logfiles:
+        stem = os.path.splitext(os.path.basename(logfile))[0]
+        name = stem
+        number = 1
+        while name in stems:
+            name = "{0:}_{1:}".format(stem, number)
+            number += 1
+        stems.append(name)
+
+    figure_files = [os.path.join(directory, stem + '.' + file_format)
+                    for stem in stems]
+    statistics_files = [os.path.join(directory, stem + '.json')
+                        for stem in stems]
+
+    export = partial(_export_result, **plot_options)
+    if workers is not None and workers > 1 and len(logfiles) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(export, logfiles, figure_files, statistics_files))
+    else:
+        for logfile, figure_file, statistics_file in zip(
+                logfiles, figure_files, statistics_files):
+            export(logfile, figure_file, statistics_file)
+    return list(zip(figure_files, statistics_files))
+
+
+def _export_result(logfile, figure_file, statistics_file, **plot_options):
+    """
+    Plots the results of one log to files, for export_results
+    """
+    plot_results(logfile, output=figure_file,
+                 statistics_file=statistics_file, **plot_options)
+
+
+def label_panels(subplot):
+    """
+    Labels the axes of the correlation plots
+    """
+    subplot[0].set_ylabel("TRE", fontsize=26)
+    for panel, (label, _column) in zip(subplot, PANELS):
+        panel.set_xlabel(label, fontsize=26)
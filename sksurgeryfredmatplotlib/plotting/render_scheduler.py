@@ -0,0 +1,93 @@
+"""Limits how often a figure is redrawn, so input doesn't queue behind it"""
+
+import time
+
+
+class RenderScheduler:
+    """
+    Wraps a renderer, such as BlitRenderer, with the same update and
+    draw methods. Rather than drawing straight away, requests mark the
+    figure dirty, and are coalesced so there is at most one draw per
+    frame interval. The first request after an idle interval is drawn
+    immediately, later ones wait on a canvas timer. A full draw
+    request replaces any pending update.
+    """
+
+    def __init__(self, renderer, frame_interval=1.0 / 30.0):
+        """
+        :params renderer: the renderer to draw with, it must have a
+            canvas, and update and draw methods
+        :params frame_interval: the shortest time between draws, in
+            seconds. If zero or less every request is drawn immediately,
+            as is needed on back ends without working timers.
+        """
+        self.renderer = renderer
+        self.frame_interval = frame_interval
+        self._dirty = False
+        self._full_draw = False
+        self._last_frame = None
+        self._timer = None
+        self._timer_running = False
+
+    def update(self):
+        """
+        Requests a redraw of the dynamic artists
+        """
+        self._request(full_draw=False)
+
+    def draw(self):
+        """
+        Requests a full redraw of the figure
+        """
+        self._request(full_draw=True)
+
+    def flush(self):
+        """
+        Draws any pending request now
+        """
+        self._timer_running = False
+        if not self._dirty:
+            return
+
+        full_draw = self._full_draw
+        self._dirty = False
+        self._full_draw = False
+        self._last_frame = time.monotonic()
+        if full_draw:
+            self.renderer.draw()
+        else:
+            self.renderer.update()
+
+    def _request(self, full_draw):
+        """
+        Marks the figure dirty, and draws or schedules a draw
+        """
+        self._dirty = True
+        self._full_draw = self._full_draw or full_draw
+
+        if self._timer_running:
+            return
+
+        if self.frame_interval <= 0 or self._last_frame is None:
+            self.flush()
+            return
+
+        wait = self._last_frame + self.frame_interval - time.monotonic()
+        if wait <= 0:
+            self.flush()
+            return
+
+        self._start_timer(wait)
+
+    def _start_timer(self, wait):
+        """
+        Starts a single shot canvas timer to flush after wait seconds
+        """
+        if self._timer is None:
+            self._timer = self.renderer.canvas.new_timer()
+            self._timer.single_shot = True
+            self._timer.add_callback(self.flush)
+
+        self._timer.interval = max(1, int(wait * 1000))
+        self._timer_running = True
+        self._timer.start()
@@ -0,0 +1,45 @@
+# coding=utf-8
+
+"""Command line processing shared by the demo and the game"""
+
+
+import argparse
+from sksurgeryfredmatplotlib import __version__
+from sksurgeryfredmatplotlib.algorithms.contour_cache import DEFAULT_CACHE_DIR
+
+
+def make_parser(description):
+    """
+    Makes a parser with the arguments common to the demo and the game,
+    the image file, contour cache, redraw interval, and version
+    :params description: the description of the application
+    :returns: the parser
+    """
+    parser = argparse.ArgumentParser(description=description)
+
+    ## ADD POSITIONAL ARGUMENTS
+    parser.add_argument("image",
+                        type=str,
+                        help="Image file name")
+
+    parser.add_argument("--cache_dir",
+                        type=str,
+                        default=DEFAULT_CACHE_DIR,
+                        help=("Directory to cache fitted contours in, " +
+                              "use an empty string to disable caching"))
+
+    parser.add_argument("--frame_interval",
+                        type=float,
+                        default=1.0 / 30.0,
+                        help=("Shortest time between redraws in seconds, " +
+                              "use 0 to redraw on every event"))
+
+    version_string = __version__
+    friendly_version_string = version_string if version_string else 'unknown'
+    parser.add_argument(
+        "--version",
+        action='version',
+        version='Fiducial Registration Educational Demonstration version ' + \
+                        friendly_version_string)
+
+    return parser
@@ -5,7 +5,8 @@
 from sksurgeryfredmatplotlib.widgets.interactive_registration \
                 import InteractiveRegistration
 
-def run_demo(image):
+def run_demo(image, cache_dir=None, frame_interval=1.0 / 30.0):
     """Run FRED"""
 
-    InteractiveRegistration(image)
+    InteractiveRegistration(image, cache_dir=cache_dir,
+                            frame_interval=frame_interval)
@@ -0,0 +1,59 @@
+# coding=utf-8
+
+"""User interfaces for sksurgeryFRED"""
+
+import sys
+
+from sksurgeryfredmatplotlib.logging.log_aggregation import find_logs, \
+                aggregate_logs, save_dataset, save_summaries
+
+#pylint:disable=consider-using-f-string
+
+def run_aggregation(paths, output, summary_file, pattern='*.log',
+                    workers=None, quiet=False):
+    """
+    Run FRED Aggregation
+
+    :params paths: directories, glob patterns, or log files to aggregate
+    :params output: the npz file to save the merged records to
+    :params summary_file: the JSON file to save the session summaries to
+    :params pattern: the file name pattern of logs within directories
+    :params workers: the number of worker processes
+    :params quiet: if true, don't report progress
+    :returns: the number of logs aggregated
+    :raises: ValueError if no logs are found
+    """
+    log_files = find_logs(paths, pattern)
+    if not log_files:
+        raise ValueError("No log files found in {0:}".format(
+            ", ".join(paths)))
+
+    progress = None
+    if not quiet:
+        progress = _report_progress
+
+    results, ablations, summaries = aggregate_logs(log_files, workers,
+                                                   progress)
+    save_dataset(output, results, ablations, summaries)
+    save_summaries(summary_file, summaries)
+
+    if not quiet:
+        failed = [summary for summary in summaries if summary["error"]]
+        for summary in failed:
+            print("Skipped {0:}: {1:}".format(summary["source"],
+                                              summary["error"]))
+        print("Merged {0:} results and {1:} ablations from {2:} logs"
+              .format(results.shape[0], ablations.shape[0],
+                      len(log_files) - len(failed)))
+    return len(log_files)
+
+
+def _report_progress(done, total, _log_file):
+    """
+    Reports progress on a single line, about every percent
+    """
+    if done == total or done % max(1, total // 100) == 0:
+        sys.stdout.write("\rRead {0:} of {1:} logs".format(done, total))
+        if done == total:
+            sys.stdout.write("\n")
+        sys.stdout.flush()
@@ -0,0 +1,68 @@
+# coding=utf-8
+
+"""Command line processing"""
+
+
+import argparse
+from sksurgeryfredmatplotlib import __version__
+from sksurgeryfredmatplotlib.ui.sksurgeryfred_aggregate import \
+                run_aggregation
+
+
+def main(args=None):
+    """
+    Entry point for Fiducial Registration Educational Demonstration
+    application"""
+
+    parser = argparse.ArgumentParser(
+        description=('Aggregate Logs for Fiducial Registration ' +
+                     'Educational Demonstration'))
+
+    ## ADD POSITIONAL ARGUMENTS
+    parser.add_argument("paths",
+                        type=str,
+                        nargs='+',
+                        help=("Directories, glob patterns, or log files " +
+                              "to aggregate"))
+
+    parser.add_argument("--output",
+                        type=str,
+                        default="fred_aggregate.npz",
+                        help="File to save the merged records to")
+
+    parser.add_argument("--summary",
+                        type=str,
+                        default="fred_sessions.json",
+                        help="File to save the session summaries to")
+
+    parser.add_argument("--pattern",
+                        type=str,
+                        default="*.log",
+                        help="File name pattern of logs in directories")
+
+    parser.add_argument("--workers",
+                        type=int,
+                        default=None,
+                        help=("Number of worker processes, defaults to " +
+                              "the number of processors"))
+
+    parser.add_argument("--quiet",
+                        action='store_true',
+                        help="Don't report progress")
+
+    version_string = __version__
+    friendly_version_string = version_string if version_string else 'unknown'
+    parser.add_argument(
+        "--version",
+        action='version',
+        version='Fiducial Registration Educational Demonstration version ' + \
+                        friendly_version_string)
+
+    args = parser.parse_args(args)
+
+    try:
+        run_aggregation(args.paths, args.output, args.summary,
+                        pattern=args.pattern, workers=args.workers,
+                        quiet=args.quiet)
+    except ValueError as error:
+        parser.error(str(error))
@@ -3,8 +3,7 @@
 """Command line processing"""
 
 
-import argparse
-from sksurgeryfredmatplotlib import __version__
+from sksurgeryfredmatplotlib.ui.fred_command_line import make_parser
 from sksurgeryfredmatplotlib.ui.sksurgeryfred import run_demo
 
 
@@ -13,22 +12,10 @@ def main(args=None):
     Entry point for Fiducial Registration Educational Demonstration
     application"""
 
-    parser = argparse.ArgumentParser(
-        description='Fiducial Registration Educational Demonstration')
-
-    ## ADD POSITIONAL ARGUMENTS
-    parser.add_argument("image",
-                        type=str,
-                        help="Image file name")
-
-    version_string = __version__
-    friendly_version_string = version_string if version_string else 'unknown'
-    parser.add_argument(
-        "--version",
-        action='version',
-        version='Fiducial Registration Educational Demonstration version ' + \
-                        friendly_version_string)
+    parser = make_parser('Fiducial Registration Educational Demonstration')
 
     args = parser.parse_args(args)
 
-    run_demo(args.image)
+    cache_dir = args.cache_dir if args.cache_dir else None
+    run_demo(args.image, cache_dir=cache_dir,
+             frame_interval=args.frame_interval)
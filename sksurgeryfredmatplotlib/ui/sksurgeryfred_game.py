@@ -5,7 +5,8 @@
 from sksurgeryfredmatplotlib.widgets.registration_game \
                 import RegistrationGame
 
-def run_demo(image):
+def run_demo(image, cache_dir=None, frame_interval=1.0 / 30.0):
     """Run FRED game"""
 
-    RegistrationGame(image)
+    RegistrationGame(image, cache_dir=cache_dir,
+                     frame_interval=frame_interval)
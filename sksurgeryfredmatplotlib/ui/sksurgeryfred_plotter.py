@@ -3,9 +3,42 @@
 """User interfaces for sksurgeryFRED"""
 
 from sksurgeryfredmatplotlib.plotting.plotting import \
-                plot_results
+                plot_results, export_results
+from sksurgeryfredmatplotlib.plotting.live_plotting import \
+                plot_live_results
 
-def run_plotter(logfile):
-    """Run FRED Plotter"""
+def run_plotter(logfiles, live=False, interval=1000, export=None,
+                file_format='png', workers=None, **plot_options):
+    """
+    Run FRED Plotter
 
-    plot_results(logfile)
+    :params logfiles: a log file, or a list of them, to plot in turn
+    :params live: if true, follow the log as it is written, see
+        plot_live_results
+    :params interval: the time between live updates, in milliseconds
+    :params export: if set, the plots and fit statistics are saved to
+        this directory without a display, see export_results
+    :params file_format: the format of exported plots
+    :params workers: the number of processes to export with
+    :params plot_options: passed to plot_results
+    :raises: ValueError if bootstrap resamples are asked for when live
+    """
+    if isinstance(logfiles, str):
+        logfiles = [logfiles]
+
+    if export is not None:
+        #exported statistics are named after each log
+        plot_options.pop('statistics_file', None)
+        export_results(logfiles, export, file_format, workers,
+                       **plot_options)
+    elif live:
+        if plot_options.get('resamples', 0) > 0:
+            raise ValueError("Bootstrap intervals are not available when " +
+                             "live")
+        plot_live_results(logfiles[0], interval,
+                          **{name : plot_options[name]
+                             for name in ('max_points', 'density')
+                             if name in plot_options})
+    else:
+        for logfile in logfiles:
+            plot_results(logfile, **plot_options)
@@ -20,7 +20,79 @@ def main(args=None):
     ## ADD POSITIONAL ARGUMENTS
     parser.add_argument("logfile",
                         type=str,
-                        help="Log file name")
+                        nargs='+',
+                        help="Log file name, or names")
+
+    parser.add_argument("--no_cache",
+                        action='store_true',
+                        help=("Don't cache the parsed log in a " +
+                              "sidecar file"))
+
+    parser.add_argument("--live",
+                        action='store_true',
+                        help=("Keep the plots up to date as results " +
+                              "are written to the log"))
+
+    parser.add_argument("--interval",
+                        type=int,
+                        default=1000,
+                        help="Time between live updates in milliseconds")
+
+    parser.add_argument("--max_points",
+                        type=int,
+                        default=20000,
+                        help=("Most points to draw individually in each " +
+                              "plot, above this a density is drawn"))
+
+    parser.add_argument("--density",
+                        choices=['hexbin', 'subsample'],
+                        default='hexbin',
+                        help=("How to draw more than max_points, the " +
+                              "fits always use all the results"))
+
+    parser.add_argument("--streaming",
+                        action='store_true',
+                        help=("Read the log a chunk at a time, for logs " +
+                              "larger than memory, and draw a random " +
+                              "sample of max_points results"))
+
+    parser.add_argument("--bootstrap",
+                        type=int,
+                        default=0,
+                        help=("Show bootstrap confidence intervals of " +
+                              "the correlations, with this many resamples"))
+
+    parser.add_argument("--confidence",
+                        type=float,
+                        default=0.95,
+                        help="Confidence level of the intervals")
+
+    parser.add_argument("--processes",
+                        type=int,
+                        default=None,
+                        help="Number of processes to bootstrap with")
+
+    parser.add_argument("--statistics",
+                        type=str,
+                        default=None,
+                        help=("Write the fit statistics and intervals " +
+                              "to this JSON file"))
+
+    parser.add_argument("--export",
+                        type=str,
+                        default=None,
+                        help=("Save the plots and fit statistics of each " +
+                              "log to this directory, without a display"))
+
+    parser.add_argument("--format",
+                        choices=['png', 'svg', 'pdf'],
+                        default='png',
+                        help="File format of exported plots")
+
+    parser.add_argument("--workers",
+                        type=int,
+                        default=None,
+                        help="Number of processes to export logs with")
 
     version_string = __version__
     friendly_version_string = version_string if version_string else 'unknown'
@@ -32,4 +104,18 @@ def main(args=None):
 
     args = parser.parse_args(args)
 
-    run_plotter(args.logfile)
+    if args.live and len(args.logfile) > 1:
+        parser.error("--live follows a single log file")
+    if args.statistics is not None and len(args.logfile) > 1:
+        parser.error("--statistics is for a single log file, use --export")
+    if args.bootstrap > 0 and (args.streaming or args.live):
+        parser.error("--bootstrap is not available with --streaming " +
+                     "or --live")
+
+    run_plotter(args.logfile, live=args.live, interval=args.interval,
+                export=args.export, file_format=args.format,
+                workers=args.workers,
+                use_cache=not args.no_cache, max_points=args.max_points,
+                density=args.density, streaming=args.streaming,
+                resamples=args.bootstrap, confidence=args.confidence,
+                processes=args.processes, statistics_file=args.statistics)
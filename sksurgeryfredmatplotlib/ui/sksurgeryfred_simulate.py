@@ -0,0 +1,29 @@
+# coding=utf-8
+
+"""User interfaces for sksurgeryFRED"""
+
+from sksurgeryfredmatplotlib.algorithms.contour_cache import ContourCache
+from sksurgeryfredmatplotlib.algorithms.simulation import log_results
+from sksurgeryfredmatplotlib.algorithms.simulation_runner import \
+                run_simulations_from_image
+from sksurgeryfredmatplotlib.logging.fred_logger import Logger
+
+def run_simulation(image, logfile, trials, workers=None, seed=None,
+                   cache_dir=None, shard_size=1000):
+    """Run FRED Simulation"""
+
+    cache = None
+    if cache_dir is not None:
+        cache = ContourCache(cache_dir)
+
+    results = run_simulations_from_image(image, trials, cache=cache,
+                                         workers=workers, seed=seed,
+                                         shard_size=shard_size)
+
+    log_config = {"logger" : {
+        "log file name" : logfile,
+        "overwrite existing" : False
+        }}
+
+    logger = Logger(log_config)
+    log_results(logger, results)
@@ -0,0 +1,76 @@
+# coding=utf-8
+
+"""Command line processing"""
+
+
+import argparse
+from sksurgeryfredmatplotlib import __version__
+from sksurgeryfredmatplotlib.algorithms.contour_cache import DEFAULT_CACHE_DIR
+from sksurgeryfredmatplotlib.ui.sksurgeryfred_simulate import run_simulation
+
+
+def main(args=None):
+    """
+    Entry point for Fiducial Registration Educational Demonstration
+    application"""
+
+    parser = argparse.ArgumentParser(
+        description=('Simulate Results for Fiducial Registration ' +
+                     'Educational Demonstration'))
+
+    ## ADD POSITIONAL ARGUMENTS
+    parser.add_argument("image",
+                        type=str,
+                        help="Image file name")
+
+    parser.add_argument("--logfile",
+                        type=str,
+                        default="fred_simulated.log",
+                        help="Log file to append the results to")
+
+    parser.add_argument("--trials",
+                        type=int,
+                        default=10000,
+                        help="Number of trials to simulate")
+
+    parser.add_argument("--workers",
+                        type=int,
+                        default=None,
+                        help=("Number of worker processes, defaults to " +
+                              "the number of processors"))
+
+    parser.add_argument("--shard_size",
+                        type=int,
+                        default=1000,
+                        help=("Number of trials each worker simulates at " +
+                              "a time, results with a seed depend on this " +
+                              "but not on the number of workers"))
+
+    parser.add_argument("--seed",
+                        type=int,
+                        default=None,
+                        help="Seed for reproducible simulations")
+
+    parser.add_argument("--cache_dir",
+                        type=str,
+                        default=DEFAULT_CACHE_DIR,
+                        help=("Directory to cache fitted contours in, " +
+                              "use an empty string to disable caching"))
+
+    version_string = __version__
+    friendly_version_string = version_string if version_string else 'unknown'
+    parser.add_argument(
+        "--version",
+        action='version',
+        version='Fiducial Registration Educational Demonstration version ' + \
+                        friendly_version_string)
+
+    args = parser.parse_args(args)
+
+    if args.shard_size < 1:
+        parser.error("--shard_size must be at least 1")
+
+    cache_dir = args.cache_dir if args.cache_dir else None
+    run_simulation(args.image, args.logfile, args.trials, workers=args.workers,
+                   seed=args.seed, cache_dir=cache_dir,
+                   shard_size=args.shard_size)
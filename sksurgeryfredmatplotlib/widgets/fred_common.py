@@ -4,28 +4,43 @@ The main widget for the interactive registration part of scikit-surgeryFRED
 
 import matplotlib.pyplot as plt
 from matplotlib import use
-import skimage.io
 import numpy as np
 
-from sksurgeryfred.algorithms.point_based_reg import PointBasedRegistration
 from sksurgeryfred.algorithms.errors import expected_absolute_value
-from sksurgeryfred.algorithms.fred import make_target_point
 
-from sksurgeryfredmatplotlib.algorithms.fit_contour import find_outer_contour
+from sksurgeryfredmatplotlib.algorithms.contour_cache import ContourCache
+from sksurgeryfredmatplotlib.algorithms.contour_mask import ContourMask
+from sksurgeryfredmatplotlib.algorithms.image_handle import ImageHandle
 from sksurgeryfredmatplotlib.algorithms.add_fiducial import AddFiducialMarker
+from sksurgeryfredmatplotlib.algorithms.incremental_registration import \
+                IncrementalRegistration
 from sksurgeryfredmatplotlib.plotting.interactive_plots import \
                 PlotRegistrations, PlotRegStatistics
+from sksurgeryfredmatplotlib.plotting.blit_renderer import BlitRenderer
+from sksurgeryfredmatplotlib.plotting.render_scheduler import \
+                RenderScheduler
 
+#pylint:disable=too-many-instance-attributes
 class FredCommon:
     """
     an interactive window for doing live registration
     """
 
-    def __init__(self, image_file_name, headless=False):
+    def __init__(self, image_file_name, headless=False, cache_dir=None,
+                 seed=None, frame_interval=1.0 / 30.0):
         """
         Creates a visualisation of the projected and
         detected screen points, which you can click on
         to measure distances
+
+        :params image_file_name: the image to use
+        :params headless: if true use a non interactive back end
+        :params cache_dir: directory to cache fitted contours in, if None
+            contours are fitted every time
+        :params seed: seed for the random number generator used to place
+            targets and simulate FLE, if None fresh entropy is used
+        :params frame_interval: the shortest time between redraws, in
+            seconds. Ignored when headless, where every redraw is immediate.
         """
         if headless:
             use('Agg')
@@ -38,11 +53,21 @@ class FredCommon:
 
         self.plotter = PlotRegistrations(self.subplot[1], self.subplot[0],
                                          self.stats_plot)
-
+        if headless:
+            frame_interval = 0.0
+        self.renderer = RenderScheduler(
+            BlitRenderer(self.fig, self.plotter.dynamic_artists()),
+            frame_interval)
 
         self.mouse_int = None
         self.pbr = None
         self.image_file_name = image_file_name
+        self.rng = np.random.default_rng(seed)
+        self.image = ImageHandle(image_file_name)
+        self.contour_mask = None
+        self.contour_cache = None
+        if cache_dir is not None:
+            self.contour_cache = ContourCache(cache_dir)
 
         self.logger = None
 
@@ -50,13 +75,17 @@ class FredCommon:
         """
         sets up the registration
         """
-        img = skimage.io.imread(self.image_file_name)
-        outline, _initial_guess = find_outer_contour(img)
-        target_point = make_target_point(outline)
+        self.image.reload_if_changed()
+        img = self.image.image
+        outline, _initial_guess = self.image.outer_contour(self.contour_cache)
+        if (self.contour_mask is None or
+                self.contour_mask.outline is not outline):
+            self.contour_mask = ContourMask(outline, img.shape)
+        target_point = self.contour_mask.make_target_point(rng=self.rng)
 
         self.plotter.initialise_new_reg(img, target_point, outline)
 
-        fle_sd = np.random.uniform(low=0.5, high=5.0)
+        fle_sd = self.rng.uniform(low=0.5, high=5.0)
         moving_fle = np.zeros((1, 3), dtype=np.float64)
 
         fixed_fle = np.array([fle_sd, fle_sd, fle_sd], dtype=np.float64)
@@ -64,15 +93,17 @@ class FredCommon:
         moving_fle_eavs = expected_absolute_value(moving_fle)
 
         if self.pbr is None:
-            self.pbr = PointBasedRegistration(target_point, fixed_fle_eavs,
-                                              moving_fle_eavs)
+            self.pbr = IncrementalRegistration(target_point, fixed_fle_eavs,
+                                               moving_fle_eavs)
         else:
             self.pbr.reinit(target_point, fixed_fle_eavs, moving_fle_eavs)
 
         if self.mouse_int is None:
             self.mouse_int = AddFiducialMarker(self.fig, self.plotter,
                                                self.pbr, self.logger,
-                                               fixed_fle, moving_fle)
+                                               fixed_fle, moving_fle,
+                                               rng=self.rng,
+                                               renderer=self.renderer)
 
-        self.mouse_int.reset_fiducials(fixed_fle_eavs)
+        self.mouse_int.reset_fiducials(fixed_fle_eavs, self.contour_mask)
         return target_point
@@ -12,13 +12,15 @@ class InteractiveRegistration(FredCommon):
     an interactive window for doing live registration
     """
 
-    def __init__(self, image_file_name, headless=False):
+    def __init__(self, image_file_name, headless=False, cache_dir=None,
+                 frame_interval=1.0 / 30.0):
         """
         Creates a visualisation of the projected and
         detected screen points, which you can click on
         to measure distances
         """
-        super().__init__(image_file_name, headless)
+        super().__init__(image_file_name, headless, cache_dir,
+                         frame_interval=frame_interval)
         self.stats_plot.set_visibilities(True, True, True, True, True,
                                          False, False, False, False)
 
@@ -26,7 +28,8 @@ class InteractiveRegistration(FredCommon):
 
         log_config = {"logger" : {
             "log file name" : "fred_results.log",
-            "overwrite existing" : False
+            "overwrite existing" : False,
+            "asynchronous" : True
             }}
 
         self.logger = Logger(log_config)
@@ -50,4 +53,4 @@ class InteractiveRegistration(FredCommon):
         sets up the registration
         """
         super().init_reg()
-        self.fig.canvas.draw()
+        self.renderer.draw()
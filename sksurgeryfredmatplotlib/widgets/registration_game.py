@@ -13,13 +13,15 @@ class RegistrationGame(FredCommon):
     """
     an interactive window for doing live registration
     """
-    def __init__(self, image_file_name, headless=False):
+    def __init__(self, image_file_name, headless=False, cache_dir=None,
+                 frame_interval=1.0 / 30.0):
         """
         Creates a visualisation of the projected and
         detected screen points, which you can click on
         to measure distances
         """
-        super().__init__(image_file_name, headless)
+        super().__init__(image_file_name, headless, cache_dir,
+                         frame_interval=frame_interval)
 
         self.stats_plot.set_visibilities(True, True, False, False, False,
                                          True, True, True, True)
@@ -34,7 +36,8 @@ class RegistrationGame(FredCommon):
 
         log_config = {"logger" : {
             "log file name" : "fred_game.log",
-            "overwrite existing" : False
+            "overwrite existing" : False,
+            "asynchronous" : True
             }}
 
         self.logger = Logger(log_config)
@@ -55,12 +58,12 @@ class RegistrationGame(FredCommon):
         if event.key == "up":
             margin = self.ablation.increase_margin()
             self.stats_plot.update_margin_stats(margin)
-            self.fig.canvas.draw()
+            self.renderer.update()
 
         if event.key == "down":
             margin = self.ablation.decrease_margin()
             self.stats_plot.update_margin_stats(margin)
-            self.fig.canvas.draw()
+            self.renderer.update()
 
         if event.key == "a":
             reg_ok, est_target = self.pbr.get_transformed_target()
@@ -86,7 +89,7 @@ class RegistrationGame(FredCommon):
                         self.initialise_registration()
                     else:
                         self._game_over()
-                    self.fig.canvas.draw()
+                    self.renderer.draw()
 
     def _game_over(self):
         props = dict(boxstyle='round', facecolor='wheat', alpha=1.0)
@@ -99,7 +102,7 @@ class RegistrationGame(FredCommon):
         self.fig.text(0.2, 0.4, text_str,
                       fontsize=26, bbox=props)
 
-        self.fig.canvas.draw()
+        self.renderer.draw()
 
     def initialise_registration(self):
         """
@@ -112,7 +115,7 @@ class RegistrationGame(FredCommon):
         self.stats_plot.update_margin_stats(self.ablation.margin)
         self.stats_plot.update_repeats(self.repeats)
 
-        self.fig.canvas.draw()
+        self.renderer.draw()
 
 
 class VisibilitySettings:
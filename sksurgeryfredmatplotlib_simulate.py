@@ -0,0 +1,8 @@
+#!/usr/bin/python
+#  -*- coding: utf-8 -*-
+import sys
+
+from sksurgeryfredmatplotlib.ui.sksurgeryfred_simulate_command_line import main
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
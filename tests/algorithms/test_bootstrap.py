@@ -0,0 +1,49 @@
+# coding=utf-8
+
+"""Fiducial Registration Educational Demonstration tests"""
+
+import numpy as np
+import pytest
+
+from sksurgeryfredmatplotlib.algorithms.bootstrap import \
+                bootstrap_correlations, correlation_intervals
+
+
+def test_matches_resampled_corrcoef():
+    """ Each bootstrap correlation is that of a resample of the data """
+    rng = np.random.default_rng(0)
+    x_values = rng.normal(size=(50, 2))
+    y_values = x_values[:, 0] + rng.normal(size=50)
+
+    correlations = bootstrap_correlations(x_values, y_values, resamples=20,
+                                          seed=3)
+
+    resample_rng = np.random.default_rng(np.random.SeedSequence(3).spawn(1)[0])
+    indices = resample_rng.integers(0, 50, size=(20, 50), dtype=np.intp)
+    for row, row_indices in enumerate(indices):
+        for column in range(2):
+            assert np.isclose(correlations[row, column], np.corrcoef(
+                x_values[row_indices, column], y_values[row_indices])[0, 1])
+
+
+def test_intervals_and_processes():
+    """ The intervals cover the correlation, whatever the process count """
+    rng = np.random.default_rng(1)
+    x_values = rng.normal(size=2000)
+    y_values = x_values + rng.normal(size=2000)
+    constant = np.ones(2000)
+
+    lower, upper = correlation_intervals([x_values, constant], y_values,
+                                         resamples=2000, confidence=0.9)
+    assert lower[0] < np.corrcoef(x_values, y_values)[0, 1] < upper[0]
+    assert upper[0] - lower[0] < 0.1
+    assert np.isnan(lower[1]) and np.isnan(upper[1])
+
+    in_process = bootstrap_correlations(x_values, y_values, 3000)
+    in_pool = bootstrap_correlations(x_values, y_values, 3000, processes=2)
+    assert np.array_equal(in_process, in_pool)
+
+    with pytest.raises(ValueError):
+        correlation_intervals(x_values, y_values, confidence=1.5)
+    with pytest.raises(ValueError):
+        bootstrap_correlations(x_values, y_values[0:10])
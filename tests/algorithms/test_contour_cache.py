@@ -0,0 +1,121 @@
+# coding=utf-8
+
+"""Tests for the contour cache"""
+
+import os
+import numpy as np
+
+from sksurgeryfredmatplotlib.algorithms.contour_cache import \
+                ContourCache, image_digest
+from sksurgeryfredmatplotlib.algorithms.fit_contour import find_outer_contour
+
+
+def _make_image():
+    """A bright disc on a dark background"""
+    rows, cols = np.mgrid[0:64, 0:64]
+    image = np.zeros((64, 64), dtype=np.float64)
+    image[(rows - 32)**2 + (cols - 32)**2 < 20**2] = 1.0
+    return image
+
+
+def test_digest():
+    """ The digest depends on contents and shape """
+    image = _make_image()
+    assert image_digest(image) == image_digest(image.copy())
+    assert image_digest(image) != image_digest(image.reshape(32, 128))
+    changed = image.copy()
+    changed[0, 0] = 0.5
+    assert image_digest(image) != image_digest(changed)
+
+
+def test_get_and_put(tmpdir):
+    """ Entries can be stored and retrieved """
+    cache = ContourCache(str(tmpdir))
+    key = cache.make_key('abc', 0.015, 10.0, 0.001, 400)
+    assert key != cache.make_key('abc', 0.015, 10.0, 0.001, 200)
+    assert cache.get(key) is None
+
+    snake = np.random.uniform(size=(400, 2))
+    init = np.random.uniform(size=(400, 2))
+    cache.put(key, snake, init)
+    cached_snake, cached_init = cache.get(key)
+    assert np.array_equal(cached_snake, snake)
+    assert np.array_equal(cached_init, init)
+
+
+def test_eviction(tmpdir):
+    """ Least recently used entries are removed """
+    cache = ContourCache(str(tmpdir))
+    snake = np.zeros((400, 2))
+    keys = [cache.make_key('image', 0.015, 10.0, 0.001, i) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, snake, snake)
+        os.utime(cache._path(key), (i, i)) #pylint:disable=protected-access
+
+    _ = cache.get(keys[0])
+    cache.max_bytes = 2 * os.path.getsize(
+        cache._path(keys[0])) #pylint:disable=protected-access
+    cache.evict()
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+
+
+def test_cached_contour(tmpdir):
+    """ The cached contour matches the fitted one """
+    cache = ContourCache(str(tmpdir))
+    image = _make_image()
+    snake, init = find_outer_contour(image, no_points=50, cache=cache)
+    cached_snake, cached_init = find_outer_contour(image, no_points=50,
+                                                   cache=cache)
+    assert np.array_equal(snake, cached_snake)
+    assert np.array_equal(init, cached_init)
+    assert init.shape == (50, 2)
+
+
+def test_unwritable_cache(tmpdir):
+    """ A cache that can't be made just doesn't cache """
+    blocker = tmpdir.join('not_a_directory')
+    blocker.write('')
+    cache = ContourCache(str(blocker.join('contour_cache')))
+    image = _make_image()
+    snake, _init = find_outer_contour(image, no_points=50, cache=cache)
+    assert snake.shape == (50, 2)
+    assert cache.get(cache.make_key('abc', 0.015, 10.0, 0.001, 50)) is None
+
+
+def test_initialisers_cached_apart(tmpdir):
+    """ Contours from each initialiser have their own cache entries """
+    cache = ContourCache(str(tmpdir))
+    image = _make_image()
+    report = {}
+    find_outer_contour(image, no_points=50, cache=cache, report=report)
+    assert report['initialiser'] == 'threshold'
+
+    report = {}
+    find_outer_contour(image, no_points=50, cache=cache,
+                       initialiser='circle', report=report)
+    assert not report['cached']
+    assert report['initialiser'] == 'circle'
+
+
+def test_reports_cached_apart(tmpdir):
+    """ Contours fitted while reporting aren't given to other callers """
+    cache = ContourCache(str(tmpdir))
+    image = _make_image()
+    report = {}
+    reported, _init = find_outer_contour(image, no_points=50, cache=cache,
+                                         report=report)
+    assert not report['cached']
+
+    snake, _init = find_outer_contour(image, no_points=50, cache=cache)
+    cached, _init = find_outer_contour(image, no_points=50, cache=cache)
+    assert np.array_equal(snake, cached)
+
+    report = {}
+    cached_report, _init = find_outer_contour(image, no_points=50,
+                                              cache=cache, report=report)
+    assert report['cached']
+    assert np.array_equal(reported, cached_report)
+    assert len(os.listdir(cache.version_dir)) == 2
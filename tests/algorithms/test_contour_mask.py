@@ -0,0 +1,55 @@
+# coding=utf-8
+
+"""Tests for the contour mask"""
+
+import numpy as np
+import pytest
+
+from sksurgeryfredmatplotlib.algorithms.contour_mask import ContourMask
+
+
+def _make_mask():
+    """A circle of radius 20 (rows) centred on row 30, column 40"""
+    angles = np.linspace(0, 2 * np.pi, 200)
+    outline = np.array([30 + 20 * np.sin(angles),
+                        40 + 20 * np.cos(angles)]).T
+    return ContourMask(outline, (60, 100))
+
+
+def test_contains():
+    """ Points are tested in x, y order """
+    mask = _make_mask()
+    points = np.array([[40.0, 30.0, 0.0],
+                       [65.0, 30.0, 0.0],
+                       [40.0, 55.0, 0.0],
+                       [-5.0, 30.0, 0.0],
+                       [500.0, 500.0, 0.0]])
+    assert np.array_equal(mask.contains(points),
+                          [True, False, False, False, False])
+    assert mask.contains(np.array([42.0, 31.0, 0.0]))[0]
+
+
+def test_signed_distance():
+    """ Distances are positive inside, negative outside """
+    mask = _make_mask()
+    distances = mask.signed_distance(np.array([[40.0, 30.0],
+                                               [65.0, 30.0],
+                                               [200.0, 30.0]]))
+    assert distances[0] == pytest.approx(20.0, abs=1.5)
+    assert distances[1] == pytest.approx(-5.0, abs=1.5)
+    assert distances[2] == -np.inf
+
+
+def test_make_target_point():
+    """ Targets are always inside the contour """
+    mask = _make_mask()
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        target = mask.make_target_point(rng=rng)
+        assert target.shape == (1, 3)
+        assert mask.contains(target)[0]
+        assert np.linalg.norm(target[0, 0:2] - [40.0, 30.0]) <= 18.0
+
+    empty = ContourMask(np.full((3, 2), 50.0), (10, 10))
+    with pytest.raises(ValueError):
+        empty.make_target_point()
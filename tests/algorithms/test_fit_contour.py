@@ -0,0 +1,64 @@
+# coding=utf-8
+
+"""Tests for fitting contours"""
+
+import numpy as np
+
+from sksurgeryfredmatplotlib.algorithms.fit_contour import find_outer_contour
+
+
+def test_pyramid_contour():
+    """ The pyramid result is close to the single level one """
+    rows, cols = np.mgrid[0:128, 0:128]
+    image = np.zeros((128, 128), dtype=np.float64)
+    image[(rows - 64)**2 + (cols - 64)**2 < 40**2] = 1.0
+
+    snake, init = find_outer_contour(image, no_points=100)
+    pyramid_snake, pyramid_init = find_outer_contour(image, no_points=100,
+                                                     pyramid_levels=3)
+
+    assert np.array_equal(init, pyramid_init)
+    assert pyramid_snake.shape == (100, 2)
+    radii = np.linalg.norm(snake - 64.0, axis=1)
+    pyramid_radii = np.linalg.norm(pyramid_snake - 64.0, axis=1)
+    assert abs(np.mean(radii) - np.mean(pyramid_radii)) < 3.0
+
+
+def test_threshold_initialiser():
+    """ The threshold initialiser starts near the edge, and falls back """
+    rows, cols = np.mgrid[0:128, 0:128]
+    image = np.zeros((128, 128), dtype=np.float64)
+    image[(rows - 64)**2 + (cols - 64)**2 < 40**2] = 1.0
+
+    report = {}
+    _snake, init = find_outer_contour(image, no_points=100,
+                                      initialiser='threshold', report=report)
+    assert report.get('initialiser') == 'threshold'
+    assert report.get('iterations') > 0
+    radii = np.linalg.norm(init - 64.0, axis=1)
+    assert np.all(np.abs(radii - 40.0) < 2.0)
+
+    report = {}
+    _snake, init = find_outer_contour(np.zeros((64, 64)), no_points=100,
+                                      report=report)
+    assert report.get('initialiser') == 'circle'
+    assert init.shape == (100, 2)
+
+
+def test_convergence():
+    """ The convergence tolerance is used at a single level """
+    rows, cols = np.mgrid[0:128, 0:128]
+    image = np.zeros((128, 128), dtype=np.float64)
+    image[(rows - 64)**2 + (cols - 64)**2 < 40**2] = 1.0
+
+    report = {}
+    find_outer_contour(image, no_points=100, initialiser='circle',
+                       report=report)
+    loose_report = {}
+    find_outer_contour(image, no_points=100, initialiser='circle',
+                       convergence=5.0, report=loose_report)
+    assert loose_report['iterations'] < report['iterations']
+
+    snake, _init = find_outer_contour(image, no_points=100,
+                                      convergence=5.0)
+    assert snake.shape == (100, 2)
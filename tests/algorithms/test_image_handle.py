@@ -0,0 +1,56 @@
+# coding=utf-8
+
+"""Tests for the image handle"""
+
+import os
+import numpy as np
+import skimage.io
+
+from sksurgeryfredmatplotlib.algorithms.contour_cache import ContourCache
+from sksurgeryfredmatplotlib.algorithms.image_handle import ImageHandle
+
+
+def test_image_handle(tmpdir):
+    """ The image is only decoded again when the file changes """
+    file_name = os.path.join(str(tmpdir), 'image.png')
+    image = np.zeros((32, 48), dtype=np.uint8)
+    image[8:24, 8:40] = 255
+    skimage.io.imsave(file_name, image, check_contrast=False)
+
+    handle = ImageHandle(file_name)
+    assert np.array_equal(handle.image, image)
+    assert handle.gray.shape == (32, 48)
+    assert handle.smoothed.shape == (32, 48)
+    digest = handle.digest
+    assert not handle.reload_if_changed()
+
+    image[0:4, 0:4] = 128
+    skimage.io.imsave(file_name, image, check_contrast=False)
+    stat = os.stat(file_name)
+    os.utime(file_name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert handle.reload_if_changed()
+    assert np.array_equal(handle.image, image)
+    assert handle.digest != digest
+
+
+def test_outer_contour():
+    """ The contour is kept while the image is unchanged """
+    handle = ImageHandle('data/brain512.png')
+    outline, init = handle.outer_contour(no_points=100)
+    assert outline.shape == (100, 2)
+    assert init.shape == (100, 2)
+    assert handle.outer_contour(no_points=100)[0] is outline
+
+
+def test_contour_keeps_smoothed(tmpdir):
+    """ Fitting keeps the smoothed image, a cache hit doesn't make it """
+    handle = ImageHandle('data/brain512.png')
+    handle.outer_contour(no_points=50, cache=ContourCache(str(tmpdir)))
+    smoothed = handle.smoothed
+    assert handle.outer_contour(no_points=50)[0].shape == (50, 2)
+    assert handle.smoothed is smoothed
+
+    cached = ImageHandle('data/brain512.png')
+    cached.outer_contour(no_points=50, cache=ContourCache(str(tmpdir)))
+    #pylint:disable=protected-access
+    assert cached._gray is None and cached._smoothed is None
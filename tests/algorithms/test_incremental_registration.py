@@ -0,0 +1,67 @@
+# coding=utf-8
+
+"""Tests for incremental point based registration"""
+
+import numpy as np
+import pytest
+
+from sksurgeryfred.algorithms.point_based_reg import PointBasedRegistration
+
+from sksurgeryfredmatplotlib.algorithms.incremental_registration import \
+                IncrementalRegistration
+
+
+def _make_points(no_points, seed=0):
+    """Fiducials on a plane, with fle on the fixed points"""
+    rng = np.random.default_rng(seed)
+    moving = np.zeros((no_points, 3))
+    moving[:, 0:2] = rng.uniform(low=50.0, high=450.0, size=(no_points, 2))
+    fixed = moving + rng.normal(scale=3.0, size=(no_points, 3))
+    return fixed, moving
+
+
+def _assert_results_match(result, expected):
+    """Compares the outputs of register"""
+    assert result[0] == expected[0]
+    assert result[7] == expected[7]
+    for index in [1, 2, 3, 4, 6]:
+        assert result[index] == pytest.approx(expected[index], rel=1e-6,
+                                              abs=1e-9)
+    assert np.allclose(result[5], expected[5], rtol=1e-9, atol=1e-6)
+
+
+def test_matches_batch():
+    """ Each new fiducial gives the same result as the batch method """
+    target = np.array([[240.0, 260.0, 0.0]])
+    batch = PointBasedRegistration(target, 27.0, 0.0)
+    incremental = IncrementalRegistration(target, 27.0, 0.0)
+    fixed, moving = _make_points(30)
+
+    for no_fids in range(1, 31):
+        _assert_results_match(
+            incremental.register(fixed[:no_fids], moving[:no_fids]),
+            batch.register(fixed[:no_fids], moving[:no_fids]))
+
+    new_fixed, new_moving = _make_points(5, seed=1)
+    _assert_results_match(incremental.register(new_fixed, new_moving),
+                          batch.register(new_fixed, new_moving))
+
+
+def test_remove_fiducial():
+    """ Removing a fiducial gives the batch result without it """
+    target = np.array([[240.0, 260.0, 0.0]])
+    batch = PointBasedRegistration(target, 12.0, 0.0)
+    incremental = IncrementalRegistration(target, 12.0, 0.0)
+    fixed, moving = _make_points(10)
+    for fixed_point, moving_point in zip(fixed, moving):
+        incremental.add_fiducial(fixed_point, moving_point)
+
+    incremental.remove_fiducial(fixed[4], moving[4])
+    keep = np.arange(10) != 4
+    _assert_results_match(incremental.register(),
+                          batch.register(fixed[keep], moving[keep]))
+
+    for index in np.flatnonzero(keep):
+        incremental.remove_fiducial(fixed[index], moving[index])
+    assert incremental.no_fids == 0
+    assert not incremental.register()[0]
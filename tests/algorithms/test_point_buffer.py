@@ -0,0 +1,32 @@
+# coding=utf-8
+
+"""Tests for the point buffer"""
+
+import numpy as np
+
+from sksurgeryfredmatplotlib.algorithms.point_buffer import PointBuffer
+
+
+def test_append_and_grow():
+    """ Points are kept in order as the buffer grows """
+    buffer = PointBuffer(capacity=2)
+    assert buffer.points.shape == (0, 3)
+    expected = np.random.uniform(size=(9, 3))
+    for point in expected:
+        buffer.append(point)
+    assert len(buffer) == 9
+    assert buffer.capacity == 16
+    assert np.array_equal(buffer.points, expected)
+    assert buffer.points.base is not None
+
+
+def test_extend_and_clear():
+    """ Clearing keeps the storage """
+    buffer = PointBuffer(columns=2, capacity=4)
+    buffer.extend(np.ones((5, 2)))
+    capacity = buffer.capacity
+    buffer.clear()
+    assert len(buffer) == 0
+    assert buffer.capacity == capacity
+    buffer.append([1.0, 2.0])
+    assert np.array_equal(buffer.points, [[1.0, 2.0]])
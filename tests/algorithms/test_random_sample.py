@@ -0,0 +1,41 @@
+# coding=utf-8
+
+"""Tests for the random sample"""
+
+import numpy as np
+
+from sksurgeryfredmatplotlib.algorithms.random_sample import RandomSample
+
+
+def test_sample_all_until_full():
+    """ Every point is kept, in order, until there are too many """
+    sample = RandomSample(10, 2)
+    assert sample.points.shape == (0, 2)
+    points = np.arange(16.0).reshape(8, 2)
+    sample.extend(points)
+    assert sample.is_complete()
+    assert np.array_equal(sample.points, points)
+
+
+def test_sample_is_bounded():
+    """ Past max_points a uniform sample is kept, in order """
+    sample = RandomSample(100, 1)
+    for start in range(0, 10000, 250):
+        sample.extend(np.arange(start, start + 250.0))
+    assert sample.count == 10000
+    assert not sample.is_complete()
+    assert sample.points.shape == (100, 1)
+    assert np.all(np.diff(sample.points[:, 0]) > 0)
+    assert 3000 < np.mean(sample.points) < 7000
+
+    sample.clear()
+    assert sample.count == 0
+    assert sample.points.shape == (0, 1)
+
+
+def test_sample_unbounded():
+    """ With no max_points every point is kept """
+    sample = RandomSample(None, 1)
+    sample.extend(np.arange(1000.0))
+    assert sample.is_complete()
+    assert sample.points.shape == (1000, 1)
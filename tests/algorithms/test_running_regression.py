@@ -0,0 +1,63 @@
+# coding=utf-8
+
+"""Fiducial Registration Educational Demonstration tests"""
+
+import math
+
+import numpy as np
+
+from sksurgeryfredmatplotlib.algorithms.running_regression import \
+                RunningRegression
+
+
+def test_matches_polyfit():
+    """ Batched running sums match fitting all the data at once """
+    rng = np.random.default_rng(0)
+    x_values = rng.uniform(1.0e6, 1.0e6 + 10.0, size=1000)
+    y_values = 3.0 * x_values + rng.normal(size=1000)
+
+    regression = RunningRegression()
+    for start in range(0, 1000, 137):
+        regression.update(x_values[start:start + 137],
+                          y_values[start:start + 137])
+
+    slope, intercept = np.polyfit(x_values, y_values, 1)
+    assert regression.count == 1000
+    assert np.allclose(regression.fit(), (slope, intercept))
+    assert math.isclose(regression.correlation(),
+                        np.corrcoef(x_values, y_values)[0, 1])
+    assert regression.min_x == np.min(x_values)
+    assert regression.max_x == np.max(x_values)
+
+
+def test_degenerate_values():
+    """ No fit is possible without variance in x """
+    regression = RunningRegression()
+    assert math.isnan(regression.correlation())
+    regression.update([2.0, 2.0, 2.0], [1.0, 2.0, 3.0])
+    assert math.isnan(regression.fit()[0])
+    assert math.isnan(regression.correlation())
+
+
+def test_merge_shards():
+    """ Regressions of separate shards merge to that of all the data """
+    rng = np.random.default_rng(2)
+    x_values = rng.uniform(0.0, 10.0, size=1000)
+    y_values = 0.5 * x_values + rng.normal(size=1000)
+
+    shards = [RunningRegression() for _ in range(4)]
+    for index, shard in enumerate(shards):
+        shard.update(x_values[index::4], y_values[index::4])
+    merged = RunningRegression()
+    for shard in shards:
+        merged.merge(shard)
+    merged.merge(RunningRegression())
+
+    assert merged.count == 1000
+    assert np.allclose(merged.fit(), np.polyfit(x_values, y_values, 1))
+    assert math.isclose(merged.covariance(),
+                        np.cov(x_values, y_values)[0, 1])
+    assert np.allclose(merged.variances(),
+                       (np.var(x_values, ddof=1), np.var(y_values, ddof=1)))
+    assert merged.min_x == np.min(x_values)
+    assert math.isnan(RunningRegression().covariance())
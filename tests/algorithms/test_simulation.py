@@ -0,0 +1,94 @@
+# coding=utf-8
+
+"""Tests for the headless registration simulation"""
+
+import numpy as np
+import pytest
+
+from sksurgerycore.algorithms.procrustes import orthogonal_procrustes
+from sksurgerycore.algorithms.errors import compute_tre_from_fle
+
+from sksurgeryfredmatplotlib.algorithms.contour_mask import ContourMask
+from sksurgeryfredmatplotlib.algorithms.simulation import \
+        batch_procrustes, batch_expected_tre_squared, RegistrationSimulator, \
+        simulate_from_image, log_results
+from sksurgeryfredmatplotlib.algorithms.simulation_runner import \
+        run_simulations
+from sksurgeryfredmatplotlib.logging.fred_logger import Logger
+
+
+def test_batch_registration():
+    """ Batched registration matches sksurgerycore """
+    rng = np.random.default_rng(0)
+    moving = np.zeros((20, 6, 3))
+    moving[:, :, 0:2] = rng.uniform(0.0, 500.0, size=(20, 6, 2))
+    fixed = moving + rng.normal(scale=2.0, size=moving.shape)
+    targets = np.zeros((20, 3))
+    targets[:, 0:2] = rng.uniform(100.0, 400.0, size=(20, 2))
+
+    rotations, translations, fres = batch_procrustes(fixed, moving)
+    expected_tres = batch_expected_tre_squared(moving, np.full(20, 12.0),
+                                               targets)
+    for trial in range(20):
+        rotation, translation, fre = orthogonal_procrustes(fixed[trial],
+                                                           moving[trial])
+        assert np.allclose(rotations[trial], rotation)
+        assert np.allclose(translations[trial], translation[:, 0])
+        assert fres[trial] == pytest.approx(fre)
+        assert expected_tres[trial] == pytest.approx(compute_tre_from_fle(
+            moving[trial], 12.0, targets[trial:trial + 1]))
+
+
+def test_simulator():
+    """ Simulated results are sensible """
+    angles = np.linspace(0, 2 * np.pi, 200)
+    outline = np.array([100 + 80 * np.sin(angles),
+                        100 + 80 * np.cos(angles)]).T
+    simulator = RegistrationSimulator(ContourMask(outline, (200, 200)),
+                                      max_fids=8,
+                                      rng=np.random.default_rng(1))
+    results = simulator.run(500)
+    assert len(results) == 6
+    for column in results:
+        assert column.shape == (500,)
+    assert np.all(results[5] >= 3)
+    assert np.all(results[5] <= 8)
+    assert np.all(results[1] > 0.0)
+    assert np.all(results[4] >= np.sqrt(3.0) * 0.5)
+    assert np.corrcoef(results[2], results[0])[0, 1] > 0.2
+
+
+def test_simulate_and_log(tmpdir):
+    """ Simulated results can be read back by the logger """
+    results = simulate_from_image('data/brain512.png', 20,
+                                  rng=np.random.default_rng(2))
+    log_file = str(tmpdir.join('simulated.log'))
+    logger = Logger({"logger" : {"log file name" : log_file,
+                                 "overwrite existing" : True}})
+    log_results(logger, results)
+    read_back = logger.read_log()
+    del logger
+
+    assert np.allclose(read_back[0], results[0], atol=1e-4)
+    assert np.array_equal(read_back[5], results[5])
+
+
+def test_parallel_simulation():
+    """ Sharded results depend on the seed, not the number of workers """
+    angles = np.linspace(0, 2 * np.pi, 200)
+    outline = np.array([100 + 80 * np.sin(angles),
+                        100 + 80 * np.cos(angles)]).T
+    contour_mask = ContourMask(outline, (200, 200))
+
+    results = run_simulations(contour_mask, 250, workers=2, seed=42,
+                              shard_size=100, max_fids=6)
+    repeated = run_simulations(contour_mask, 250, workers=1, seed=42,
+                               shard_size=100, max_fids=6)
+    assert results[0].shape == (250,)
+    for column, repeated_column in zip(results, repeated):
+        assert np.array_equal(column, repeated_column)
+    assert np.all(results[5] <= 6)
+
+    different = run_simulations(contour_mask, 250, workers=2, seed=43,
+                                shard_size=100, max_fids=6)
+    assert not np.array_equal(results[0], different[0])
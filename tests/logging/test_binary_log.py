@@ -0,0 +1,173 @@
+# coding=utf-8
+
+"""scikit-surgeryfed binary log tests"""
+
+import os
+
+import numpy as np
+import pytest
+
+from sksurgeryfredmatplotlib.logging.binary_log import read_binary_log, \
+                split_records, BinaryLogWriter, RECORD_DTYPE, RECORD_BYTES, \
+                HEADER_BYTES, MAX_STATE_LENGTH, MAX_STATES
+from sksurgeryfredmatplotlib.logging.fred_logger import Logger
+from sksurgeryfredmatplotlib.logging.log_conversion import text_to_binary, \
+                binary_to_text
+from sksurgeryfredmatplotlib.logging.log_reader import read_records, \
+                read_results
+
+
+def _write_logs(tmpdir, asynchronous):
+    """
+    Writes a few results and scores to a text and a binary log
+    """
+    text_file = str(tmpdir.join('fred.log'))
+    binary_file = str(tmpdir.join('fred.fredlog'))
+    logger = Logger({"logger" : {"log file name" : text_file,
+                                 "binary file name" : binary_file,
+                                 "overwrite existing" : True,
+                                 "asynchronous" : asynchronous}})
+    logger.log_result(1.0, 2.0, 3.0, 4.0, 5.0, 3)
+    logger.log_score('Actual TRE', 85.25)
+    logger.log(message="not a record")
+    logger.log_result(1.5, 2.5, 3.5, 4.5, 5.5, 14)
+    logger.close()
+    return text_file, binary_file
+
+
+def test_binary_matches_text(tmpdir):
+    """
+    The binary log holds the same records as the text log
+    """
+    text_file, binary_file = _write_logs(tmpdir, asynchronous=True)
+
+    records, states = read_binary_log(binary_file)
+    assert isinstance(records, np.memmap)
+    assert records.dtype == RECORD_DTYPE
+    assert records.shape == (3,)
+    assert states == ['Actual TRE']
+    assert os.path.getsize(binary_file) == HEADER_BYTES + 3 * RECORD_BYTES
+
+    with open(text_file, encoding='utf-8') as log_file:
+        lines = [line for line in log_file if 'not a record' not in line]
+    with open(text_file, 'w', encoding='utf-8') as log_file:
+        log_file.writelines(lines)
+
+    text_results, text_ablations = read_records(text_file)
+    binary_results, binary_ablations = read_records(binary_file)
+    for name in text_results.dtype.names:
+        assert np.allclose(text_results[name], binary_results[name])
+    assert np.array_equal(text_ablations, binary_ablations)
+    assert np.array_equal(read_results(binary_file)[5], [3, 14])
+
+
+def test_round_trip(tmpdir):
+    """
+    Converting text to binary and back gives the same text
+    """
+    text_file, _binary_file = _write_logs(tmpdir, asynchronous=False)
+    with open(text_file, encoding='utf-8') as log_file:
+        lines = [line for line in log_file if 'not a record' not in line]
+    with open(text_file, 'w', encoding='utf-8') as log_file:
+        log_file.writelines(lines)
+
+    converted = str(tmpdir.join('converted.fredlog'))
+    assert text_to_binary(text_file, converted) == 3
+    round_trip = str(tmpdir.join('round_trip.log'))
+    assert binary_to_text(converted, round_trip) == 3
+
+    with open(round_trip, encoding='utf-8') as log_file:
+        assert log_file.readlines() == lines
+
+
+def test_append_and_errors(tmpdir):
+    """
+    Appending drops a partial record, and text files can't be appended to
+    """
+    binary_file = str(tmpdir.join('append.fredlog'))
+    writer = BinaryLogWriter(binary_file)
+    writer.write_result(0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6)
+    writer.close()
+    with open(binary_file, 'ab') as log_file:
+        log_file.write(b'partial')
+
+    writer = BinaryLogWriter(binary_file)
+    writer.write_score(1.0, 'Expected TRE', 12.5)
+    writer.close()
+    writer = BinaryLogWriter(binary_file)
+    writer.write_score(2.0, 'Actual FRE', 10.0)
+    writer.write_score(3.0, 'Expected TRE', 2.5)
+    writer.close()
+
+    records, states = read_binary_log(binary_file)
+    assert records.shape == (4,)
+    _results, ablations = split_records(records)
+    assert states == ['Expected TRE', 'Actual FRE']
+    assert np.array_equal(ablations['state'], [0, 1, 0])
+    assert list(read_records(binary_file)[1]['state']) == \
+            ['Expected TRE', 'Actual FRE', 'Expected TRE']
+
+    text_file = str(tmpdir.join('text.log'))
+    with open(text_file, 'w', encoding='utf-8') as log_file:
+        log_file.write('not binary\n')
+    with pytest.raises(IOError):
+        BinaryLogWriter(text_file)
+
+
+def test_long_unicode_state(tmpdir):
+    """
+    Long states are shortened by characters, not bytes
+    """
+    binary_file = str(tmpdir.join('states.fredlog'))
+    state = 'Erreur attendue é' * 3
+    writer = BinaryLogWriter(binary_file)
+    writer.write_score(0.0, state, 1.0)
+    writer.close()
+
+    _results, ablations = read_records(binary_file)
+    assert ablations['state'][0] == state[0:MAX_STATE_LENGTH]
+
+
+def test_large_values_round_trip(tmpdir):
+    """
+    Values above 1000 keep their four decimal places
+    """
+    text_file = str(tmpdir.join('large.log'))
+    logger = Logger({"logger" : {"log file name" : text_file,
+                                 "overwrite existing" : True}})
+    logger.log_result(1234.5678, 2345.6789, 98765.4321, 0.0001, 512.0001,
+                      200)
+    logger.close()
+
+    converted = str(tmpdir.join('large.fredlog'))
+    assert text_to_binary(text_file, converted) == 1
+    results = read_records(converted)[0]
+    assert results['actual_tre'][0] == 1234.5678
+    assert results['actual_fre'][0] == 2345.6789
+    assert results['expected_tre'][0] == 98765.4321
+
+    round_trip = str(tmpdir.join('large_round_trip.log'))
+    assert binary_to_text(converted, round_trip) == 1
+    with open(text_file, encoding='utf-8') as log_file:
+        lines = log_file.readlines()
+    with open(round_trip, encoding='utf-8') as log_file:
+        assert log_file.readlines() == lines
+
+
+def test_full_state_table(tmpdir):
+    """
+    The header has room for MAX_STATES of the longest states
+    """
+    binary_file = str(tmpdir.join('full.fredlog'))
+    writer = BinaryLogWriter(binary_file, logger_name='fred')
+    states = [str(index).zfill(3) + '\x01' * (MAX_STATE_LENGTH - 3)
+              for index in range(MAX_STATES)]
+    for state in states:
+        writer.write_score(0.0, state, 1.0)
+    with pytest.raises(IOError):
+        writer.write_score(0.0, 'one too many', 1.0)
+    writer.close()
+
+    assert os.path.getsize(binary_file) == (HEADER_BYTES +
+                                            MAX_STATES * RECORD_BYTES)
+    assert list(read_records(binary_file)[1]['state']) == states
@@ -0,0 +1,94 @@
+# coding=utf-8
+
+"""scikit-surgeryfed tests"""
+
+import json
+import os
+
+import numpy as np
+
+from sksurgeryfredmatplotlib.logging import log_aggregation
+from sksurgeryfredmatplotlib.logging.fred_logger import Logger
+from sksurgeryfredmatplotlib.logging.log_aggregation import find_logs, \
+                aggregate_logs, save_dataset, load_dataset, \
+                AGGREGATE_RESULT_DTYPE
+from sksurgeryfredmatplotlib.ui.sksurgeryfred_aggregate import \
+                run_aggregation
+
+
+def _write_session(log_file_name, no_results):
+    """ Logs some results and an ablation score """
+    os.makedirs(os.path.dirname(log_file_name), exist_ok=True)
+    logger = Logger({"logger" : {"log file name" : log_file_name,
+                                 "overwrite existing" : True}})
+    for index in range(no_results):
+        logger.log_result(1.0 + index, 2.0 * index, 3.0, 4.0, 5.0, index)
+    logger.log_score('Actual TRE', 85.0)
+    logger.close()
+
+
+def test_aggregate_sessions(tmp_path):
+    """ Logs are read in parallel and merged in file order """
+    _write_session(str(tmp_path / "pc_1" / "fred_results.log"), 3)
+    _write_session(str(tmp_path / "pc_2" / "fred_game.log"), 5)
+    with open(tmp_path / "pc_2" / "bad.log", 'w', encoding='utf-8') \
+        as bad_log:
+        bad_log.write("not a result\n")
+
+    log_files = find_logs([str(tmp_path), str(tmp_path / "pc_1" / "*.log")])
+    assert [os.path.basename(name) for name in log_files] == \
+            ["fred_results.log", "bad.log", "fred_game.log"]
+
+    reported = []
+    results, ablations, summaries = aggregate_logs(
+        log_files, workers=2,
+        progress=lambda done, total, _name: reported.append((done, total)))
+
+    assert reported[-1] == (3, 3)
+    assert results.dtype == AGGREGATE_RESULT_DTYPE
+    assert np.array_equal(results['session'], [0, 0, 0, 2, 2, 2, 2, 2])
+    assert np.array_equal(results['no_fids'], [0, 1, 2, 0, 1, 2, 3, 4])
+    assert np.array_equal(ablations['session'], [0, 2])
+    assert summaries[0]["session"] == os.path.join("pc_1",
+                                                   "fred_results.log")
+    assert summaries[2]["results"] == 5
+    assert np.isclose(summaries[2]["means"]["actual_tre"], 3.0)
+    assert np.isclose(
+        summaries[2]["correlations with actual TRE"]["actual_fre"], 1.0)
+    assert "line 1: " in summaries[1]["error"]
+
+    save_dataset(str(tmp_path / "merged.npz"), results, ablations, summaries)
+    loaded, loaded_ablations, sessions, sources = \
+            load_dataset(str(tmp_path / "merged.npz"))
+    assert np.array_equal(loaded, results)
+    assert np.array_equal(loaded_ablations, ablations)
+    assert sessions[1] == os.path.join("pc_2", "bad.log")
+    assert sources == log_files
+
+
+def test_parse_failure(tmp_path, monkeypatch):
+    """ An IndexError reading a log is reported in its summary """
+    def _old_numpy(_log_file):
+        raise IndexError("list index out of range")
+
+    _write_session(str(tmp_path / "fred_results.log"), 3)
+    monkeypatch.setattr(log_aggregation, 'read_records', _old_numpy)
+    results, _ablations, summaries = aggregate_logs(
+        [str(tmp_path / "fred_results.log")], workers=1)
+    assert results.shape == (0,)
+    assert summaries[0]["error"] == "list index out of range"
+
+
+def test_run_aggregation(tmp_path):
+    """ The aggregation command saves the dataset and summaries """
+    _write_session(str(tmp_path / "logs" / "fred_results.log"), 2)
+    output = str(tmp_path / "merged.npz")
+    summary_file = str(tmp_path / "sessions.json")
+
+    assert run_aggregation([str(tmp_path / "logs")], output, summary_file,
+                           workers=1, quiet=True) == 1
+    with open(summary_file, encoding='utf-8') as json_file:
+        summaries = json.load(json_file)
+    assert summaries[0]["session"] == "fred_results.log"
+    assert summaries[0]["error"] is None
+    assert load_dataset(output)[0].shape == (2,)
@@ -0,0 +1,74 @@
+# coding=utf-8
+
+"""scikit-surgeryfed log cache tests"""
+
+import os
+
+import numpy as np
+import pytest
+
+from sksurgeryfredmatplotlib.logging.log_cache import read_records_cached, \
+                sidecar_file_name
+from sksurgeryfredmatplotlib.logging.fred_logger import format_result, \
+                format_score
+
+
+def _line(msg):
+    """
+    A log line, as written by Logger
+    """
+    return ("2024-01-01 10:00:00,000 - sksurgeryfred v0.1 - INFO - " +
+            msg + "\n")
+
+
+def test_appended_lines(tmpdir):
+    """
+    Only lines appended since the log was cached are parsed
+    """
+    log_file = str(tmpdir.join('fred.log'))
+    with open(log_file, 'w', encoding='utf-8') as log:
+        log.write(_line(format_result(1.0, 2.0, 3.0, 4.0, 5.0, 3)))
+        log.write(_line(format_score('Actual TRE', 50.0)))
+
+    results, ablations = read_records_cached(log_file)
+    assert os.path.exists(sidecar_file_name(log_file))
+    assert np.array_equal(results['no_fids'], [3])
+    assert ablations.shape == (1,)
+
+    with open(log_file, 'a', encoding='utf-8') as log:
+        log.write(_line(format_result(1.5, 2.5, 3.5, 4.5, 5.5, 4)))
+        log.write(_line(format_result(1.5, 2.5, 3.5, 4.5, 5.5, 5))[0:40])
+
+    results, ablations = read_records_cached(log_file)
+    assert np.array_equal(results['no_fids'], [3, 4])
+    assert ablations.shape == (1,)
+
+    with open(log_file, 'a', encoding='utf-8') as log:
+        log.write(_line(format_result(1.5, 2.5, 3.5, 4.5, 5.5, 5))[40:])
+        log.write(_line("not a record"))
+
+    with pytest.raises(IOError) as excinfo:
+        read_records_cached(log_file)
+    assert "at line 5: " in str(excinfo.value)
+
+
+def test_changed_log(tmpdir):
+    """
+    A log that has been rewritten is parsed again
+    """
+    log_file = str(tmpdir.join('fred.log'))
+    with open(log_file, 'w', encoding='utf-8') as log:
+        log.write(_line(format_result(1.0, 2.0, 3.0, 4.0, 5.0, 3)))
+    read_records_cached(log_file)
+
+    with open(log_file, 'w', encoding='utf-8') as log:
+        log.write(_line(format_result(1.0, 2.0, 3.0, 4.0, 5.0, 6)))
+        log.write(_line(format_result(1.0, 2.0, 3.0, 4.0, 5.0, 7)))
+
+    results, _ablations = read_records_cached(log_file)
+    assert np.array_equal(results['no_fids'], [6, 7])
+
+    with open(sidecar_file_name(log_file), 'wb') as sidecar:
+        sidecar.write(b'corrupt')
+    results, _ablations = read_records_cached(log_file)
+    assert np.array_equal(results['no_fids'], [6, 7])
@@ -3,7 +3,12 @@
 """scikit-surgeryfed tests"""
 
 from os import path
+import numpy as np
+import pytest
 from sksurgeryfredmatplotlib.logging.fred_logger import Logger
+from sksurgeryfredmatplotlib.logging import log_reader
+from sksurgeryfredmatplotlib.logging.log_reader import read_records, \
+                read_results, RESULT_DTYPE
 
 def test_empty_config():
     """
@@ -55,3 +60,183 @@ def test_overwrite():
     assert path.exists("testing_log_file.log")
 
     del logger
+
+
+def test_asynchronous():
+    """
+    Test that queued results are all written on close
+    """
+
+    config = {
+        "logger" : {
+            "log file name" : "testing_async_log_file.log",
+            "overwrite existing" : True,
+            "asynchronous" : True,
+            "batch size" : 7
+            }
+        }
+
+    logger = Logger(config)
+    for index in range(50):
+        logger.log_result(1.0, 2.0, 3.0, 4.0, 5.0, index)
+    logger.close()
+    logger.close()
+
+    results = logger.read_log()
+    assert len(results[0]) == 50
+    assert np.array_equal(results[5], np.arange(50))
+
+    logger = Logger(config)
+    logger.log_result(1.0, 2.0, 3.0, 4.0, 5.0, 3)
+    del logger
+    with open("testing_async_log_file.log", encoding='utf-8') as log_file:
+        assert len(log_file.readlines()) == 1
+
+
+def test_read_log_errors():
+    """
+    Test that a bad line gives an IOError saying where it is
+    """
+
+    config = {
+        "logger" : {
+            "log file name" : "testing_bad_log_file.log",
+            "overwrite existing" : True
+            }
+        }
+
+    logger = Logger(config)
+    logger.log_result(1.0, 2.0, 3.0, 4.0, 5.0, 3)
+    logger.log_result(1.5, 2.5, 3.5, 4.5, 5.5, 4)
+    logger.log(message="not a result")
+    logger.close()
+
+    with pytest.raises(IOError) as excinfo:
+        logger.read_log()
+    assert "line 3: " in str(excinfo.value)
+    assert "not a result" in str(excinfo.value)
+
+    with open("testing_bad_log_file.log", 'w', encoding='utf-8') as log_file:
+        log_file.write("2020-01-01 10:00:00,000 - fred - INFO - " +
+                       "success, 1.0, 2.0, 3.0, 4.0, 5.0, 3\n\n" +
+                       "2020-01-01 10:00:01,000 - fred - INFO - " +
+                       "success, 1.0, 2.0, x, 4.0, 5.0, 3\n")
+    with pytest.raises(IOError) as excinfo:
+        logger.read_log()
+    assert "line 3: " in str(excinfo.value)
+
+
+def test_read_game_log():
+    """
+    Test that results and ablation scores are read from the same log
+    """
+
+    config = {
+        "logger" : {
+            "log file name" : "testing_game_log_file.log",
+            "overwrite existing" : True
+            }
+        }
+
+    logger = Logger(config)
+    logger.log_result(1.0, 2.0, 3.0, 4.0, 5.0, 3)
+    logger.log_score('Actual TRE', 85.0)
+    logger.log_result(1.5, 2.5, 3.5, 4.5, 5.5, 4)
+    logger.log_score('FLE and Number of Fids', 0)
+    logger.close()
+
+    results, ablations = read_records("testing_game_log_file.log")
+    assert results.dtype == RESULT_DTYPE
+    assert np.array_equal(results['no_fids'], [3, 4])
+    assert np.allclose(results['actual_tre'], [1.0, 1.5])
+    assert list(ablations['state']) == ['Actual TRE',
+                                        'FLE and Number of Fids']
+    assert np.array_equal(ablations['score'], [85.0, 0.0])
+
+    read_back = logger.read_log()
+    assert np.array_equal(read_back[5], [3, 4])
+
+
+def test_read_game_log_old_numpy(monkeypatch):
+    """
+    Older numpy raises IndexError on short lines, such as ablation
+    scores, which should also fall back to reading a line at a time
+    """
+    load_values = log_reader._load_values #pylint:disable=protected-access
+    def _old_load_values(lines, first_column=2):
+        if first_column == 2 or any(line.count(b',') < 5 for line in lines):
+            raise IndexError("list index out of range")
+        return load_values(lines, first_column)
+
+    config = {
+        "logger" : {
+            "log file name" : "testing_game_log_file.log",
+            "overwrite existing" : True
+            }
+        }
+
+    logger = Logger(config)
+    logger.log_result(1.0, 2.0, 3.0, 4.0, 5.0, 3)
+    logger.log_score('Actual TRE', 85.0)
+    logger.close()
+
+    monkeypatch.setattr(log_reader, '_load_values', _old_load_values)
+    assert np.array_equal(read_results("testing_game_log_file.log")[5], [3])
+
+    with open("testing_game_log_file.log", 'a', encoding='utf-8') as log_file:
+        log_file.write("2020-01-01 10:00:00,000 - fred - INFO - " +
+                       "success, 1.0, 2.0\n")
+    with pytest.raises(IOError) as excinfo:
+        read_records("testing_game_log_file.log")
+    assert "line 3: " in str(excinfo.value)
+
+
+def test_long_ablation_state():
+    """
+    Ablation states too long to read are an error, not shortened
+    """
+    with open("testing_game_log_file.log", 'w', encoding='utf-8') as log_file:
+        log_file.write("2020-01-01 10:00:00,000 - fred - INFO - " +
+                       "ablation, " + "x" * 33 + ", 85.0\n")
+    with pytest.raises(IOError) as excinfo:
+        read_records("testing_game_log_file.log")
+    assert "line 1: " in str(excinfo.value)
+    assert "longer than 32 characters" in str(excinfo.value)
+
+
+def test_read_log_chunks():
+    """
+    Test that reading a log in small chunks gives every result once
+    """
+
+    config = {
+        "logger" : {
+            "log file name" : "testing_chunked_log_file.log",
+            "overwrite existing" : True
+            }
+        }
+
+    logger = Logger(config)
+    for index in range(20):
+        logger.log_result(1.0 * index, 2.0, 3.0, 4.0, 5.0, index)
+        logger.log_score('Actual TRE', 85.0)
+    logger.close()
+
+    with open("testing_chunked_log_file.log", 'a', encoding='utf-8') \
+        as log_file:
+        log_file.write("2020-01-01 10:00:00,000 - fred - INFO - " +
+                       "success, 20.0, 2.0, 3.0, 4.0, 5.0, 20")
+
+    chunks = list(logger.read_log_chunks(chunk_bytes=200))
+    assert len(chunks) > 10
+    no_fids = np.concatenate([chunk[5] for chunk in chunks])
+    assert np.array_equal(no_fids, np.arange(21))
+    assert np.array_equal(np.concatenate([chunk[0] for chunk in chunks]),
+                          logger.read_log()[0])
+
+    with open("testing_chunked_log_file.log", 'a', encoding='utf-8') \
+        as log_file:
+        log_file.write("\nnot a result\n")
+    with pytest.raises(IOError) as excinfo:
+        list(logger.read_log_chunks(chunk_bytes=200))
+    assert "line 42: " in str(excinfo.value)
@@ -0,0 +1,61 @@
+# coding=utf-8
+
+"""Fiducial Registration Educational Demonstration tests"""
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from sksurgeryfredmatplotlib.plotting.blit_renderer import BlitRenderer
+
+
+def _make_figure():
+    """
+    A small headless figure with one moving marker
+    """
+    fig = Figure(figsize=(2, 2), dpi=50)
+    FigureCanvasAgg(fig)
+    axes = fig.add_subplot(1, 1, 1)
+    axes.set_xlim(0, 10)
+    axes.set_ylim(0, 10)
+    marker = axes.scatter([2.0], [2.0], s=400, c='r')
+    return fig, marker
+
+
+def test_blit_update():
+    """ Tests that updates redraw the marker over the cached background """
+    fig, marker = _make_figure()
+    renderer = BlitRenderer(fig, [marker])
+    assert marker.get_animated()
+
+    #without a background, update falls back to a full draw
+    renderer.update()
+    first = np.array(fig.canvas.buffer_rgba())
+
+    marker.set_offsets([[8.0, 8.0]])
+    renderer.update()
+    second = np.array(fig.canvas.buffer_rgba())
+    assert not np.array_equal(first, second)
+
+    #a full draw should give the same picture as the blit
+    renderer.draw()
+    assert np.array_equal(second, np.array(fig.canvas.buffer_rgba()))
+
+
+def test_no_blit_fallback():
+    """ Tests that a canvas without blitting gets full draws """
+
+    class NoBlitCanvas(FigureCanvasAgg):
+        """An Agg canvas that says it can't blit"""
+        supports_blit = False
+
+    fig, marker = _make_figure()
+    NoBlitCanvas(fig)
+    renderer = BlitRenderer(fig, [marker])
+    assert not marker.get_animated()
+
+    renderer.update()
+    first = np.array(fig.canvas.buffer_rgba())
+    marker.set_offsets([[8.0, 8.0]])
+    renderer.update()
+    assert not np.array_equal(first, np.array(fig.canvas.buffer_rgba()))
@@ -0,0 +1,96 @@
+# coding=utf-8
+
+"""Fiducial Registration Educational Demonstration tests"""
+
+import numpy as np
+import pytest
+
+from sksurgeryfredmatplotlib.logging.binary_log import BinaryLogWriter
+from sksurgeryfredmatplotlib.logging.fred_logger import format_result
+from sksurgeryfredmatplotlib.plotting.live_plotting import LiveResultsPlot
+
+
+def _write_results(log_file, no_fids, mode='a'):
+    """
+    Writes results to a log, as Logger would
+    """
+    with open(log_file, mode, encoding='utf-8') as log:
+        for fids in no_fids:
+            log.write("2024-01-01 10:00:00,000 - fred - INFO - " +
+                      format_result(fids * 0.5, 1.0, fids * 0.25, 1.0, 2.0,
+                                    fids) + "\n")
+
+
+def test_live_updates(tmpdir):
+    """ New results are added to the plots, and replaced logs reread """
+    log_file = str(tmpdir.join('fred_results.log'))
+    live_plot = LiveResultsPlot(log_file, headless=True)
+    assert live_plot.update() == 0
+
+    _write_results(log_file, [3, 4, 5])
+    assert live_plot.update() == 3
+    _write_results(log_file, [6, 7])
+    assert live_plot.update() == 2
+    assert live_plot.update() == 0
+
+    offsets = live_plot.scatters[4].get_offsets()
+    assert np.array_equal(offsets[:, 0], [3, 4, 5, 6, 7])
+    assert np.isclose(live_plot.regressions[1].fit()[0], 2.0)
+    assert live_plot.subplot[1].get_title() == "Corr. Coef. = 1.000"
+
+    _write_results(log_file, [8], mode='w')
+    assert live_plot.update() == 1
+    assert live_plot.scatters[0].get_offsets().shape == (1, 2)
+
+
+def test_live_max_points(tmpdir):
+    """ Past max_points a sample is drawn, as a density or a scatter """
+    log_file = str(tmpdir.join('fred_results.log'))
+    live_plot = LiveResultsPlot(log_file, headless=True, max_points=20)
+    _write_results(log_file, range(3, 53))
+    assert live_plot.update() == 50
+    assert live_plot.hexbins[0] is not None
+    assert not live_plot.scatters[0].get_visible()
+    assert np.isclose(live_plot.regressions[1].fit()[0], 2.0)
+
+    _write_results(log_file, [3], mode='w')
+    assert live_plot.update() == 1
+    assert live_plot.hexbins[0] is None
+    assert live_plot.scatters[0].get_visible()
+
+    _write_results(log_file, range(4, 53))
+    live_plot = LiveResultsPlot(log_file, headless=True, max_points=20,
+                                density='subsample')
+    assert live_plot.hexbins[0] is None
+    assert live_plot.scatters[0].get_offsets().shape == (20, 2)
+
+    with pytest.raises(ValueError):
+        LiveResultsPlot(log_file, headless=True, density='contour')
+
+
+def test_live_binary_log(tmpdir):
+    """ Binary logs are followed a record at a time """
+    log_file = str(tmpdir.join('fred_results.fredlog'))
+    live_plot = LiveResultsPlot(log_file, headless=True)
+    writer = BinaryLogWriter(log_file, overwrite=True)
+    assert live_plot.update() == 0
+    for fids in [3, 4, 5]:
+        writer.write_result(0.0, fids * 0.5, 1.0, fids * 0.25, 1.0, 2.0, fids)
+    writer.write_score(0.0, 'Actual TRE', 85.0)
+    writer.flush()
+    assert live_plot.update() == 3
+
+    writer.write_result(0.0, 3.5, 1.0, 1.75, 1.0, 2.0, 7)
+    writer.flush()
+    with open(log_file, 'ab') as partial:
+        partial.write(b'\x01\x00')
+    assert live_plot.update() == 1
+    assert live_plot.update() == 0
+    writer.close()
+
+    offsets = live_plot.scatters[4].get_offsets()
+    assert np.array_equal(offsets[:, 0], [3, 4, 5, 7])
+
+    _write_results(log_file, [8], mode='w')
+    assert live_plot.update() == 1
+    assert live_plot.scatters[0].get_offsets().shape == (1, 2)
@@ -0,0 +1,121 @@
+# coding=utf-8
+
+"""Fiducial Registration Educational Demonstration tests"""
+
+import json
+import math
+import os
+
+import matplotlib
+matplotlib.use('Agg')
+#pylint:disable=wrong-import-position, consider-using-f-string
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from sksurgeryfredmatplotlib.plotting.plotting import _plot_subresults, \
+                summarise_results, fit_statistics, export_statistics, \
+                export_results, plot_results
+from sksurgeryfredmatplotlib.algorithms.running_regression import \
+                RunningRegression
+
+
+def test_density_modes():
+    """ Large results are drawn as a density, but fitted in full """
+    rng = np.random.default_rng(1)
+    x_values = rng.uniform(0.0, 10.0, size=5000)
+    y_values = 2.0 * x_values + rng.normal(size=5000)
+    expected = "Corr. Coef. = {0:.3f}".format(
+        np.corrcoef(x_values, y_values)[0, 1])
+
+    fig, subplot = plt.subplots(1, 4)
+    _plot_subresults(subplot[0], x_values, y_values)
+    _plot_subresults(subplot[1], x_values, y_values, 1000, 'hexbin')
+    _plot_subresults(subplot[2], x_values, y_values, 1000, 'subsample')
+
+    assert subplot[0].collections[0].get_offsets().shape == (5000, 2)
+    assert subplot[2].collections[0].get_offsets().shape == (1000, 2)
+    assert subplot[1].collections[0].get_array().size < 5000
+    for panel in subplot[0:3]:
+        assert panel.get_title() == expected
+        slope = np.diff(panel.lines[0].get_ydata()) / \
+                np.diff(panel.lines[0].get_xdata())
+        assert np.isclose(slope[0], np.polyfit(x_values, y_values, 1)[0])
+
+    with pytest.raises(ValueError):
+        _plot_subresults(subplot[3], x_values, y_values, 1000, 'contour')
+    plt.close(fig)
+
+
+def test_summarise_results():
+    """ A log read in chunks is fitted in full, and sampled """
+    with open("testing_summarise.log", 'w', encoding='utf-8') as log_file:
+        for index in range(100):
+            log_file.write("2020-01-01 10:00:00,000 - fred - INFO - " +
+                           "success, {0:}, {1:}, 3.0, 4.0, 5.0, {2:}\n"
+                           .format(2.0 * index, index, index % 7))
+
+    regressions, sample = summarise_results("testing_summarise.log",
+                                            max_points=10, chunk_bytes=500)
+    assert regressions[0].count == 100
+    assert np.allclose(regressions[0].fit(), (2.0, 0.0))
+    assert math.isclose(regressions[0].correlation(), 1.0)
+    assert len(sample[0]) == 10
+    assert len(np.unique(sample[1])) == 10
+    assert np.array_equal(sample[0], 2.0 * sample[1])
+    assert sample[5].dtype == np.int64
+
+    with pytest.raises(ValueError):
+        plot_results("testing_summarise.log", streaming=True, resamples=10,
+                     output="testing_summarise.png")
+
+
+def test_export_statistics():
+    """ Fit statistics and intervals are written as JSON """
+    rng = np.random.default_rng(2)
+    regressions = [RunningRegression() for _ in range(5)]
+    for regression in regressions[0:4]:
+        regression.update(rng.normal(size=100), rng.normal(size=100))
+    intervals = (np.full(5, -0.5), np.full(5, 0.5))
+
+    statistics = fit_statistics(regressions, intervals, 0.9, 100)
+    export_statistics(statistics, "testing_statistics.json")
+    with open("testing_statistics.json", encoding='utf-8') as json_file:
+        read_back = json.load(json_file)
+
+    assert [panel["x"] for panel in read_back][0] == "Actual FRE"
+    assert read_back[0]["count"] == 100
+    assert math.isclose(read_back[0]["correlation"],
+                        regressions[0].correlation())
+    assert read_back[1]["confidence interval"] == {
+        "lower" : -0.5, "upper" : 0.5, "confidence" : 0.9,
+        "resamples" : 100}
+    assert read_back[4]["correlation"] is None
+    os.remove("testing_statistics.json")
+
+
+def test_export_results(tmp_path):
+    """ Several logs are plotted to files without a display """
+    logfiles = []
+    for session in ["first", "second"]:
+        os.makedirs(tmp_path / session)
+        logfile = str(tmp_path / session / "fred_results.log")
+        with open(logfile, 'w', encoding='utf-8') as log_file:
+            for index in range(30):
+                log_file.write("2020-01-01 10:00:00,000 - fred - INFO - " +
+                               "success, {0:}, {1:}, 3.0, {1:}, 5.0, {2:}\n"
+                               .format(index * 0.1, index % 5, index % 4 + 3))
+        logfiles.append(logfile)
+
+    exported = export_results(logfiles, str(tmp_path / "pdf"), 'pdf',
+                              use_cache=False, resamples=50)
+    assert [os.path.basename(name) for name, _ in exported] == \
+            ["fred_results.pdf", "fred_results_1.pdf"]
+
+    exported = export_results(logfiles, str(tmp_path / "png"), workers=2,
+                              use_cache=False)
+    for figure_file, statistics_file in exported:
+        with open(figure_file, 'rb') as figure:
+            assert figure.read(4) == b'\x89PNG'
+        with open(statistics_file, encoding='utf-8') as json_file:
+            assert json.load(json_file)[3]["count"] == 30
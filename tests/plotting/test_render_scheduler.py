@@ -0,0 +1,81 @@
+# coding=utf-8
+
+"""Fiducial Registration Educational Demonstration tests"""
+
+from sksurgeryfredmatplotlib.plotting.render_scheduler import RenderScheduler
+
+
+class FakeTimer:
+    """A canvas timer that only fires when told to"""
+    def __init__(self):
+        self.interval = None
+        self.single_shot = False
+        self.callbacks = []
+        self.starts = 0
+
+    def add_callback(self, callback):
+        """adds a callback"""
+        self.callbacks.append(callback)
+
+    def start(self):
+        """counts the starts"""
+        self.starts += 1
+
+    def fire(self):
+        """runs the callbacks"""
+        for callback in self.callbacks:
+            callback()
+
+
+class FakeRenderer:
+    """Records the draws requested of it"""
+    def __init__(self):
+        self.timer = FakeTimer()
+        self.canvas = self
+        self.calls = []
+
+    def new_timer(self):
+        """returns the fake timer"""
+        return self.timer
+
+    def update(self):
+        """records an update"""
+        self.calls.append('update')
+
+    def draw(self):
+        """records a full draw"""
+        self.calls.append('draw')
+
+
+def test_bursts_coalesced():
+    """ Tests that a burst of requests gives one draw per frame """
+    renderer = FakeRenderer()
+    scheduler = RenderScheduler(renderer, frame_interval=10.0)
+
+    scheduler.update()
+    assert renderer.calls == ['update']
+
+    for _ in range(20):
+        scheduler.update()
+    scheduler.draw()
+    scheduler.update()
+    assert renderer.calls == ['update']
+    assert renderer.timer.starts == 1
+    assert renderer.timer.single_shot
+
+    renderer.timer.fire()
+    assert renderer.calls == ['update', 'draw']
+
+    renderer.timer.fire()
+    assert renderer.calls == ['update', 'draw']
+
+
+def test_zero_interval():
+    """ Tests that with no frame interval every request is drawn """
+    renderer = FakeRenderer()
+    scheduler = RenderScheduler(renderer, frame_interval=0)
+    for _ in range(3):
+        scheduler.update()
+    scheduler.draw()
+    assert renderer.calls == ['update', 'update', 'update', 'draw']
+    assert renderer.timer.starts == 0
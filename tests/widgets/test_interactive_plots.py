@@ -0,0 +1,62 @@
+# coding=utf-8
+
+"""Fiducial Registration Educational Demonstration tests"""
+
+from sksurgeryfredmatplotlib.widgets.interactive_registration \
+                import InteractiveRegistration as ireg
+
+
+def test_artists_reused():
+    """ Tests that new trials reuse the image and outline artists """
+
+    int_reg = ireg('data/brain512.png', headless=True)
+
+    class FakeEvent:
+        """A fake key press event"""
+        key = 'r'
+
+    for _ in range(5):
+        int_reg.keypress_event(FakeEvent)
+
+    assert len(int_reg.subplot[0].images) == 1
+    assert len(int_reg.subplot[1].lines) == 1
+
+
+def test_scatters_reused():
+    """ Tests that fiducial markers are moved rather than remade """
+
+    int_reg = ireg('data/brain512.png', headless=True)
+    collections = list(int_reg.subplot[1].collections)
+
+    class FakeEvent:
+        """A fake mouse event"""
+        xdata = 256
+        ydata = 256
+        inaxes = int_reg.subplot[1]
+
+    for offset in range(4):
+        FakeEvent.xdata = 200 + 20 * offset
+        FakeEvent.ydata = 200 + 30 * (offset % 2)
+        int_reg.mouse_int(FakeEvent)
+
+    assert list(int_reg.subplot[1].collections) == collections
+    assert int_reg.plotter.fixed_fids_plots[0].get_offsets().shape[0] > 0
+
+
+def test_texts_reused():
+    """ Tests that the statistics text boxes are updated in place """
+
+    int_reg = ireg('data/brain512.png', headless=True)
+    stats = int_reg.plotter.stats_plot
+    texts = dict(stats.texts)
+
+    stats.set_visibilities(True, True, False, True, True,
+                           False, False, True, False)
+    stats.update_stats_plot(1.0, 2.0, 3.0, 4.0)
+    stats.update_margin_stats(5.0)
+
+    assert stats.texts == texts
+    assert stats.texts['margin_text'].get_text() == 'Margin: 5.0'
+    assert stats.texts['margin_text'].get_visible()
+    assert stats.texts['exp_tre_text'].get_visible()
+    assert not stats.texts['score_text'].get_visible()
@@ -16,3 +16,23 @@ def test_int_reg():
         key = 'r'
 
     int_reg.keypress_event(FakeEvent)
+
+
+def test_add_fiducials():
+    """ Tests that clicks inside the anatomy add fiducials """
+
+    int_reg = ireg('data/brain512.png', headless=True)
+
+    class FakeMouseEvent:
+        """A fake mouse click event"""
+        def __init__(self, xdata, ydata):
+            self.xdata = xdata
+            self.ydata = ydata
+
+    centre = int_reg.contour_mask.centre
+    for offset in [-20.0, 0.0, 20.0, 40.0]:
+        int_reg.mouse_int(FakeMouseEvent(centre[0] + offset, centre[1]))
+    assert int_reg.mouse_int.fixed_points.shape == (4, 3)
+
+    int_reg.mouse_int(FakeMouseEvent(2.0, 2.0))
+    assert int_reg.mouse_int.fixed_points.shape == (4, 3)